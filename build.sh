@@ -31,35 +31,29 @@ python manage.py check --settings=config.settings_production || handle_error "Dj
 log "🗃️ Застосування міграцій бази даних..."
 python manage.py migrate --settings=config.settings_production || handle_error "migrations"
 
-# 4. Очищення російського контенту (КРИТИЧНО!)
-log "🛡️ Блокування російського контенту..."
-python manage.py prevent_russian_import --settings=config.settings_production || log "⚠️ Prevent russian skipped"
-
-log "🧹 Очищення російського контенту..."
-python manage.py clean_russian_content --fix --settings=config.settings_production || log "⚠️ Clean russian skipped"
-
+# 4. Видалення російських дублікатів категорій (тексти перевіряє аудит у кроці 11)
 log "🗑️ Видалення російських категорій..."
 python manage.py remove_russian_categories --settings=config.settings_production || log "⚠️ Remove categories skipped"
 
-# 5. Перевірка та виправлення орфографії
-log "✏️ Виправлення орфографічних помилок..."
-python manage.py check_spelling_errors --fix --settings=config.settings_production || log "⚠️ Spelling check skipped"
-
 # 6. ІДЕАЛЬНИЙ ІМПОРТ ТОВАРІВ (ПОВНА ПОСЛІДОВНІСТЬ)
 log "🔥 ПОВНИЙ ІМПОРТ 42 ТОВАРІВ З ФОТО БЕЗ РОСІЙСЬКОЇ..."
 
-# Спочатку імпортуємо товари
-log "📦 Імпорт каталогу товарів..."
-python manage.py import_full_catalog --clear-existing --settings=config.settings_production || log "⚠️ Імпорт помилка"
-
-# КРИТИЧНО: Очищення російського контенту ОДРАЗУ
-log "🇺🇦 ПОВНЕ ОЧИЩЕННЯ РОСІЙСЬКОЇ ХЕРНІ..."
-python manage.py clean_russian_content --settings=config.settings_production || log "⚠️ Очищення помилка"
+# Спочатку синхронізуємо товари (лише нові/змінені рядки, id та URL зберігаються)
+log "📦 Синхронізація каталогу товарів..."
+python manage.py import_full_catalog --sync --settings=config.settings_production || log "⚠️ Імпорт помилка"
 
 # ФІНАЛЬНЕ ВИПРАВЛЕННЯ ВСЬОГО
 log "🔥 ФІНАЛЬНЕ ВИПРАВЛЕННЯ КАТЕГОРІЙ ТА РОСІЙСЬКОЇ МОВИ..."
 python manage.py fix_categories_final --settings=config.settings_production || log "⚠️ Final fix failed"
 
+# Збережені версії URL зображень (кешбастинг без MD5 на кожен запит)
+log "🖼️ Заповнення версій зображень..."
+python manage.py backfill_image_versions --settings=config.settings_production || log "⚠️ Image versions backfill failed"
+
+# Адаптивні варіанти зображень (WebP/JPEG) для srcset
+log "🖼️ Генерація адаптивних варіантів зображень..."
+python manage.py generate_image_derivatives --settings=config.settings_production || log "⚠️ Image derivatives failed"
+
 # Оновлення портфоліо згідно фото
 log "🏢 ОНОВЛЕННЯ ПОРТФОЛІО ЗГІДНО ФОТО..."
 python manage.py update_portfolio_descriptions --settings=config.settings_production || log "⚠️ Portfolio update failed"
@@ -103,9 +97,13 @@ python manage.py prepare_portfolio --settings=config.settings_production || log
 log "🔄 Оновлення медіа URL налаштувань..."
 python manage.py update_media_urls --settings=config.settings_production || log "⚠️ Media URLs update skipped"
 
-# 11. ОСТАННЄ ОЧИЩЕННЯ РОСІЙСЬКОЇ ДРЯНІ
-log "🇺🇦 ОСТАННЄ ОЧИЩЕННЯ РОСІЙСЬКОГО ЛАЙНА..."
-python manage.py clean_russian_content --settings=config.settings_production || log "⚠️ Final cleanup skipped"
+# 11. АУДИТ КОНТЕНТУ: російська мова, орфографія та заміна описів за один прохід
+log "🇺🇦 Аудит та очищення контенту..."
+python manage.py audit_content --fix --settings=config.settings_production || log "⚠️ Content audit skipped"
+
+# Схожі товари для сторінок товарів (далі оновлюються інкрементально)
+log "🔗 Перерахунок схожих товарів..."
+python manage.py rebuild_similar_products --settings=config.settings_production || log "⚠️ Similar products rebuild failed"
 
 # Перевіряємо кількість товарів
 log "📊 Перевірка кількості товарів..."
@@ -142,10 +140,6 @@ else
     log "   ❌ Медіа папка відсутня!"
 fi
 
-# Остаточна перевірка російського контенту
-log "🇺🇦 Остаточна перевірка мови..."
-python manage.py clean_russian_content --settings=config.settings_production || log "⚠️ Language check failed"
-
 
 
 echo "=================================================="
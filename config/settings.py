@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -134,6 +135,48 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Кеш імпорту (завантажені зображення тощо)
+IMPORT_CACHE_DIR = BASE_DIR / '.import_cache'
+
+# Файли фідів каталогу (export_products_json) та експорту Google Merchant
+FEED_ROOT = BASE_DIR / 'feed'
+EXPORTS_ROOT = BASE_DIR / 'exports'
+
+# Генерувати адаптивні варіанти (WebP/JPEG) одразу після завантаження зображення
+IMAGE_DERIVATIVES_ON_SAVE = True
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# CACHE_BACKEND: locmem (за замовчуванням), file або redis (REDIS_URL)
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'greensolartech',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'gst',
+        'TIMEOUT': 60 * 60,
+    }
+}
+
+# Час життя кешу view (інвалідація відбувається сигналами моделей)
+VIEW_CACHE_TIMEOUT = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -106,6 +106,17 @@ SECURE_HSTS_SECONDS = 3600  # Для безпеки HTTPS
 # Performance та кеш
 CONN_MAX_AGE = 60
 
+# Кілька воркерів Gunicorn мають бачити спільні версії кешу,
+# тому на production за замовчуванням файловий кеш замість locmem
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'gst',
+        'TIMEOUT': 60 * 60,
+    }
+}
+
 # Налаштування завантаження файлів для production
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MainappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mainapp'
+
+    def ready(self):
+        # Підключаємо обробники сигналів (інвалідація кешу тощо)
+        from . import signals  # noqa: F401
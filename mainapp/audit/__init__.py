@@ -0,0 +1,5 @@
+"""
+Аудит текстового контенту (російська мова, орфографія) за один прохід по
+моделях. Використовується командами audit_content, clean_russian_content,
+prevent_russian_import та check_spelling_errors.
+"""
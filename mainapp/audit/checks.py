@@ -0,0 +1,70 @@
+"""
+Базові типи перевірок контенту.
+
+Перевірка працює з рядками-словниками (результат .values()), а не з
+об'єктами моделей, і не звертається до БД — тому частини таблиці можна
+обробляти у пулі процесів. Модуль не імпортує Django.
+"""
+import hashlib
+import json
+from collections import namedtuple
+
+
+# value — виправлене значення поля (None — лише повідомлення без виправлення)
+Issue = namedtuple('Issue', ['check', 'field', 'message', 'value'])
+
+# changes — підсумкові значення виправлених полів після всіх перевірок
+Finding = namedtuple('Finding', ['model', 'pk', 'title', 'issues', 'changes'])
+
+
+class Check:
+    """
+    Перевірка контенту.
+
+    fields — {назва моделі: поля, які перевірка читає}; моделі, яких немає
+    у fields, перевірка пропускає. version входить у підпис контрольних
+    точок аудиту: при зміні правил перевірки його слід змінити (див.
+    rules_version), щоб наступний аудит пройшов усі записи.
+    """
+    name = ''
+    fields = {}
+    version = '1'
+
+    @property
+    def signature(self):
+        return f'{self.name}:{self.version}'
+
+    def inspect(self, model, row):
+        """Список Issue для рядка моделі"""
+        raise NotImplementedError
+
+    def issue(self, field, message, value=None):
+        return Issue(self.name, field, message, value)
+
+
+def rules_version(version, *rules):
+    """Версія перевірки з хешем її словників: зміна словника змінює версію"""
+    digest = hashlib.md5(json.dumps(rules, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+    return f'{version}.{digest[:8]}'
+
+
+def inspect_rows(checks, model, title_field, rows):
+    """
+    Проганяє всі перевірки по частині рядків. Виправлення попередньої
+    перевірки бачать наступні (рядок змінюється на місці).
+    """
+    findings = []
+    for row in rows:
+        title = row.get(title_field)
+        issues = []
+        changes = {}
+        for check in checks:
+            if model not in check.fields:
+                continue
+            for issue in check.inspect(model, row):
+                issues.append(issue)
+                if issue.value is not None:
+                    row[issue.field] = changes[issue.field] = issue.value
+        if issues:
+            findings.append(Finding(model, row['id'], title, issues, changes))
+    return findings
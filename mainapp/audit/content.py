@@ -0,0 +1,411 @@
+"""
+Перевірки текстів сайту: російський контент (виявлення та заміна) і
+орфографія. Реєстр CHECKS використовує команда audit_content.
+"""
+import re
+
+from mainapp.normalization import (
+    Replacer, replace_russian_letters,
+    is_russian_text, is_definitely_russian, is_possibly_russian,
+    RUSSIAN_LETTERS, LETTER_REPLACEMENTS, RUSSIAN_COMMON_WORDS, RUSSIAN_TECH_TERMS,
+    DEFINITELY_RUSSIAN_WORDS, RUSSIAN_CONSTRUCTIONS, SUSPICIOUS_WORDS,
+)
+
+from .checks import Check, rules_version
+
+
+# Підписи полів у повідомленнях
+FIELD_LABELS = {
+    'name': 'Назва',
+    'title': 'Назва',
+    'description': 'Опис',
+    'review_text': 'Текст відгуку',
+}
+
+# Довгі тексти не виводимо у звіт цілком
+LONG_FIELDS = {'description', 'review_text'}
+
+
+def change_message(field, old, new):
+    label = FIELD_LABELS.get(field, field)
+    if field in LONG_FIELDS:
+        return f"{label}: змінено"
+    return f"{label}: {old} → {new}"
+
+
+class RussianContentCheck(Check):
+    """Виявлення російського контенту (лише звіт, prevent_russian_import)"""
+    name = 'russian'
+    fields = {
+        'Product': ('name', 'description'),
+        'Category': ('name', 'description'),
+        'Brand': ('name', 'description'),
+        'Portfolio': ('title', 'description'),
+        'Review': ('review_text',),
+    }
+    version = rules_version('1', RUSSIAN_LETTERS, DEFINITELY_RUSSIAN_WORDS, RUSSIAN_CONSTRUCTIONS, SUSPICIOUS_WORDS)
+
+    def __init__(self, strict=False):
+        self.strict = strict
+
+    @property
+    def signature(self):
+        return f"{self.name}{'-strict' if self.strict else ''}:{self.version}"
+
+    def inspect(self, model, row):
+        text = ' '.join(str(row[field]) for field in self.fields[model])
+        detect = is_possibly_russian if self.strict else is_definitely_russian
+        if detect(text):
+            return [self.issue(None, 'російський контент')]
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Заміна російських текстів (clean_russian_content)
+# ---------------------------------------------------------------------------
+
+def inverter_description(product):
+    """Опис для інвертора"""
+    power = product['power'] or "високої потужності"
+    efficiency = product['efficiency'] or "98%"
+    warranty = product['warranty'] or "5 років"
+
+    return f"""
+{product['name']} - сучасний гібридний інвертор від {product['brand__name']}, розроблений для ефективного 
+перетворення сонячної енергії. Потужність: {power}. Ефективність: {efficiency}.
+
+Основні переваги:
+• Висока ефективність перетворення енергії
+• Надійна робота в будь-яких погодних умовах
+• Можливість роботи з акумуляторними батареями
+• Інтелектуальна система управління
+• Захист від перенапруги та короткого замикання
+• Простий монтаж та налаштування
+
+Гарантія: {warranty}. Відповідає всім європейським стандартам якості та безпеки.
+Ідеальний вибір для приватних та комерційних сонячних електростанцій.
+    """.strip()
+
+
+def panel_description(product):
+    """Опис для сонячної панелі"""
+    power = product['power'] or "високої потужності"
+    efficiency = product['efficiency'] or "22%"
+    warranty = product['warranty'] or "25 років"
+
+    return f"""
+{product['name']} - високоефективна сонячна панель від {product['brand__name']}. 
+Потужність: {power}. Ефективність: {efficiency}.
+
+Технічні характеристики:
+• Монокристалічні кремнієві елементи
+• Висока ефективність перетворення сонячного світла
+• Стійкість до механічних навантажень
+• Захист від несприятливих погодних умов
+• Мінімальна деградація потужності
+• Сертифікована якість та надійність
+
+Гарантія: {warranty} на потужність. Підходить для житлових та комерційних проєктів.
+Забезпечує стабільну генерацію електроенергії протягом десятиліть.
+    """.strip()
+
+
+def battery_description(product):
+    """Опис для акумулятора"""
+    power = product['power'] or "високої ємності"
+    warranty = product['warranty'] or "10 років"
+
+    return f"""
+{product['name']} - надійна літій-залізо-фосфатна (LiFePO4) батарея від {product['brand__name']}.
+Ємність: {power}.
+
+Переваги технології LiFePO4:
+• Довгий термін служби (понад 6000 циклів)
+• Висока безпека експлуатації
+• Стабільна робота при різних температурах
+• Швидка зарядка та розрядка
+• Екологічність та нетоксичність
+• Мінімальний саморозряд
+
+Гарантія: {warranty}. Ідеально підходить для систем резервного живлення, 
+сонячних електростанцій та автономних енергосистем.
+    """.strip()
+
+
+def kit_description(product):
+    """Опис для комплекту"""
+    return f"""
+{product['name']} - готове рішення для резервного живлення від {product['brand__name']}.
+
+Комплект включає:
+• Гібридний інвертор високої якості
+• Літій-залізо-фосфатну батарею
+• Необхідні кабелі та з'єднання
+• Систему моніторингу та управління
+
+Переваги готового рішення:
+• Всі компоненти протестовані разом
+• Простий монтаж та налаштування
+• Технічна підтримка та гарантія
+• Оптимальне співвідношення ціна/якість
+
+Забезпечує надійне резервне живлення для дому чи офісу.
+    """.strip()
+
+
+def service_description(product):
+    """Опис для послуг"""
+    return f"""
+{product['name']} - професійні послуги від сертифікованих спеціалістів.
+
+Що включає послуга:
+• Детальний аналіз об'єкта та потреб
+• Розробка оптимального проєкту
+• Якісний монтаж всіх компонентів
+• Налаштування та введення в експлуатацію
+• Навчання користувачів
+• Гарантійне обслуговування
+
+Переваги співпраці з нами:
+• Досвід роботи понад 5 років
+• Команда сертифікованих інженерів
+• Використання якісних компонентів
+• Гарантія на роботи та обладнання
+• Повний цикл послуг "під ключ"
+
+Забезпечуємо професійний підхід до кожного проєкту.
+    """.strip()
+
+
+def generic_description(product):
+    """Загальний опис товару"""
+    return f"""
+{product['name']} - якісний продукт від {product['brand__name']} для сонячної енергетики.
+
+Основні характеристики:
+• Сучасні технології виробництва
+• Висока надійність та довговічність
+• Відповідність міжнародним стандартам
+• Оптимальне співвідношення ціна/якість
+• Професійна технічна підтримка
+
+Ідеальний вибір для створення ефективних сонячних енергосистем.
+Забезпечує стабільну роботу та економію коштів на електроенергії.
+    """.strip()
+
+
+def ukrainian_description(product):
+    """Український опис товару за типом, визначеним з назви"""
+    name_lower = product['name'].lower()
+
+    if 'інвертор' in name_lower or 'гібридний' in name_lower:
+        return inverter_description(product)
+    elif 'панель' in name_lower or 'сонячн' in name_lower:
+        return panel_description(product)
+    elif 'акумулятор' in name_lower or 'батарея' in name_lower:
+        return battery_description(product)
+    elif 'комплект' in name_lower:
+        return kit_description(product)
+    elif 'монтаж' in name_lower:
+        return service_description(product)
+    else:
+        return generic_description(product)
+
+
+# Українські відгуки для заміни
+UKRAINIAN_REVIEWS = [
+    "Дуже задоволений якістю встановленого обладнання! Сонячна електростанція працює стабільно, економія на електроенергії відчутна з перших днів. Команда професіоналів виконала монтаж швидко та якісно.",
+    "Чудове рішення для нашого дому! Інвертор та батареї працюють бездоганно, навіть під час відключень електрики маємо стабільне живлення. Рекомендую всім, хто хоче бути енергонезалежним.",
+    "Встановили сонячні панелі на даху - результат перевершив очікування! Влітку майже повністю покриваємо потреби в електроенергії. Якість обладнання на найвищому рівні, сервіс також відмінний.",
+    "Професійна команда, якісне обладнання, відмінний результат! Наша комерційна сонячна електростанція окупається швидше, ніж планували. Обов'язково будемо рекомендувати друзям та партнерам.",
+    "Гібридна система з акумуляторами - це те, що нам було потрібно! Тепер маємо електрику навіть при аваріях в мережі. Монтаж виконали акуратно, все працює як годинник. Дякуємо за якісну роботу!"
+]
+
+
+def ukrainian_country(country):
+    country = country.lower()
+    if 'китай' in country or 'china' in country:
+        return 'Китай'
+    if 'германия' in country or 'germany' in country:
+        return 'Німеччина'
+    return 'Міжнародний виробник'
+
+
+class RussianCleanupCheck(Check):
+    """Заміна російських описів українськими (clean_russian_content)"""
+    name = 'cleanup'
+    fields = {
+        'Product': ('name', 'description', 'model', 'country', 'power', 'efficiency', 'warranty', 'brand__name'),
+        'Category': ('name', 'description'),
+        'Brand': ('name', 'description'),
+        'Portfolio': ('title', 'description'),
+        'Review': ('review_text',),
+    }
+    # Шаблони описів у хеш не входять — змінюючи їх, збільшуйте номер версії
+    version = rules_version('1', RUSSIAN_LETTERS, RUSSIAN_COMMON_WORDS, RUSSIAN_TECH_TERMS, UKRAINIAN_REVIEWS)
+
+    def inspect(self, model, row):
+        issues = []
+        if model == 'Product':
+            if is_russian_text(row['description']):
+                description = ukrainian_description(row)
+                issues.append(self.issue('description', f"Новий опис: {description[:100]}...", description))
+            if row['model'] and is_russian_text(row['model']):
+                value = re.sub(r'[а-яё]+', '', row['model'], flags=re.IGNORECASE).strip()
+                issues.append(self.issue('model', change_message('model', row['model'], value), value))
+            if row['country'] and is_russian_text(row['country']):
+                value = ukrainian_country(row['country'])
+                issues.append(self.issue('country', change_message('country', row['country'], value), value))
+        elif model == 'Review':
+            if is_russian_text(row['review_text']):
+                # Замінник обирається за id, тож результат не залежить від порядку обходу
+                value = UKRAINIAN_REVIEWS[row['id'] % len(UKRAINIAN_REVIEWS)]
+                issues.append(self.issue('review_text', change_message('review_text', None, value), value))
+        elif is_russian_text(row['description']):
+            if model == 'Category':
+                value = f"Категорія {row['name']} містить якісні товари для сонячної енергетики від провідних виробників."
+            elif model == 'Brand':
+                value = f"{row['name']} - провідний виробник обладнання для сонячної енергетики з багаторічним досвідом та інноваційними технологіями."
+            else:
+                value = f"Успішно реалізований проєкт {row['title']}. Встановлено сучасне обладнання для сонячної енергетики з високими показниками ефективності та надійності."
+            issues.append(self.issue('description', change_message('description', None, value), value))
+        return issues
+
+
+# ---------------------------------------------------------------------------
+# Орфографія (check_spelling_errors)
+# ---------------------------------------------------------------------------
+
+# Словник частих орфографічних помилок
+SPELLING_ERRORS = {
+    # Неправильні закінчення
+    'нй ': 'ний ',
+    'нй.': 'ний.',
+    'нй,': 'ний,',
+    'сонячнй': 'сонячний',
+    'гібриднй': 'гібридний',
+    'високовольтнй': 'високовольтний',
+    'акумуляторнй': 'акумуляторний',
+    'літвй': 'літієвий',
+
+    # Неправильні одиниці вимірювання
+    'квт ': 'кВт ',
+    'квт·год': 'кВт·год',
+    ' в ': ' В ',
+    ' в.': ' В.',
+    ' в,': ' В,',
+    'вт ': 'Вт ',
+    ' а ': ' А ',
+    ' а.': ' А.',
+    ' а,': ' А,',
+    'агод': 'А·год',
+    'вт·год': 'Вт·год',
+
+    # Технічні терміни
+    'інветор': 'інвертор',
+    'інвeртор': 'інвертор',
+    'елeктростанція': 'електростанція',
+    'елeктричний': 'електричний',
+    'батaрея': 'батарея',
+
+    # Бренди та моделі
+    'deye': 'Deye',
+    'must': 'Must',
+    'longi': 'Longi',
+    'lifepo4': 'LiFePO4',
+    'pv18': 'PV18',
+    'sun-': 'SUN-',
+
+    # Дублі символів та пробілів
+    '  ': ' ',
+    '..': '.',
+    ',,': ',',
+    '( ': '(',
+    ' )': ')',
+    ' ,': ',',
+    ' .': '.',
+
+    # Російські залишки
+    'хранения': 'зберігання',
+    'енергии': 'енергії',
+    'система хранения': 'система зберігання',
+    'высоковольтная': 'високовольтна',
+    'аккумуляторная': 'акумуляторна',
+    'солнечная': 'сонячна',
+    'электростанция': 'електростанція',
+    'питание': 'живлення',
+    'мощность': 'потужність',
+    'напряжение': 'напруга',
+    'гибридный': 'гібридний',
+    'резервного питания': 'резервного живлення',
+
+    # Неправильні написання імен та слів
+    'КиївськА': 'Київська',
+    'ПриватнА': 'Приватна',
+    'КомерційнА': 'Комерційна',
+    'СонячнА': 'Сонячна',
+    'АкумуляторнА': 'Акумуляторна',
+    'ВисоковольтнА': 'Високовольтна',
+    'ГібриднА': 'Гібридна',
+    'СвітланА': 'Світлана',
+    'АннА': 'Анна',
+    'МаринА': 'Марина',
+    'ОдеськА': 'Одеська',
+    'ВінницькА': 'Вінницька',
+    'ХерсонськА': 'Херсонська',
+    'ЛьвівськА': 'Львівська',
+    'ДніпропетровськА': 'Дніпропетровська',
+    'ПолтавськА': 'Полтавська',
+    'Івано-ФранківськА': 'Івано-Франківська',
+    'модуліВ': 'модулів',
+    'нА ': 'на ',
+    'тА ': 'та ',
+}
+
+# Словник компілюється в один вираз: кожен текст проходиться один раз
+_spelling = Replacer(SPELLING_ERRORS)
+
+
+def fix_spelling(text):
+    """Виправляє текст за словником помилок"""
+    if not text:
+        return text
+
+    result = _spelling(str(text))
+
+    # Очищаємо зайві пробіли
+    result = re.sub(r'\s+', ' ', result).strip()
+
+    # Заміняємо російські символи на українські
+    return replace_russian_letters(result)
+
+
+class SpellingCheck(Check):
+    """Орфографічні помилки та залишки російських слів (check_spelling_errors)"""
+    name = 'spelling'
+    fields = {
+        'Product': ('name', 'description', 'model', 'power', 'efficiency', 'warranty', 'country'),
+        'Category': ('name', 'description'),
+        'Brand': ('name', 'description'),
+        'Portfolio': ('title', 'description', 'location', 'power_capacity', 'project_type', 'client_name'),
+        'Review': ('review_text', 'client_name', 'client_position', 'project_type', 'location'),
+    }
+    version = rules_version('1', SPELLING_ERRORS, LETTER_REPLACEMENTS)
+
+    def inspect(self, model, row):
+        issues = []
+        for field in self.fields[model]:
+            value = row[field]
+            fixed = fix_spelling(value)
+            if value != fixed:
+                issues.append(self.issue(field, change_message(field, value, fixed), fixed))
+        return issues
+
+
+# Порядок важливий: звіт про російський контент бачить початкові тексти,
+# а згенеровані описи не проходять через орфографію (вона зливає рядки)
+CHECKS = {
+    'russian': RussianContentCheck,
+    'spelling': SpellingCheck,
+    'cleanup': RussianCleanupCheck,
+}
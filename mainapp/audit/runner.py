@@ -0,0 +1,210 @@
+"""
+Запуск перевірок контенту за один прохід по кожній моделі.
+
+Кожна таблиця читається один раз через .values().iterator(chunk_size) лише
+з потрібними перевіркам полями. Частини рядків обробляються всіма
+перевірками разом — у поточному процесі або у пулі процесів. Виправлення
+записуються через bulk_update, згруповані за набором змінених полів.
+bulk_update не викликає save() та post_save, тому версії кешу збільшуються
+вручну, а updated_at (auto_now) виставляється явно — від нього залежать
+ключі фідів і контрольні точки аудиту.
+
+В інкрементальному режимі (лише разом з виправленнями) стан аудиту
+зберігається в AuditCheckpoint: моделі з updated_at читаються лише з
+записами, зміненими після початку попереднього аудиту (крім виправлених
+самим аудитом і відтоді не змінених), для інших моделей порівнюються хеші
+вмісту записів, і перевірки отримують лише змінені.
+"""
+import hashlib
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+
+from mainapp.cache import CATALOG, REVIEWS, bump_version
+from mainapp.importers.bulk import batched
+from mainapp.models import AuditCheckpoint
+
+from .checks import inspect_rows
+
+
+# Моделі у порядку обходу
+AUDITED_MODELS = ('Product', 'Category', 'Brand', 'Portfolio', 'Review')
+
+# Поле, яке показується у звіті
+TITLE_FIELDS = {'Portfolio': 'title', 'Review': 'client_name'}
+
+# Області кешу, які інвалідує зміна моделі
+CACHE_SCOPES = {'Product': CATALOG, 'Category': CATALOG, 'Brand': CATALOG, 'Review': REVIEWS}
+
+DEFAULT_CHUNK_SIZE = 500
+
+AuditResult = namedtuple('AuditResult', ['findings', 'issues', 'fixed'])
+
+
+def row_digest(row, fields):
+    """Хеш значень полів запису (для моделей без updated_at)"""
+    raw = '\x1f'.join(str(row[field]) for field in fields)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class ContentAudit:
+    """
+    Проганяє набір перевірок по всіх моделях.
+
+    on_model(model) викликається перед обходом моделі, on_finding(finding) —
+    для кожного рядка з проблемами. Повертає AuditResult з лічильниками
+    (Counter по моделях) рядків з проблемами, проблем та виправлених рядків.
+
+    incremental діє лише з fix: звіт без виправлень завжди повний, інакше
+    невиправлені проблеми зникали б з нього після першого запуску.
+    """
+
+    def __init__(self, checks, fix=False, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, incremental=False):
+        self.checks = list(checks)
+        self.fix = fix
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+        self.incremental = incremental and fix
+
+    @property
+    def signature(self):
+        """Набір перевірок з їх версіями — ключ контрольних точок"""
+        return '+'.join(check.signature for check in self.checks)
+
+    def fields_for(self, model):
+        fields = {'id', TITLE_FIELDS.get(model, 'name')}
+        for check in self.checks:
+            fields.update(check.fields.get(model, ()))
+        return sorted(fields)
+
+    def inspect(self, model, chunks):
+        """Результати inspect_rows по частинах у порядку частин"""
+        title_field = TITLE_FIELDS.get(model, 'name')
+        if self.workers == 1:
+            for chunk in chunks:
+                yield chunk, inspect_rows(self.checks, model, title_field, chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # Обмежуємо кількість частин у роботі, щоб не читати таблицю наперед цілком
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(inspect_rows, self.checks, model, title_field, chunk)))
+                if len(pending) >= self.workers * 2:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+    @staticmethod
+    def unfixed_rows(rows, fixed):
+        """Пропускає записи, чий updated_at досі той, що поставив попередній аудит"""
+        for row in rows:
+            if fixed.get(str(row['id'])) != row.pop('updated_at').isoformat():
+                yield row
+
+    @staticmethod
+    def changed_rows(rows, fields, known, hashes):
+        """Пропускає записи з незмінним хешем (їх хеші переносяться у hashes)"""
+        for row in rows:
+            key = str(row['id'])
+            if known.get(key) == row_digest(row, fields):
+                hashes[key] = known[key]
+            else:
+                yield row
+
+    def run(self, on_model=None, on_finding=None):
+        result = AuditResult(Counter(), Counter(), Counter())
+        scopes = set()
+
+        for model in AUDITED_MODELS:
+            if not any(model in check.fields for check in self.checks):
+                continue
+            if on_model:
+                on_model(model)
+
+            model_class = apps.get_model('mainapp', model)
+            fields = self.fields_for(model)
+            by_timestamp = any(field.name == 'updated_at' for field in model_class._meta.fields)
+            started = timezone.now()
+            checkpoint = self.checkpoint(model) if self.incremental else None
+
+            queryset = model_class.objects.order_by('pk')
+            if checkpoint and by_timestamp:
+                queryset = queryset.filter(updated_at__gte=checkpoint.audited_at)
+                rows = queryset.values(*fields, 'updated_at').iterator(chunk_size=self.chunk_size)
+                rows = self.unfixed_rows(rows, checkpoint.row_hashes)
+            else:
+                rows = queryset.values(*fields).iterator(chunk_size=self.chunk_size)
+            hashes = {}
+            if self.incremental and not by_timestamp:
+                rows = self.changed_rows(rows, fields, checkpoint.row_hashes if checkpoint else {}, hashes)
+
+            # Запис відкладаємо до кінця обходу: SQLite не ізолює запити в
+            # межах одного з'єднання, а курсор iterator() ще відкритий
+            dirty = []
+            for chunk, findings in self.inspect(model, batched(rows, self.chunk_size)):
+                changes = {}
+                for finding in findings:
+                    result.findings[model] += 1
+                    result.issues[model] += len(finding.issues)
+                    if finding.changes:
+                        dirty.append(finding)
+                        changes[finding.pk] = finding.changes
+                    if on_finding:
+                        on_finding(finding)
+                if self.incremental and not by_timestamp:
+                    # Хеш стану після виправлень — виправлений запис наступного разу не перевіряється
+                    for row in chunk:
+                        hashes[str(row['id'])] = row_digest({**row, **changes.get(row['id'], {})}, fields)
+
+            if self.fix and dirty:
+                fixed_at = timezone.now()
+                result.fixed[model] += self.write(model_class, dirty, fixed_at)
+                if model in CACHE_SCOPES:
+                    scopes.add(CACHE_SCOPES[model])
+                if self.incremental and by_timestamp:
+                    # Виправлення оновлюють updated_at, але записи вже перевірені
+                    # усіма перевірками — наступний аудит їх пропускає, доки
+                    # їх не змінить хтось інший
+                    hashes = {str(finding.pk): fixed_at.isoformat() for finding in dirty}
+            if self.incremental:
+                AuditCheckpoint.objects.update_or_create(
+                    model=model, checks=self.signature,
+                    defaults={'audited_at': started, 'row_hashes': hashes},
+                )
+
+        for scope in scopes:
+            bump_version(scope)
+        return result
+
+    def checkpoint(self, model):
+        return AuditCheckpoint.objects.filter(model=model, checks=self.signature).first()
+
+    def write(self, model_class, findings, fixed_at):
+        """
+        bulk_update виправлень; об'єкти групуються за набором змінених полів.
+        Поля auto_now (updated_at) отримують значення fixed_at.
+        """
+        groups = {}
+        for finding in findings:
+            groups.setdefault(tuple(sorted(finding.changes)), []).append(finding)
+
+        # bulk_update не заповнює auto_now, тому час оновлення додається явно
+        stamped = {
+            field.name for field in model_class._meta.fields
+            if getattr(field, 'auto_now', False)
+        }
+        for fields, group in groups.items():
+            for chunk in batched(group, self.chunk_size):
+                objects = [
+                    model_class(pk=finding.pk, **finding.changes, **{field: fixed_at for field in stamped})
+                    for finding in chunk
+                ]
+                with transaction.atomic():
+                    model_class.objects.bulk_update(objects, [*fields, *sorted(stamped)])
+        return len(findings)
@@ -0,0 +1,63 @@
+"""
+Бюджет SQL-запитів для view та завантажувачів сторінок.
+
+query_budget(N) рахує запити всередині функції через
+connection.execute_wrapper (працює і без DEBUG). Перевищення бюджету:
+- з QUERY_BUDGET_STRICT=True — виняток QueryBudgetExceeded, тож регресія
+  (N+1, скинутий prefetch) ламає тест з override_settings або локальну
+  розробку, де налаштування увімкнене явно;
+- інакше (за замовчуванням, зокрема з DEBUG) — лише попередження в лог.
+"""
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """Контекстний менеджер: with QueryBudget(3, 'назва'): ..."""
+
+    def __init__(self, limit, name=''):
+        self.limit = limit
+        self.name = name
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self.queries) > self.limit:
+            self.exceeded()
+        return False
+
+    def exceeded(self):
+        message = f'{self.name}: {len(self.queries)} SQL-запитів при бюджеті {self.limit}'
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message + '\n' + '\n'.join(self.queries))
+        logger.warning(message)
+
+
+def query_budget(limit):
+    """Декоратор функції чи методу з бюджетом limit запитів"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with QueryBudget(limit, func.__qualname__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,115 @@
+"""
+Кешування сторінок та даних каталогу.
+
+Ключі версіонуються: кожна "область" (каталог, відгуки) має лічильник версії
+у кеші. Сигнали моделей збільшують лічильник, і всі старі ключі просто
+перестають використовуватись — не потрібно шукати та видаляти їх поштучно.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+CATALOG = 'catalog'
+REVIEWS = 'reviews'
+
+
+def _version_key(scope):
+    return f'version:{scope}'
+
+
+def get_version(scope=CATALOG):
+    """Поточна версія області кешу"""
+    version = cache.get(_version_key(scope))
+    if version is None:
+        # add() не перезапише значення, якщо інший процес встиг його створити
+        cache.add(_version_key(scope), 1, None)
+        version = cache.get(_version_key(scope), 1)
+    return version
+
+
+def bump_version(scope=CATALOG):
+    """Інвалідує всі ключі області, збільшуючи її версію"""
+    try:
+        return cache.incr(_version_key(scope))
+    except ValueError:
+        cache.set(_version_key(scope), 2, None)
+        return 2
+
+
+def make_key(namespace, *parts, scope=CATALOG):
+    """Формує версіонований ключ з довільних частин (фільтри, kwargs тощо)"""
+    raw = '|'.join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'{scope}:v{get_version(scope)}:{namespace}:{digest}'
+
+
+def request_key_parts(request, **kwargs):
+    """Частини ключа з GET-параметрів та kwargs URL (у стабільному порядку)"""
+    params = sorted((key, tuple(values)) for key, values in request.GET.lists())
+    return [sorted(kwargs.items()), params]
+
+
+def get_or_build(namespace, builder, *parts, scope=CATALOG, timeout=None):
+    """Повертає значення з кешу або будує його та зберігає"""
+    key = make_key(namespace, *parts, scope=scope)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
+
+
+class CachedContextMixin:
+    """
+    Кешує "важку" частину контексту TemplateView.
+
+    Підклас реалізує build_cached_context() і повертає вже обчислені дані
+    (списки, а не lazy QuerySet), щоб повторні запити не торкались ORM.
+    """
+
+    cache_namespace = None
+    cache_scope = CATALOG
+
+    def build_cached_context(self, **kwargs):
+        raise NotImplementedError
+
+    def get_cached_context(self, **kwargs):
+        return get_or_build(
+            self.cache_namespace or self.__class__.__name__,
+            lambda: self.build_cached_context(**kwargs),
+            *request_key_parts(self.request, **kwargs),
+            scope=self.cache_scope,
+        )
+
+
+def versioned_cache_page(namespace, scope=CATALOG, timeout=None):
+    """
+    Повносторінковий кеш для функціональних view без сесійних даних
+    (sitemap, robots, фіди). Кешується лише успішна відповідь на GET/HEAD.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = make_key(namespace, *request_key_parts(request, **kwargs), scope=scope)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,171 @@
+"""
+Похідні зображення (мініатюри) для товарів та портфоліо.
+
+Для кожного оригіналу в MEDIA_ROOT генеруються зменшені варіанти
+(thumb/card/detail/zoom) у WebP та JPEG (та AVIF, якщо Pillow зібраний з
+його підтримкою). Файли зберігаються поруч з оригіналом у підпапці
+derivatives/ і в імені містять хеш вмісту оригіналу, тому при заміні файлу
+старі варіанти ніколи не віддаються з кешу браузера.
+
+Відповідність "оригінал -> варіанти" зберігається у маніфесті
+MEDIA_ROOT/derivatives.json, який шаблонні теги читають без доступу до БД.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from PIL import Image, ImageOps, features
+
+
+# Назва варіанту -> максимальна ширина, px
+DERIVATIVE_SIZES = {
+    'thumb': 200,
+    'card': 400,
+    'detail': 800,
+    'zoom': 1600,
+}
+
+DERIVATIVE_FORMATS = ['webp', 'jpeg']
+if features.check('avif'):
+    DERIVATIVE_FORMATS.insert(0, 'avif')
+
+FORMAT_OPTIONS = {
+    'avif': {'quality': 60},
+    'webp': {'quality': 80, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+FORMAT_EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+
+MANIFEST_NAME = 'derivatives.json'
+
+_manifest_lock = threading.Lock()
+_manifest_cache = {'mtime': None, 'data': {}}
+
+
+def _manifest_path():
+    return os.path.join(str(settings.MEDIA_ROOT), MANIFEST_NAME)
+
+
+def load_manifest():
+    """Маніфест варіантів (перечитується лише якщо файл змінився)"""
+    path = _manifest_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _manifest_cache['mtime'] != mtime:
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        _manifest_cache.update(mtime=mtime, data=data)
+    return _manifest_cache['data']
+
+
+def update_manifest(entries):
+    """Додає записи до маніфесту (атомарний запис через тимчасовий файл)"""
+    if not entries:
+        return
+    with _manifest_lock:
+        path = _manifest_path()
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.update(entries)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _manifest_cache.update(mtime=None)
+
+
+def get_derivatives(name):
+    """Запис маніфесту для оригіналу (або None, якщо варіантів ще немає)"""
+    return load_manifest().get(str(name)) if name else None
+
+
+def content_digest(path):
+    """Короткий хеш вмісту файлу"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def derivative_name(name, digest, size, fmt):
+    """products/foo.jpg -> products/derivatives/foo.<digest>.<size>.<ext>"""
+    directory, filename = os.path.split(str(name))
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'derivatives', f'{stem}.{digest}.{size}.{FORMAT_EXTENSIONS[fmt]}')
+
+
+def generate_derivatives(name, media_root=None, force=False):
+    """
+    Генерує варіанти для одного оригіналу (шлях відносно MEDIA_ROOT).
+
+    Повертає (name, entry) для маніфесту або (name, None), якщо файл
+    відсутній чи не є зображенням. Функція не звертається до БД, тому
+    безпечно виконується у пулі процесів.
+    """
+    media_root = str(media_root or settings.MEDIA_ROOT)
+    source = os.path.join(media_root, str(name))
+    if not os.path.isfile(source):
+        return name, None
+
+    try:
+        digest = content_digest(source)
+        with Image.open(source) as original:
+            original = ImageOps.exif_transpose(original)
+            width, height = original.size
+            has_alpha = original.mode in ('RGBA', 'LA') or 'transparency' in original.info
+            base = original.convert('RGBA' if has_alpha else 'RGB')
+
+            variants = {}
+            for size, max_width in DERIVATIVE_SIZES.items():
+                # Не збільшуємо зображення: варіанти ширші за оригінал пропускаємо
+                if max_width > width and size != 'thumb':
+                    continue
+                target_width = min(max_width, width)
+                target_height = max(1, round(height * target_width / width))
+                resized = None
+                variants[size] = {'width': target_width}
+                for fmt in DERIVATIVE_FORMATS:
+                    relative = derivative_name(name, digest, size, fmt)
+                    variants[size][fmt] = relative
+                    destination = os.path.join(media_root, relative)
+                    if os.path.exists(destination) and not force:
+                        continue
+                    if resized is None:
+                        resized = base.resize((target_width, target_height), Image.LANCZOS)
+                    image = resized
+                    if fmt == 'jpeg' and image.mode != 'RGB':
+                        # JPEG без прозорості: накладаємо на білий фон
+                        background = Image.new('RGB', image.size, (255, 255, 255))
+                        background.paste(image, mask=image.getchannel('A'))
+                        image = background
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    image.save(destination, format=fmt.upper(), **FORMAT_OPTIONS[fmt])
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print(f"Помилка генерації варіантів для {name}: {e}")
+        return name, None
+
+    return name, {'digest': digest, 'width': width, 'height': height, 'variants': variants}
+
+
+def ensure_derivatives(name):
+    """Генерує варіанти для нового завантаження, якщо їх ще немає у маніфесті"""
+    if not name or get_derivatives(name):
+        return None
+    name, entry = generate_derivatives(name)
+    if entry:
+        update_manifest({name: entry})
+    return entry
@@ -0,0 +1,117 @@
+"""
+Індекс фасетів каталогу (категорії, бренди, цінові діапазони).
+
+Індекс будується одним агрегуючим запитом по товарах у наявності і
+зберігається у кеші каталогу. Будь-яка зміна товару/категорії/бренду
+збільшує версію кешу (див. signals.py), тож індекс перебудовується при
+першому зверненні після зміни, а view читають готові лічильники.
+"""
+from collections import namedtuple, defaultdict
+from decimal import Decimal
+
+from django.db.models import Case, When, Value, IntegerField, Count
+
+from .cache import get_or_build
+from .models import Product
+
+
+FacetValue = namedtuple('FacetValue', ['id', 'name', 'slug', 'count'])
+PriceBucket = namedtuple('PriceBucket', ['index', 'min_price', 'max_price', 'count'])
+
+# Межі цінових діапазонів, грн (останній діапазон відкритий)
+PRICE_BUCKET_BOUNDS = [0, 10000, 30000, 60000, 100000]
+
+
+def _price_bucket_expression():
+    whens = [
+        When(price__lt=Decimal(upper), then=Value(index))
+        for index, upper in enumerate(PRICE_BUCKET_BOUNDS[1:])
+    ]
+    return Case(*whens, default=Value(len(PRICE_BUCKET_BOUNDS) - 1), output_field=IntegerField())
+
+
+class FacetIndex:
+    """Лічильники товарів у наявності по категоріях, брендах та цінах"""
+
+    def __init__(self, rows):
+        categories = {}
+        brands = {}
+        buckets = defaultdict(int)
+        # category_id -> brand_id -> count
+        self.brands_by_category = defaultdict(lambda: defaultdict(int))
+        # (category_id, brand_id) -> count, включно з неактивними брендами
+        self.counts = defaultdict(int)
+
+        for row in rows:
+            count = row['count']
+            self.counts[row['category_id'], row['brand_id']] += count
+            if row['category__is_active']:
+                entry = categories.get(row['category_id'])
+                categories[row['category_id']] = FacetValue(
+                    row['category_id'], row['category__name'], row['category__slug'],
+                    (entry.count if entry else 0) + count,
+                )
+            if row['brand__is_active']:
+                entry = brands.get(row['brand_id'])
+                brands[row['brand_id']] = FacetValue(
+                    row['brand_id'], row['brand__name'], row['brand__slug'],
+                    (entry.count if entry else 0) + count,
+                )
+                self.brands_by_category[row['category_id']][row['brand_id']] += count
+            buckets[row['price_bucket']] += count
+
+        self.categories = sorted(categories.values(), key=lambda facet: facet.name)
+        self.brands = sorted(brands.values(), key=lambda facet: facet.name)
+        self._brands_by_id = brands
+        # defaultdict з lambda не серіалізується pickle — переводимо у звичайні dict
+        self.brands_by_category = {key: dict(value) for key, value in self.brands_by_category.items()}
+        self.counts = dict(self.counts)
+
+        bounds = PRICE_BUCKET_BOUNDS + [None]
+        self.price_buckets = [
+            PriceBucket(index, bounds[index], bounds[index + 1], buckets[index])
+            for index in range(len(PRICE_BUCKET_BOUNDS))
+            if buckets.get(index)
+        ]
+
+    def count_products(self, category_ids, brand_ids=None):
+        """Кількість товарів у наявності для категорій (і брендів, якщо задані)"""
+        category_ids = set(category_ids)
+        brand_ids = set(brand_ids) if brand_ids is not None else None
+        return sum(
+            count for (category_id, brand_id), count in self.counts.items()
+            if category_id in category_ids and (brand_ids is None or brand_id in brand_ids)
+        )
+
+    def brands_for_categories(self, category_ids):
+        """Бренди (з лічильниками) для набору категорій"""
+        counts = defaultdict(int)
+        for category_id in category_ids:
+            for brand_id, count in self.brands_by_category.get(category_id, {}).items():
+                counts[brand_id] += count
+        facets = [
+            self._brands_by_id[brand_id]._replace(count=count)
+            for brand_id, count in counts.items()
+        ]
+        return sorted(facets, key=lambda facet: facet.name)
+
+
+def build_facet_index():
+    """Будує індекс одним GROUP BY запитом"""
+    rows = (
+        Product.objects.filter(in_stock=True)
+        .annotate(price_bucket=_price_bucket_expression())
+        .values(
+            'category_id', 'category__name', 'category__slug', 'category__is_active',
+            'brand_id', 'brand__name', 'brand__slug', 'brand__is_active',
+            'price_bucket',
+        )
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    return FacetIndex(list(rows))
+
+
+def get_facet_index():
+    """Індекс фасетів з кешу каталогу (перебудовується після змін каталогу)"""
+    return get_or_build('facet_index', build_facet_index)
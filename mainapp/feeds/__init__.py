@@ -0,0 +1,4 @@
+"""
+Фіди каталогу: серіалізація товарів, категорій та брендів і потоковий
+запис файлів фідів. Використовується командою export_products_json.
+"""
@@ -0,0 +1,279 @@
+"""
+Експорт фідів каталогу за один прохід по товарах.
+
+Товари читаються один раз у порядку БД (iterator), кожен запис
+серіалізується один раз і одразу пишеться у всі фіди, до яких належить:
+повний каталог, список товарів, файл своєї категорії та свого бренду.
+Кількості товарів для метаданих рахуються агрегатними запитами заздалегідь,
+тож час експорту лінійний, а пам'ять не залежить від розміру каталогу.
+
+Експорт інкрементальний: для кожного файлу рахується ключ джерел
+(заголовок без дати експорту, хеш вмісту товарів шарду, довідники
+категорій/брендів, за потреби — зображення). Хеш береться з самих значень
+полів, що потрапляють у записи, а не з max updated_at: QuerySet.update()
+та bulk_update не оновлюють updated_at, і шард із такими змінами інакше
+вважався б актуальним. Для хешу товари читаються одним легким запитом
+values_list без серіалізації; файли з незміненим ключем (див.
+manifest.FeedManifest) не перезаписуються, а якщо застарілих шардів з
+товарами немає, повний прохід по товарах не виконується.
+"""
+import hashlib
+import os
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from mainapp.models import Product, ProductImage, Category, Brand
+
+from .manifest import FeedManifest, source_key
+from .records import category_record, brand_record, product_record, iter_products, isoformat, shard_name
+from .writers import AtomicOutput, JsonStream, NdjsonStream, dumps, feed_filename
+
+
+FEED_VERSION = '1.0'
+
+
+# Поля товару, з яких складається запис фіду (records.product_record)
+PRODUCT_FIELDS = (
+    'id', 'name', 'description', 'price', 'model', 'power', 'efficiency', 'warranty', 'country',
+    'in_stock', 'featured', 'created_at', 'updated_at', 'image', 'image_version',
+)
+
+
+def product_aggregates(group_by=None):
+    """
+    {значення group_by: (max updated_at, кількість)} для метаданих файлів;
+    без group_by — один запис під ключем None.
+    """
+    aggregates = {'updated': Max('updated_at'), 'count': Count('id')}
+    if group_by is None:
+        row = Product.objects.aggregate(**aggregates)
+        return {None: (row['updated'], row['count'])}
+    return {
+        row[group_by]: (row['updated'], row['count'])
+        for row in Product.objects.order_by().values(group_by).annotate(**aggregates)
+    }
+
+
+def product_digests(products=None, chunk_size=2000):
+    """
+    Хеші вмісту товарів (загальний, по категоріях і брендах) з полів
+    PRODUCT_FIELDS. Ловлять будь-яку зміну, додавання чи видалення товару,
+    зокрема записані в обхід save().
+    """
+    products = Product.objects.all() if products is None else products
+    digests = {}
+    rows = products.order_by('pk').values_list('category_id', 'brand_id', *PRODUCT_FIELDS)
+    for category_id, brand_id, *row in rows.iterator(chunk_size=chunk_size):
+        line = repr(row).encode('utf-8')
+        for key in (None, ('category', category_id), ('brand', brand_id)):
+            digests.setdefault(key, hashlib.md5()).update(line)
+    return {key: digest.hexdigest() for key, digest in digests.items()}
+
+
+def image_digests():
+    """
+    Хеші галерей (загальний, по категоріях і брендах). Зміна зображення не
+    оновлює updated_at товару, тож рядки галерей хешуються напряму.
+    """
+    digests = {}
+    rows = ProductImage.objects.order_by('pk').values_list(
+        'product__category_id', 'product__brand_id',
+        'id', 'product_id', 'image', 'alt_text', 'is_main', 'order', 'image_version',
+    )
+    for category_id, brand_id, *row in rows:
+        line = repr(row).encode('utf-8')
+        for key in (None, ('category', category_id), ('brand', brand_id)):
+            digests.setdefault(key, hashlib.md5()).update(line)
+    return {key: digest.hexdigest() for key, digest in digests.items()}
+
+
+class FeedExporter:
+    """
+    Записує фіди у output_dir.
+
+    fmt='json' — JSON-документи з метаданими (як раніше, але без відступів);
+    fmt='ndjson' — файли з одним записом на рядок плюс meta.json з
+    метаданими всіх файлів (повний каталог у цьому форматі не пишеться:
+    він дублював би products, categories та brands).
+
+    incremental=False перезаписує всі файли незалежно від маніфесту.
+    """
+
+    def __init__(self, output_dir, fmt='json', compress=False, include_images=False, chunk_size=500,
+                 incremental=True):
+        self.output_dir = str(output_dir)
+        self.fmt = fmt
+        self.compress = compress
+        self.include_images = include_images
+        self.chunk_size = chunk_size
+        self.incremental = incremental
+        self.manifest = FeedManifest(self.output_dir, source_key(FEED_VERSION, fmt, compress, include_images))
+        self.files = []
+        self.skipped = []
+        self.heads = {}
+        self.pending = {}
+
+    def open(self, name, key, head, source, updated=None, count=None):
+        """
+        Потік для файлу шарду або None, якщо файл актуальний.
+        source — агрегати джерел; до ключа додається заголовок без дати.
+        """
+        filename = feed_filename(name, self.fmt, self.compress)
+        stable_head = dict(head, meta={
+            field: value for field, value in head['meta'].items() if field != 'export_date'
+        })
+        source = source_key(stable_head, source)
+        if self.fmt == 'ndjson':
+            self.heads[filename] = {field: value for field, value in head.items() if field != 'meta'}
+        if self.incremental and self.manifest.is_fresh(filename, source):
+            self.skipped.append(filename)
+            return None
+
+        path = os.path.join(self.output_dir, filename)
+        if self.fmt == 'ndjson':
+            stream = NdjsonStream(path, self.compress)
+        else:
+            stream = JsonStream(path, key, head, self.compress)
+        self.pending[stream] = (filename, source, isoformat(updated), count)
+        return stream
+
+    def close(self, stream):
+        stream.close()
+        filename, source, updated, count = self.pending.pop(stream)
+        self.manifest.record(filename, source, updated, count)
+        self.files.append(stream.path)
+
+    def export(self):
+        """Повертає dict з кількостями, списками записаних і пропущених файлів"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        categories = list(Category.objects.all())
+        brands = list(Brand.objects.all())
+        totals = product_aggregates()[None]
+        by_category = product_aggregates('category')
+        by_brand = product_aggregates('brand')
+        contents = product_digests(chunk_size=self.chunk_size * 4)
+        images = image_digests() if self.include_images else {}
+        empty = (None, 0)
+
+        meta = {
+            'export_date': timezone.now().isoformat(),
+            'total_products': totals[1],
+            'total_categories': len(categories),
+            'total_brands': len(brands),
+            'version': FEED_VERSION,
+            'source': 'GreenSolarTech Catalog',
+        }
+        category_records = [category_record(category) for category in categories]
+        brand_records = [brand_record(brand) for brand in brands]
+        # Записи товарів містять назви й slug категорії та бренду
+        dictionaries = source_key(category_records, brand_records)
+
+        catalog_source = (totals, contents.get(None), dictionaries, images.get(None))
+        catalog_streams = []
+        if self.fmt == 'json':
+            catalog_streams.append(self.open('full_catalog', 'products', {
+                'meta': meta, 'categories': category_records, 'brands': brand_records,
+            }, catalog_source, totals[0], totals[1]))
+        catalog_streams.append(self.open('products', 'products', {'meta': meta}, catalog_source, totals[0], totals[1]))
+        catalog_streams = [stream for stream in catalog_streams if stream]
+
+        for name, records in (('categories', category_records), ('brands', brand_records)):
+            stream = self.open(name, name, {'meta': meta}, records, None, len(records))
+            if stream:
+                for record in records:
+                    stream.write(record)
+                self.close(stream)
+
+        category_streams = {}
+        for category in categories:
+            aggregates = by_category.get(category.id, empty)
+            stream = self.open(shard_name('category', category), 'products', {
+                'meta': {
+                    **meta,
+                    'category_name': category.name,
+                    'category_slug': category.slug,
+                    'products_count': aggregates[1],
+                },
+                'category': {
+                    'id': category.id,
+                    'name': category.name,
+                    'slug': category.slug,
+                    'description': category.description,
+                },
+            }, (aggregates, contents.get(('category', category.id)), dictionaries, images.get(('category', category.id))),
+                aggregates[0], aggregates[1])
+            if stream:
+                category_streams[category.id] = stream
+
+        brand_streams = {}
+        for brand in brands:
+            aggregates = by_brand.get(brand.id, empty)
+            stream = self.open(shard_name('brand', brand), 'products', {
+                'meta': {
+                    **meta,
+                    'brand_name': brand.name,
+                    'brand_slug': brand.slug,
+                    'products_count': aggregates[1],
+                },
+                'brand': {
+                    'id': brand.id,
+                    'name': brand.name,
+                    'slug': brand.slug,
+                    'description': brand.description,
+                    'website': brand.website,
+                },
+            }, (aggregates, contents.get(('brand', brand.id)), dictionaries, images.get(('brand', brand.id))),
+                aggregates[0], aggregates[1])
+            if stream:
+                brand_streams[brand.id] = stream
+
+        streams = [*catalog_streams, *category_streams.values(), *brand_streams.values()]
+        if streams:
+            # Якщо повний список актуальний, читаються лише товари застарілих шардів
+            filters = None
+            if not catalog_streams:
+                filters = Q(category__in=list(category_streams)) | Q(brand__in=list(brand_streams))
+            try:
+                for product in iter_products(self.include_images, self.chunk_size, filters):
+                    record = product_record(product, self.include_images)
+                    for stream in catalog_streams:
+                        stream.write(record)
+                    if product.category_id in category_streams:
+                        category_streams[product.category_id].write(record)
+                    if product.brand_id in brand_streams:
+                        brand_streams[product.brand_id].write(record)
+            except BaseException:
+                # Недописані файли не замінюють попередні версії
+                for stream in streams:
+                    stream.discard()
+                self.manifest.save()
+                raise
+            for stream in streams:
+                self.close(stream)
+
+        if self.fmt == 'ndjson':
+            filename = feed_filename('meta', 'json', self.compress)
+            stable_meta = {field: value for field, value in meta.items() if field != 'export_date'}
+            source = source_key(stable_meta, self.heads)
+            if self.incremental and self.manifest.is_fresh(filename, source):
+                self.skipped.append(filename)
+            else:
+                path = os.path.join(self.output_dir, filename)
+                with AtomicOutput(path, self.compress) as f:
+                    f.write(dumps({'meta': meta, 'files': self.heads}))
+                self.manifest.record(filename, source, isoformat(totals[0]), totals[1])
+                self.files.append(path)
+
+        removed = self.manifest.prune()
+        self.manifest.save()
+
+        return {
+            'products': totals[1],
+            'categories': len(categories),
+            'brands': len(brands),
+            'files': self.files,
+            'skipped': self.skipped,
+            'removed': removed,
+        }
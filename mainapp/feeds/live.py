@@ -0,0 +1,64 @@
+"""
+Живі фіди: ті самі записи, що й у файлах export_products_json та
+export_google_merchant (див. merchant.merchant_lines), але генеруються на запит потоком (StreamingHttpResponse)
+з .iterator() — пам'ять не залежить від розміру каталогу.
+
+Версія фіду (ETag/Last-Modified) рахується агрегатними запитами без читання
+самих товарів чи зображень, тож повторні умовні запити відповідають 304 за
+ціною кількох SELECT MAX/COUNT. Тому всі шляхи запису товарів в обхід
+save() (імпорт, аудит контенту, масові команди) виставляють updated_at явно,
+а зміна галереї оновлює updated_at свого товару (signals.touch_gallery_product).
+"""
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from mainapp.models import Product, ProductImage, Category, Brand
+
+from .exporter import FEED_VERSION
+from .manifest import source_key
+from .records import product_record, iter_products
+from .writers import dumps
+
+
+def feed_state(name, in_stock_only=False, include_images=False):
+    """
+    (etag, last_modified) фіду: max updated_at, кількість і сума id товарів
+    плюс назви категорій/брендів (вони є в записах товарів) і, якщо фід
+    містить галерею, кількість та найбільший id зображень. Правки наявних
+    зображень видно через updated_at їх товарів.
+    """
+    products = Product.objects.filter(in_stock=True) if in_stock_only else Product.objects.all()
+    totals = products.aggregate(updated=Max('updated_at'), count=Count('id'), ids=Sum('id'))
+    images = ProductImage.objects.aggregate(count=Count('id'), last=Max('id')) if include_images else None
+    etag = source_key(
+        name, FEED_VERSION, totals, images,
+        list(Category.objects.order_by('pk').values_list('id', 'name', 'slug')),
+        list(Brand.objects.order_by('pk').values_list('id', 'name', 'slug')),
+    )
+    return etag, totals['updated']
+
+
+def feed_meta(total_products):
+    return {
+        'export_date': timezone.now().isoformat(),
+        'total_products': total_products,
+        'version': FEED_VERSION,
+        'source': 'GreenSolarTech Catalog',
+    }
+
+
+def json_feed(include_images=False, chunk_size=500):
+    """{"meta": ..., "products": [...]} — як products.json"""
+    yield '{"meta":' + dumps(feed_meta(Product.objects.count())) + ',"products":['
+    separator = ''
+    for product in iter_products(include_images, chunk_size):
+        yield separator + dumps(product_record(product, include_images))
+        separator = ','
+    yield ']}'
+
+
+def ndjson_feed(include_images=False, chunk_size=500):
+    """Один товар на рядок — як products.ndjson"""
+    for product in iter_products(include_images, chunk_size):
+        yield dumps(product_record(product, include_images)) + '\n'
+
@@ -0,0 +1,121 @@
+"""
+Маніфест файлів фіду для інкрементальної регенерації.
+
+Для кожного файлу (шарду) зберігається:
+- source — ключ джерел: хеш вмісту рядків, з яких збирається файл
+  (значення полів товарів, довідники, галереї). Якщо ключ не змінився,
+  файл не перезаписується;
+- etag — хеш вмісту файлу, який view віддає як ETag, щоб споживачі
+  могли робити умовні запити і завантажувати лише змінені шарди;
+- updated_at — найпізніший updated_at товарів шарду (Last-Modified).
+
+signature описує параметри експорту (формат, gzip, зображення, версія) і
+зберігається в кожному записі: файл, записаний з іншими параметрами,
+вважається застарілим, а записи інших форматів у тій самій папці
+залишаються недоторканими.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+MANIFEST_NAME = 'manifest.json'
+
+_manifest_cache = {}
+
+
+def file_etag(path):
+    """Хеш вмісту файлу (sha1, без лапок)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_key(*parts):
+    """Короткий хеш будь-яких JSON-серіалізованих значень"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(str(directory), MANIFEST_NAME), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def get_shard(directory, filename):
+    """
+    Запис маніфесту для файлу (або None). Маніфест перечитується лише
+    якщо файл змінився — для view, що віддає фіди з ETag.
+    """
+    path = os.path.join(str(directory), MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_manifest(directory).get('shards', {}))
+        _manifest_cache[path] = cached
+    return cached[1].get(filename)
+
+
+class FeedManifest:
+    def __init__(self, directory, signature):
+        self.directory = str(directory)
+        self.signature = signature
+        self.shards = load_manifest(self.directory).get('shards', {})
+        self.seen = set()
+
+    def is_fresh(self, filename, source):
+        """Файл існує і зібраний з тих самих джерел"""
+        self.seen.add(filename)
+        entry = self.shards.get(filename)
+        return (
+            entry is not None
+            and entry.get('signature') == self.signature
+            and entry.get('source') == source
+            and os.path.exists(os.path.join(self.directory, filename))
+        )
+
+    def record(self, filename, source, updated_at=None, count=None):
+        """Запам'ятовує щойно записаний файл"""
+        self.seen.add(filename)
+        self.shards[filename] = {
+            'signature': self.signature,
+            'source': source,
+            'etag': file_etag(os.path.join(self.directory, filename)),
+            'updated_at': updated_at,
+            'count': count,
+        }
+
+    def prune(self):
+        """
+        Видаляє файли шардів, яких більше немає (видалена категорія,
+        змінений slug). Повертає імена видалених файлів.
+        """
+        removed = sorted(
+            filename for filename, entry in self.shards.items()
+            if entry.get('signature') == self.signature and filename not in self.seen
+        )
+        for filename in removed:
+            path = os.path.join(self.directory, filename)
+            if os.path.exists(path):
+                os.remove(path)
+            del self.shards[filename]
+        return removed
+
+    def save(self):
+        """Атомарний запис через тимчасовий файл"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'shards': self.shards}, f, ensure_ascii=False, indent=1)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST_NAME))
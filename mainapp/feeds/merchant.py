@@ -0,0 +1,201 @@
+"""
+Рядки Google Merchant Center: спільні для команди export_google_merchant
+та живих фідів (/feeds/google-merchant.csv, .tsv, .xml).
+
+Фід будується за один прохід: товари читаються iterator'ом, галерея
+підвантажується одним prefetch-запитом на частину товарів, а статистика
+якості даних (MerchantQuality) збирається з тих самих об'єктів, без
+додаткових запитів.
+"""
+import csv
+import re
+from xml.sax.saxutils import escape
+
+from mainapp.models import Product
+
+from .records import SITE_URL
+
+
+# Заголовки для Google Merchant Center
+MERCHANT_FIELDS = [
+    'id',
+    'title',
+    'description',
+    'link',
+    'image_link',
+    'additional_image_link',
+    'availability',
+    'price',
+    'sale_price',
+    'brand',
+    'gtin',
+    'mpn',
+    'condition',
+    'product_type',
+    'google_product_category',
+    'custom_label_0',
+    'custom_label_1',
+    'custom_label_2',
+    'custom_label_3',
+    'custom_label_4',
+]
+
+GOOGLE_CATEGORIES = {
+    'Сонячні панелі': '3239',  # Solar Panels
+    'Інвертори': '3239',       # Solar Inverters
+    'Акумуляторні батареї': '3239',  # Solar Batteries
+    'Комплекти резервного живлення': '3239',  # Solar Kits
+}
+
+# Google дозволяє максимум 10 зображень (головне + 9 додаткових)
+MAX_ADDITIONAL_IMAGES = 9
+
+
+def google_category(category_name):
+    """Визначає Google Product Category на основі назви категорії"""
+    for key, value in GOOGLE_CATEGORIES.items():
+        if key.lower() in category_name.lower():
+            return value
+    return '3239'  # За замовчуванням - Solar Energy
+
+
+def merchant_products():
+    """Товари в наявності з усім, що потрібно для рядка (галерея — prefetch)"""
+    return (
+        Product.objects.filter(in_stock=True)
+        .select_related('category', 'brand')
+        .prefetch_related('images')
+    )
+
+
+def merchant_row(product):
+    """Рядок фіду (product.images має бути підвантажений prefetch)"""
+    main_image = product.image_url if product.image else ''
+    additional_images = [
+        image.image_url for image in list(product.images.all())[:MAX_ADDITIONAL_IMAGES]
+        if image.image_url and image.image_url != main_image
+    ]
+    return {
+        'id': str(product.id),
+        'title': product.name,
+        'description': product.description[:5000],  # Обмеження Google
+        'link': f'{SITE_URL}/product/{product.id}/',
+        'image_link': main_image,
+        'additional_image_link': ','.join(additional_images),
+        'availability': 'in stock' if product.in_stock else 'out of stock',
+        'price': f'{product.price} UAH',
+        'sale_price': '',  # Якщо є знижка
+        'brand': product.brand.name if product.brand else 'GreenSolarTech',
+        'gtin': '',  # GTIN код якщо є
+        'mpn': product.model or '',
+        'condition': 'new',
+        'product_type': product.category.name,
+        'google_product_category': google_category(product.category.name),
+        'custom_label_0': product.power or '',
+        'custom_label_1': product.efficiency or '',
+        'custom_label_2': product.warranty or '',
+        'custom_label_3': product.country or '',
+        'custom_label_4': 'featured' if product.featured else '',
+    }
+
+
+MERCHANT_FORMATS = {'csv': '.csv', 'tsv': '.tsv', 'xml': '.xml'}
+
+# TSV Google не підтримує лапки, тож табуляції й переноси замінюються пробілом
+_tsv_unsafe = re.compile(r'[\t\r\n]+')
+
+
+MERCHANT_XML_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n'
+    '<channel>\n'
+    '<title>GreenSolarTech</title>\n'
+    f'<link>{SITE_URL}/</link>\n'
+    '<description>Каталог GreenSolarTech для Google Merchant Center</description>\n'
+)
+MERCHANT_XML_TAIL = '</channel>\n</rss>\n'
+
+
+def merchant_xml_item(row):
+    """<item> RSS 2.0 з полями g:*; порожні поля пропускаються"""
+    parts = ['<item>']
+    for field in MERCHANT_FIELDS:
+        value = row[field]
+        if not value:
+            continue
+        # Кожне додаткове зображення — окремий елемент
+        values = value.split(',') if field == 'additional_image_link' else [value]
+        for item in values:
+            parts.append(f'<g:{field}>{escape(str(item))}</g:{field}>')
+    parts.append('</item>\n')
+    return ''.join(parts)
+
+
+class MerchantQuality:
+    """Статистика якості даних, що збирається під час проходу по товарах"""
+
+    SAMPLE_SIZE = 5  # Скільки товарів показувати для кожної проблеми
+
+    CHECKS = {
+        'no_image': 'товарів без зображень',
+        'no_description': 'товарів без опису',
+        'no_brand': 'товарів без бренду',
+    }
+
+    def __init__(self):
+        self.total = 0
+        self.with_images = 0
+        self.featured = 0
+        self.counts = dict.fromkeys(self.CHECKS, 0)
+        self.samples = {check: [] for check in self.CHECKS}
+
+    def add(self, product):
+        self.total += 1
+        self.featured += product.featured
+        if product.image:
+            self.with_images += 1
+        else:
+            self._problem('no_image', product)
+        if not product.description:
+            self._problem('no_description', product)
+        if product.brand_id is None:
+            self._problem('no_brand', product)
+
+    def _problem(self, check, product):
+        self.counts[check] += 1
+        if len(self.samples[check]) < self.SAMPLE_SIZE:
+            self.samples[check].append((product.id, product.name))
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: write() повертає рядок замість запису"""
+
+    def write(self, value):
+        return value
+
+
+def merchant_lines(fmt='csv', quality=None, chunk_size=500):
+    """
+    Текст фіду у форматі csv/tsv/xml частинами (по рядку на товар).
+    Якщо передано quality, кожен товар додається до статистики.
+    """
+    if fmt == 'xml':
+        yield MERCHANT_XML_HEAD
+    else:
+        delimiter = '\t' if fmt == 'tsv' else ','
+        writer = csv.DictWriter(_Echo(), fieldnames=MERCHANT_FIELDS, delimiter=delimiter)
+        yield writer.writeheader()
+
+    for product in merchant_products().iterator(chunk_size=chunk_size):
+        if quality is not None:
+            quality.add(product)
+        row = merchant_row(product)
+        if fmt == 'xml':
+            yield merchant_xml_item(row)
+        elif fmt == 'tsv':
+            yield writer.writerow({field: _tsv_unsafe.sub(' ', value) for field, value in row.items()})
+        else:
+            yield writer.writerow(row)
+
+    if fmt == 'xml':
+        yield MERCHANT_XML_TAIL
@@ -0,0 +1,107 @@
+"""
+Записи фідів: товар, категорія та бренд як словники для JSON.
+"""
+from mainapp.models import Product
+
+
+SITE_URL = 'https://greensolartech.com.ua'
+
+
+def isoformat(value):
+    return value.isoformat() if value else None
+
+
+def shard_name(prefix, obj):
+    """
+    Ім'я файлу фіду категорії/бренду: id + slug (category_47-invertory).
+    id не змінюється, тож споживачі можуть кешувати файл за іменем,
+    а slug лише робить ім'я читабельним.
+    """
+    return f'{prefix}_{obj.id}-{obj.slug}' if obj.slug else f'{prefix}_{obj.id}'
+
+
+def category_record(category):
+    return {
+        'id': category.id,
+        'name': category.name,
+        'slug': category.slug,
+        'description': category.description,
+        'is_active': category.is_active,
+        'created_at': isoformat(category.created_at),
+    }
+
+
+def brand_record(brand):
+    return {
+        'id': brand.id,
+        'name': brand.name,
+        'slug': brand.slug,
+        'description': brand.description,
+        'website': brand.website,
+        'is_active': brand.is_active,
+        'created_at': isoformat(brand.created_at),
+    }
+
+
+def product_images(product):
+    """Головне зображення та галерея (images має бути підвантажений prefetch)"""
+    images = []
+    if product.image:
+        images.append({
+            'type': 'main',
+            'url': f'{SITE_URL}{product.image_url}',
+            'alt': product.name,
+        })
+    for image in product.images.all():
+        images.append({
+            'type': 'gallery',
+            'url': f'{SITE_URL}{image.image_url}',
+            'alt': image.alt_text or product.name,
+            'is_main': image.is_main,
+            'order': image.order,
+        })
+    return images
+
+
+def product_record(product, include_images=False):
+    record = {
+        'id': product.id,
+        'name': product.name,
+        'description': product.description,
+        'price': float(product.price),
+        'model': product.model,
+        'power': product.power,
+        'efficiency': product.efficiency,
+        'warranty': product.warranty,
+        'country': product.country,
+        'in_stock': product.in_stock,
+        'featured': product.featured,
+        'created_at': isoformat(product.created_at),
+        'updated_at': isoformat(product.updated_at),
+        'category': {
+            'id': product.category.id,
+            'name': product.category.name,
+            'slug': product.category.slug,
+        },
+        'brand': {
+            'id': product.brand.id,
+            'name': product.brand.name,
+            'slug': product.brand.slug,
+        },
+    }
+    if include_images:
+        record['images'] = product_images(product)
+    return record
+
+
+def iter_products(include_images=False, chunk_size=500, filters=None):
+    """
+    Товари у порядку БД одним потоком. Зображення підвантажуються
+    prefetch'ем окремо для кожної частини chunk_size.
+    """
+    queryset = Product.objects.select_related('category', 'brand').order_by('pk')
+    if filters is not None:
+        queryset = queryset.filter(filters)
+    if include_images:
+        queryset = queryset.prefetch_related('images')
+    return queryset.iterator(chunk_size=chunk_size)
@@ -0,0 +1,136 @@
+"""
+Потокові записувачі фідів: записи пишуться у файл по одному, тож пам'ять
+не залежить від кількості товарів.
+
+- JsonStream — JSON-документ {"meta": ..., "<ключ>": [запис, запис, ...]},
+  службові поля пишуться на початку, масив записів — у кінці;
+- NdjsonStream — один запис на рядок (NDJSON).
+
+Обидва пишуть компактний JSON (без відступів) і за потреби стискають gzip.
+Запис іде у тимчасовий файл поруч, який після close() атомарно замінює
+цільовий, тож споживачі ніколи не бачать недописаний фід.
+"""
+import gzip
+import io
+import json
+import os
+import tempfile
+
+
+FORMAT_EXTENSIONS = {'json': '.json', 'ndjson': '.ndjson'}
+
+
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+# Розмір частини відповіді/файлу: менше дрібних записів у сокет і в gzip
+CHUNK_BYTES = 64 * 1024
+
+
+def buffered(pieces, size=CHUNK_BYTES):
+    """Склеює дрібні рядки у частини приблизно по size символів"""
+    buffer = []
+    length = 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def feed_filename(name, fmt='json', compress=False):
+    """products + ndjson + gzip -> products.ndjson.gz"""
+    return name + FORMAT_EXTENSIONS[fmt] + ('.gz' if compress else '')
+
+
+class AtomicOutput:
+    """
+    Текстовий файл, що пишеться у тимчасовий файл і замінює path при
+    close(). gzip пишеться з нульовим mtime, тож однаковий вміст дає
+    однакові байти (і однаковий хеш/ETag).
+    """
+
+    def __init__(self, path, compress=False, newline=None):
+        self.path = str(path)
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        self.raw = os.fdopen(fd, 'wb')
+        self.gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self.raw, mtime=0) if compress else None
+        self.file = io.TextIOWrapper(self.gzip or self.raw, encoding='utf-8', newline=newline)
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def close(self):
+        self.file.close()
+        if self.gzip:
+            self.raw.close()
+        # mkstemp створює файл з правами 0600, фіди ж читає веб-сервер
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        """Скасовує запис: цільовий файл лишається попереднім"""
+        try:
+            self.file.close()
+            if self.gzip:
+                self.raw.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class JsonStream:
+    """JSON-об'єкт з полями head і масивом key, що заповнюється через write()"""
+
+    def __init__(self, path, key, head=None, compress=False):
+        self.path = path
+        self.count = 0
+        self.file = AtomicOutput(path, compress)
+        prefix = dumps(head)[1:-1] + ',' if head else ''
+        self.file.write('{' + prefix + dumps(key) + ':[')
+
+    def write(self, record):
+        self.file.write((',' if self.count else '') + dumps(record))
+        self.count += 1
+
+    def close(self):
+        self.file.write(']}')
+        self.file.close()
+
+    def discard(self):
+        self.file.discard()
+
+
+class NdjsonStream:
+    """Один запис на рядок (метадані NDJSON-фідів пишуться окремим файлом)"""
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.count = 0
+        self.file = AtomicOutput(path, compress)
+
+    def write(self, record):
+        self.file.write(dumps(record) + '\n')
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def discard(self):
+        self.file.discard()
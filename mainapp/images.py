@@ -0,0 +1,58 @@
+"""
+Масове обчислення URL зображень товарів.
+
+Використовує збережене поле image_version, тому для сторінки товарів URL
+формуються за один прохід без MD5 на кожне звернення в шаблоні та без
+прихованих запитів ProductImage.product.
+"""
+from .models import Product, ProductImage, make_image_version, build_image_url, uses_static_media
+
+
+def _iter_images(products):
+    for product in products:
+        cache = getattr(product, '_prefetched_objects_cache', {})
+        for image in cache.get('images', []):
+            yield product, image
+
+
+def resolve_image_urls(objects):
+    """
+    Заповнює image_url для списку Product або ProductImage.
+
+    Для товарів також обробляються вже підвантажені (prefetch) зображення.
+    Старі ProductImage без image_version отримують updated_at товару одним
+    запитом на всю сторінку замість запиту на кожне зображення.
+    """
+    objects = list(objects)
+    static_media = uses_static_media()
+
+    products = [obj for obj in objects if isinstance(obj, Product)]
+    images = [image for _, image in _iter_images(products)]
+    images += [obj for obj in objects if isinstance(obj, ProductImage)]
+
+    for product in products:
+        if not product.image:
+            product._image_url = ''
+            continue
+        version = product.image_version or make_image_version(product.image.name, product.updated_at)
+        product._image_url = build_image_url(product.image, version)
+
+    # Товари, чий updated_at потрібен для старих зображень без версії
+    stamps = {product.pk: product.updated_at for product in products}
+    missing = {
+        image.product_id for image in images
+        if static_media and image.image and not image.image_version and image.product_id not in stamps
+    }
+    if missing:
+        stamps.update(Product.objects.filter(pk__in=missing).values_list('pk', 'updated_at'))
+
+    for image in images:
+        if not image.image:
+            image._image_url = ''
+            continue
+        version = image.image_version
+        if not version and static_media:
+            version = make_image_version(image.image.name, stamps.get(image.product_id))
+        image._image_url = build_image_url(image.image, version)
+
+    return objects
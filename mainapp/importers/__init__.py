@@ -0,0 +1,5 @@
+"""
+Спільні компоненти імпорту каталогу (завантаження зображень, запис товарів,
+читання таблиць), які використовують команди import_full_catalog та
+universal_import_products.
+"""
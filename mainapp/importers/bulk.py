@@ -0,0 +1,317 @@
+"""
+Пакетний запис товарів під час імпорту.
+
+Замість Product.objects.create та get_or_create на кожен рядок:
+- категорії та бренди для всього файлу резолвляться кількома запитами
+  (один SELECT по назвах + один bulk_create відсутніх);
+- товари записуються через bulk_create(update_conflicts=True) по
+  стабільному ключу import_key, тож повторний імпорт оновлює існуючі
+  товари (id та URL зберігаються) замість створення дублікатів;
+- запис іде частинами, кожна частина — окрема транзакція.
+
+Кожен рядок має відбиток (хеш нормалізованих полів та посилань на
+зображення), який зберігається у Product.import_fingerprint. Режим sync()
+порівнює відбитки з БД і записує лише нові/змінені товари, видаляє товари,
+яких більше немає у джерелі, та перезавантажує зображення лише там, де
+змінились посилання.
+
+bulk_create не викликає post_save, тому після запису версія кешу каталогу
+збільшується, а схожі товари перераховуються вручну. Видалення відсутніх
+у джерелі товарів іде з вимкненими обробниками сигналів каталогу і так
+само завершується однією інвалідацією.
+"""
+import hashlib
+from collections import namedtuple
+from itertools import islice
+
+from django.db import transaction
+
+from mainapp.cache import bump_version, CATALOG
+from mainapp.models import Product, ProductImage, Category, Brand, SimilarProduct
+from mainapp.recommendations import update_similar, rebuild_similar
+from mainapp.signals import muted_catalog_signals
+from mainapp.slugs import make_slug, next_free_slug
+
+
+# Поля, які імпорт перезаписує в існуючих товарах. image, featured та
+# created_at не чіпаємо: зображення прикріплюються окремим етапом, а
+# "рекомендований" виставляється вручну в адмінці.
+UPSERT_FIELDS = [
+    'name', 'description', 'price', 'category', 'brand', 'model',
+    'power', 'efficiency', 'warranty', 'country', 'in_stock', 'updated_at',
+    'import_fingerprint',
+]
+
+# Поля, які не входять у відбиток (службові або ті, що імпорт не перезаписує)
+FINGERPRINT_EXCLUDE = {'import_key', 'import_fingerprint', 'featured'}
+
+DEFAULT_CHUNK_SIZE = 500
+
+WriteResult = namedtuple('WriteResult', ['product', 'created'])
+SyncResult = namedtuple('SyncResult', ['results', 'unchanged', 'deleted', 'needing_images'])
+
+
+def make_import_key(source_id=None, brand='', model='', name=''):
+    """
+    Стабільний ключ товару: ідентифікатор з джерела, якщо він є,
+    інакше хеш бренду + моделі (або назви, якщо модель порожня).
+    """
+    if isinstance(source_id, float) and source_id.is_integer():
+        # pandas читає числові id з пропусками як float
+        source_id = int(source_id)
+    if source_id not in (None, ''):
+        return f'src:{source_id}'[:64]
+    raw = '|'.join(str(part or '').strip().lower() for part in (brand, model or name))
+    return 'bm:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _digest(value):
+    return hashlib.md5(value.encode('utf-8')).hexdigest()[:12]
+
+
+def row_fingerprint(row, image_urls=()):
+    """
+    Відбиток рядка "<поля>:<зображення>" — дві частини, щоб відрізнити
+    зміну даних товару від зміни його зображень.
+    """
+    fields = '|'.join(
+        f'{key}={row[key]}' for key in sorted(row) if key not in FINGERPRINT_EXCLUDE
+    )
+    return f'{_digest(fields)}:{_digest("|".join(image_urls))}'
+
+
+def images_changed(old_fingerprint, new_fingerprint):
+    return old_fingerprint.partition(':')[2] != new_fingerprint.partition(':')[2]
+
+
+def unique_slug(name, taken, fallback=''):
+    """Slug як у Category.save/Brand.save, але перевірка по множині в пам'яті"""
+    slug = next_free_slug(make_slug(name) or fallback, taken)
+    taken.add(slug)
+    return slug
+
+
+def batched(iterable, size):
+    """Послідовні списки по size елементів з будь-якого ітератора"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkProductWriter:
+    """
+    Записує товари пакетами.
+
+    Рядок — dict з полями Product, де category та brand задані назвами,
+    а import_key — ключем з make_import_key().
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, category_defaults=None, brand_defaults=None):
+        self.chunk_size = chunk_size
+        self.category_defaults = category_defaults or (lambda name: {'description': f'Категорія {name}'})
+        self.brand_defaults = brand_defaults or (lambda name: {'description': f'Бренд {name}'})
+        self.categories = {}
+        self.brands = {}
+        self.stats = {
+            'products_created': 0,
+            'products_updated': 0,
+            'products_unchanged': 0,
+            'products_deleted': 0,
+            'categories_created': 0,
+            'brands_created': 0,
+        }
+
+    def _ensure(self, model, cache, names, defaults, stat):
+        """name -> об'єкт; відсутні створюються одним bulk_create"""
+        missing = {name for name in names if name and name not in cache}
+        if not missing:
+            return cache
+
+        for obj in model.objects.filter(name__in=missing):
+            cache[obj.name] = obj
+        to_create = sorted(name for name in missing if name not in cache)
+        if to_create:
+            taken = set(model.objects.values_list('slug', flat=True))
+            objects = [
+                model(name=name, slug=unique_slug(name, taken, model._meta.model_name), is_active=True, **defaults(name))
+                for name in to_create
+            ]
+            with transaction.atomic():
+                model.objects.bulk_create(objects, ignore_conflicts=True)
+            # ignore_conflicts не повертає pk — перечитуємо одним запитом
+            for obj in model.objects.filter(name__in=to_create):
+                cache[obj.name] = obj
+            self.stats[stat] += len(to_create)
+        return cache
+
+    def ensure_categories(self, names):
+        return self._ensure(Category, self.categories, names, self.category_defaults, 'categories_created')
+
+    def ensure_brands(self, names):
+        return self._ensure(Brand, self.brands, names, self.brand_defaults, 'brands_created')
+
+    def adopt_legacy_products(self, rows):
+        """
+        Товари, створені до появи import_key, отримують ключ за збігом
+        назви та бренду — щоб перший пакетний імпорт не створив дублікати.
+        """
+        by_name = {(row['name'], row['brand']): row['import_key'] for row in rows}
+        legacy = Product.objects.filter(
+            import_key__isnull=True, name__in={name for name, _ in by_name},
+        ).select_related('brand')
+        adopted = []
+        taken = set()
+        for product in legacy:
+            key = by_name.get((product.name, product.brand.name))
+            if key and key not in taken:
+                product.import_key = key
+                taken.add(key)
+                adopted.append(product)
+        if adopted:
+            existing = set(Product.objects.filter(import_key__in=taken).values_list('import_key', flat=True))
+            adopted = [product for product in adopted if product.import_key not in existing]
+            Product.objects.bulk_update(adopted, ['import_key'], batch_size=self.chunk_size)
+        return len(adopted)
+
+    @staticmethod
+    def _unique_rows(rows, images=None):
+        """Останній рядок з однаковим ключем перемагає; додає відбитки"""
+        images = images or {}
+        rows = {row['import_key']: row for row in rows}
+        for key, row in rows.items():
+            row['import_fingerprint'] = row_fingerprint(row, images.get(key, ()))
+        return list(rows.values())
+
+    def write(self, rows, images=None):
+        """
+        Записує рядки і повертає список WriteResult у порядку рядків.
+        images: {import_key: [URL]} — для відбитків рядків.
+        """
+        rows = self._unique_rows(rows, images)
+        if not rows:
+            return []
+
+        self.ensure_categories({row['category'] for row in rows})
+        self.ensure_brands({row['brand'] for row in rows})
+        self.adopt_legacy_products(rows)
+
+        results = []
+        for chunk in batched(rows, self.chunk_size):
+            keys = [row['import_key'] for row in chunk]
+            products = [
+                Product(
+                    **{key: value for key, value in row.items() if key not in ('category', 'brand')},
+                    category=self.categories[row['category']],
+                    brand=self.brands[row['brand']],
+                )
+                for row in chunk
+            ]
+            with transaction.atomic():
+                existing = set(Product.objects.filter(import_key__in=keys).values_list('import_key', flat=True))
+                Product.objects.bulk_create(
+                    products,
+                    update_conflicts=True,
+                    unique_fields=['import_key'],
+                    update_fields=UPSERT_FIELDS,
+                )
+
+            if any(product.pk is None for product in products):
+                # Бекенд не повертає pk для upsert — дочитуємо по ключах
+                ids = dict(Product.objects.filter(import_key__in=keys).values_list('import_key', 'id'))
+                for product in products:
+                    product.pk = ids.get(product.import_key)
+
+            for product in products:
+                product._state.adding = False
+                product._state.db = Product.objects.db
+                created = product.import_key not in existing
+                self.stats['products_created' if created else 'products_updated'] += 1
+                results.append(WriteResult(product, created))
+
+        update_similar([result.product.pk for result in results])
+        bump_version(CATALOG)
+        return results
+
+    def sync(self, rows, images=None):
+        """
+        Інкрементальна синхронізація з джерелом: записує лише нові та змінені
+        рядки, видаляє імпортовані товари, яких немає у джерелі. rows може
+        бути генератором — рядки обробляються частинами по chunk_size.
+        Повертає SyncResult з товарами, яким потрібно (пере)завантажити
+        зображення.
+        """
+        existing = dict(
+            Product.objects.filter(import_key__isnull=False).values_list('import_key', 'import_fingerprint')
+        )
+        seen = set()
+        results = []
+        unchanged = []
+        for chunk in batched(rows, self.chunk_size):
+            changed = []
+            for row in self._unique_rows(chunk, images):
+                seen.add(row['import_key'])
+                if existing.get(row['import_key']) == row['import_fingerprint']:
+                    unchanged.append(row['import_key'])
+                else:
+                    changed.append(row)
+            if changed:
+                results += self.write(changed, images)
+
+        if not seen:
+            # Порожнє джерело найімовірніше означає помилку читання — нічого не видаляємо
+            return SyncResult([], 0, 0, [])
+
+        # Змінились посилання на зображення — стара галерея більше не актуальна
+        # (товари без попереднього відбитку не чіпаємо: невідомо, що змінилось)
+        relinked = [
+            result.product.pk for result in results
+            if existing.get(result.product.import_key)
+            and images_changed(existing[result.product.import_key], result.product.import_fingerprint)
+        ]
+        if relinked:
+            with muted_catalog_signals():
+                ProductImage.objects.filter(product_id__in=relinked).delete()
+
+        deleted = 0
+        referencing = set()
+        # Обробники сигналів на кожен видалений рядок вимкнені: кеш
+        # інвалідується, а списки схожих товарів доповнюються один раз
+        with muted_catalog_signals():
+            for chunk in batched(sorted(set(existing) - seen), self.chunk_size):
+                referencing.update(
+                    SimilarProduct.objects.filter(similar__import_key__in=chunk).values_list('product_id', flat=True)
+                )
+                with transaction.atomic():
+                    deleted += Product.objects.filter(import_key__in=chunk).delete()[1].get(Product._meta.label, 0)
+        self.stats['products_deleted'] += deleted
+        self.stats['products_unchanged'] += len(unchanged)
+        if deleted:
+            rebuild_similar(referencing)
+        if deleted or relinked:
+            bump_version(CATALOG)
+
+        needing_images = self.needing_images(results, relinked)
+        # Незмінені товари, для яких минулого разу не вдалось завантажити зображення
+        for chunk in batched(unchanged, self.chunk_size):
+            needing_images += list(Product.objects.filter(import_key__in=chunk, image=''))
+        return SyncResult(results, len(unchanged), deleted, needing_images)
+
+    def needing_images(self, results, relinked=()):
+        """
+        Товари, яким потрібно завантажити зображення: нові та існуючі без
+        головного зображення (один запит). Об'єкти з пам'яті не містять
+        image/featured існуючих товарів, тому зберігати їх слід лише
+        з update_fields.
+        """
+        updated_ids = [result.product.pk for result in results if not result.created]
+        without_image = set(
+            Product.objects.filter(pk__in=updated_ids, image='').values_list('id', flat=True)
+        ) if updated_ids else set()
+        refresh = without_image | set(relinked)
+        return [
+            result.product for result in results
+            if result.created or result.product.pk in refresh
+        ]
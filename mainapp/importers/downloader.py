@@ -0,0 +1,221 @@
+"""
+Паралельне завантаження зображень для імпорту каталогу.
+
+- пул потоків з однією requests.Session (keep-alive, пул з'єднань);
+- обмеження частоти та кількості одночасних запитів на кожен хост;
+- повтори з експоненційною затримкою для мережевих помилок та 429/5xx;
+- кеш на диску: URL -> хеш вмісту -> файл, тож повторний імпорт не
+  завантажує вже отримані зображення, а однакові файли з різних URL
+  зберігаються один раз;
+- результати віддаються по мірі готовності (iter_downloads), а в роботі
+  одночасно не більше 2×workers зображень, тож пам'ять не росте з
+  розміром каталогу.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DownloadResult = namedtuple('DownloadResult', ['url', 'content', 'digest', 'extension', 'error'])
+
+
+def guess_extension(url, content_type=''):
+    """Розширення файлу за URL або Content-Type (за замовчуванням .jpg)"""
+    path = urlparse(url).path.lower()
+    for ext in ('.jpg', '.jpeg', '.png', '.webp', '.gif'):
+        if path.endswith(ext):
+            return '.jpg' if ext == '.jpeg' else ext
+    if 'png' in content_type:
+        return '.png'
+    if 'webp' in content_type:
+        return '.webp'
+    return '.jpg'
+
+
+def safe_filename(text, limit=30):
+    return re.sub(r'[^\w\-_.]', '_', text)[:limit]
+
+
+class DiskCache:
+    """Кеш завантажених зображень: blobs/<digest> + index.json (url -> digest)"""
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        self.blobs = os.path.join(self.directory, 'blobs')
+        self.index_path = os.path.join(self.directory, 'index.json')
+        self.lock = threading.Lock()
+        os.makedirs(self.blobs, exist_ok=True)
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def get(self, url):
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        path = os.path.join(self.blobs, entry['digest'])
+        try:
+            with open(path, 'rb') as f:
+                return f.read(), entry['digest'], entry['extension']
+        except OSError:
+            return None
+
+    def put(self, url, content, digest, extension):
+        path = os.path.join(self.blobs, digest)
+        with self.lock:
+            # Однаковий вміст з різних URL зберігається один раз
+            if not os.path.exists(path):
+                fd, tmp_path = tempfile.mkstemp(dir=self.blobs)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            self.index[url] = {'digest': digest, 'extension': extension}
+
+    def flush(self):
+        with self.lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+
+
+class HostThrottle:
+    """Мінімальний інтервал між запитами та ліміт паралельних запитів на хост"""
+
+    def __init__(self, interval, max_concurrent):
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self.lock = threading.Lock()
+        self.next_slot = {}
+        self.semaphores = {}
+
+    def semaphore(self, host):
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self.semaphores[host]
+
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ImageDownloader:
+    """
+    Завантажувач зображень.
+
+    Використання:
+        downloader = ImageDownloader(cache_dir=...)
+        for result in downloader.iter_downloads(urls):   # DownloadResult
+            ...  # зберегти result.content і відпустити його
+    """
+
+    def __init__(self, workers=8, timeout=30, retries=3, backoff=0.5,
+                 per_host_interval=0.1, per_host_concurrency=4, cache_dir=None, session=None):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.throttle = HostThrottle(per_host_interval, per_host_concurrency)
+        self.cache = DiskCache(cache_dir) if cache_dir else None
+        self.session = session or self._make_session()
+        self.stats = {'downloaded': 0, 'cached': 0, 'failed': 0}
+        self.stats_lock = threading.Lock()
+
+    def _make_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url):
+        """Завантажує одне зображення (з кешу, якщо воно там є)"""
+        url = url.strip()
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached:
+                self._count('cached')
+                content, digest, extension = cached
+                return DownloadResult(url, content, digest, extension, None)
+
+        host = urlparse(url).netloc
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            try:
+                with self.throttle.semaphore(host):
+                    self.throttle.wait(host)
+                    response = self.session.get(url, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES:
+                    error = f'HTTP {response.status_code}'
+                    continue
+                response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+                continue
+            except requests.RequestException as e:
+                # 4xx (крім 429) повторювати немає сенсу
+                error = str(e)
+                break
+
+            content = response.content
+            digest = hashlib.md5(content).hexdigest()
+            extension = guess_extension(url, response.headers.get('Content-Type', ''))
+            if self.cache:
+                self.cache.put(url, content, digest, extension)
+            self._count('downloaded')
+            return DownloadResult(url, content, digest, extension, None)
+
+        self._count('failed')
+        return DownloadResult(url, None, None, None, error)
+
+    def iter_downloads(self, urls):
+        """
+        Паралельно завантажує унікальні URL і віддає DownloadResult у
+        порядку готовності. Нові URL подаються в пул лише коли звільняється
+        місце, тож у пам'яті не більше 2×workers завантажених зображень.
+        """
+        unique = dict.fromkeys(url.strip() for url in urls if url and url.strip())
+        in_flight = self.workers * 2
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                pending = set()
+                for url in unique:
+                    pending.add(executor.submit(self.fetch, url))
+                    if len(pending) >= in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                for future in as_completed(pending):
+                    yield future.result()
+        finally:
+            if self.cache:
+                self.cache.flush()
@@ -0,0 +1,168 @@
+"""
+Потокове читання таблиць імпорту.
+
+XLSX читається через openpyxl у режимі read_only (рядки не завантажуються в
+пам'ять цілком), CSV — стандартним модулем csv. Заголовки джерела
+відображаються на поля іменованих кортежів через спільні мапінги колонок,
+значення одразу приводяться до типів (рядок / Decimal / id), порожні
+клітинки стають None. Рядки віддаються по одному, тож пам'ять не залежить
+від розміру каталогу, а pandas для імпорту не потрібен.
+"""
+import csv
+import os
+import re
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from openpyxl import load_workbook
+
+
+# Аркуші у вигрузці prom.ua
+PRODUCTS_SHEET = 'Export Products Sheet'
+GROUPS_SHEET = 'Export Groups Sheet'
+
+CSV_EXTENSIONS = ('.csv', '.tsv', '.txt')
+CSV_DELIMITERS = (',', ';', '\t')
+
+
+def text(value):
+    """Рядок без пробілів по краях або None для порожніх клітинок"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value if value and value.lower() != 'nan' else None
+
+
+def number(value):
+    """Decimal з числа або рядка на кшталт '14 900,50 грн' (None, якщо не число)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    cleaned = re.sub(r'[^\d.,]', '', str(value)).replace(',', '.')
+    try:
+        return Decimal(cleaned) if cleaned else None
+    except InvalidOperation:
+        return None
+
+
+def identifier(value):
+    """Ідентифікатор як рядок (2357036642.0 -> '2357036642')"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return text(value)
+
+
+# Поле кортежу -> (заголовок колонки, перетворення)
+PRODUCT_COLUMNS = {
+    'source_id': ('Унікальний_ідентифікатор', identifier),
+    'code': ('Код_товару', identifier),
+    'name_ru': ('Назва_позиції', text),
+    'name_uk': ('Назва_позиції_укр', text),
+    'description_ru': ('Опис', text),
+    'description_uk': ('Опис_укр', text),
+    'price': ('Ціна', number),
+    'image_links': ('Посилання_зображення', text),
+    'group': ('Назва_групи', text),
+    'brand': ('Виробник', text),
+    'country': ('Країна_виробник', text),
+}
+
+GROUP_COLUMNS = {
+    'group_id': ('Ідентифікатор_групи', identifier),
+    'name_ru': ('Назва_групи', text),
+    'name_uk': ('Назва_групи_укр', text),
+}
+
+# Характеристики йдуть повторюваними трійками колонок
+CHARACTERISTIC_HEADERS = ('Назва_Характеристики', 'Одиниця_виміру_Характеристики', 'Значення_Характеристики')
+
+# line — номер рядка у файлі (для повідомлень про помилки)
+ProductRow = namedtuple('ProductRow', ['line', *PRODUCT_COLUMNS, 'characteristics'])
+GroupRow = namedtuple('GroupRow', ['line', *GROUP_COLUMNS])
+Characteristic = namedtuple('Characteristic', ['name', 'unit', 'value'])
+
+
+def iter_raw_rows(path, sheet_names=()):
+    """Сирі рядки таблиці (перший — заголовок) з XLSX або CSV"""
+    if str(path).lower().endswith(CSV_EXTENSIONS):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            # Роздільник визначаємо за заголовком: описи містять коми та
+            # переноси рядків, тож евристика по вмісту помиляється
+            header = f.readline()
+            f.seek(0)
+            delimiter = max(CSV_DELIMITERS, key=header.count)
+            yield from csv.reader(f, delimiter=delimiter)
+        return
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = next(
+            (workbook[name] for name in sheet_names if name in workbook.sheetnames),
+            workbook.worksheets[0],
+        )
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+class TableReader:
+    """
+    Ітератор типізованих рядків таблиці за мапінгом колонок.
+
+    Відсутні у файлі колонки дають None, повністю порожні рядки пропускаються.
+    """
+
+    def __init__(self, path, columns, row_type, sheet_names=(), characteristics=False):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.columns = columns
+        self.row_type = row_type
+        self.sheet_names = sheet_names
+        self.characteristics = characteristics
+
+    def _positions(self, header):
+        header = [text(value) for value in header]
+        positions = [
+            (header.index(name) if name in header else None, convert)
+            for name, convert in self.columns.values()
+        ]
+        triples = []
+        if self.characteristics:
+            indexes = [[i for i, value in enumerate(header) if value == name] for name in CHARACTERISTIC_HEADERS]
+            triples = list(zip(*indexes))
+        return positions, triples
+
+    def __iter__(self):
+        rows = iter_raw_rows(self.path, self.sheet_names)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions, triples = self._positions(header)
+
+        for line, values in enumerate(rows, start=2):
+            if not any(value not in (None, '') for value in values):
+                continue
+            size = len(values)
+            fields = [
+                convert(values[index]) if index is not None and index < size else None
+                for index, convert in positions
+            ]
+            if self.characteristics:
+                fields.append(tuple(
+                    Characteristic(*(text(values[i]) if i < size else None for i in triple))
+                    for triple in triples
+                ))
+            yield self.row_type(line, *fields)
+
+
+def read_products(path):
+    """Рядки товарів (ProductRow) з вигрузки товарів"""
+    return TableReader(path, PRODUCT_COLUMNS, ProductRow, (PRODUCTS_SHEET,), characteristics=True)
+
+
+def read_groups(path):
+    """Рядки груп (GroupRow) з вигрузки груп"""
+    return TableReader(path, GROUP_COLUMNS, GroupRow, (GROUPS_SHEET,))
+
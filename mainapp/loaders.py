@@ -0,0 +1,69 @@
+"""
+Завантажувачі даних сторінок.
+
+load_product_page() збирає все для сторінки товару фіксованою кількістю
+запитів, незалежно від розміру галереї:
+1. товар з категорією та брендом (select_related);
+2. галерея, впорядкована у Prefetch (а не .order_by() після prefetch,
+   який скидає кеш і робить новий запит на кожне звернення);
+3. схожі товари з SimilarProduct (mainapp.recommendations).
+Хлібні крихти беруться з кешованого резолвера каталогу.
+"""
+from django.db.models import Prefetch
+from django.http import Http404
+from django.urls import reverse
+
+from .budget import query_budget
+from .images import resolve_image_urls
+from .models import Product, ProductImage
+from .recommendations import SIMILAR_LIMIT
+from .resolvers import get_catalog_lookup
+
+
+# Товар, галерея, схожі товари + два запити резолвера каталогу на холодному кеші
+PRODUCT_PAGE_QUERIES = 5
+
+
+def ordered_gallery():
+    return Prefetch('images', queryset=ProductImage.objects.order_by('order', 'id'))
+
+
+def product_breadcrumbs(product):
+    """[(назва, url)] від головної до категорії товару"""
+    key = get_catalog_lookup().category_url_key(product.category_id, product.category.slug)
+    return [
+        ('Головна', reverse('mainapp:index')),
+        ('Каталог', reverse('mainapp:catalog')),
+        (product.category.name, reverse('mainapp:category', args=[key])),
+    ]
+
+
+@query_budget(PRODUCT_PAGE_QUERIES)
+def load_product_page(product_id):
+    """Дані сторінки товару в наявності або Http404"""
+    product = (
+        Product.objects.select_related('category', 'brand')
+        .prefetch_related(ordered_gallery())
+        .filter(id=product_id, in_stock=True)
+        .first()
+    )
+    if product is None:
+        raise Http404('Товар не знайдено')
+
+    # Список з кешу prefetch, вже у порядку (order, id)
+    product_images = list(product.images.all())
+    similar_products = list(
+        Product.objects.filter(similar_to__product_id=product.id, in_stock=True)
+        .select_related('category', 'brand')
+        .order_by('similar_to__rank')[:SIMILAR_LIMIT]
+    )
+    resolve_image_urls([product, *similar_products])
+
+    return {
+        'product': product,
+        'product_images': product_images,
+        # Об'єкт ProductImage або сам товар (обидва мають image_url)
+        'main_image': product_images[0] if product_images else product,
+        'similar_products': similar_products,
+        'breadcrumbs': product_breadcrumbs(product),
+    }
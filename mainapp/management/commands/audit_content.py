@@ -0,0 +1,107 @@
+"""
+Команда для аудиту контенту за один прохід: виявлення російських текстів,
+орфографія та заміна російських описів українськими
+"""
+from django.core.management.base import BaseCommand
+from mainapp.audit.content import CHECKS, RussianContentCheck
+from mainapp.audit.runner import ContentAudit, DEFAULT_CHUNK_SIZE
+
+
+MODEL_TITLES = {
+    'Product': ('📦', 'Товари', 'Товар'),
+    'Category': ('📂', 'Категорії', 'Категорія'),
+    'Brand': ('🏷️', 'Бренди', 'Бренд'),
+    'Portfolio': ('🏗️', 'Портфоліо', 'Проєкт'),
+    'Review': ('⭐', 'Відгуки', 'Відгук'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Аудит контенту (російська мова, орфографія) за один прохід по кожній моделі'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Записати виправлення в базу',
+        )
+        parser.add_argument(
+            '--checks',
+            nargs='+',
+            choices=list(CHECKS),
+            default=list(CHECKS),
+            help='Перевірки для запуску (за замовчуванням — всі)',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Строга перевірка - позначає навіть підозрілий контент',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Розмір частини для читання та запису (за замовчуванням {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Кількість процесів для перевірок (за замовчуванням 1 — без пулу)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Перевірити всі записи, а не лише змінені після попереднього аудиту',
+        )
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        checks = [
+            RussianContentCheck(strict=options['strict']) if name == 'russian' else CHECKS[name]()
+            for name in CHECKS if name in options['checks']
+        ]
+
+        self.stdout.write(f"🔍 Аудит контенту: {', '.join(check.name for check in checks)}")
+        if not fix:
+            self.stdout.write(self.style.WARNING("РЕЖИМ ПЕРЕВІРКИ - зміни не будуть збережені (--fix для виправлення)"))
+        elif not options['full']:
+            self.stdout.write("ℹ️ Перевіряються лише записи, змінені після попереднього аудиту (--full для повного)")
+
+        audit = ContentAudit(
+            checks, fix=fix, chunk_size=options['chunk_size'], workers=options['workers'],
+            incremental=not options['full'],
+        )
+        result = audit.run(on_model=self.report_model, on_finding=self.report_finding)
+
+        self.stdout.write("\n📊 ПІДСУМКИ:")
+        for model, (icon, title, _) in MODEL_TITLES.items():
+            if model in result.findings:
+                line = f"   {icon} {title}: проблем {result.issues[model]} у {result.findings[model]} записах"
+                if fix:
+                    line += f", виправлено записів {result.fixed[model]}"
+                self.stdout.write(line)
+
+        total = sum(result.issues.values())
+        if not total:
+            self.stdout.write(self.style.SUCCESS("\n✅ ПРОБЛЕМ НЕ ЗНАЙДЕНО\nВсі тексти коректні! 🇺🇦"))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n🎉 АУДИТ ЗАВЕРШЕНО\n"
+                f"Знайдено проблем: {total}\n"
+                f"Виправлено записів: {sum(result.fixed.values())}"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"\n⚠️ ЗНАЙДЕНО ПРОБЛЕМИ: {total}\n"
+                f"Для виправлення запустіть команду з параметром --fix"
+            ))
+
+    def report_model(self, model):
+        icon, title, _ = MODEL_TITLES[model]
+        self.stdout.write(f"\n{icon} {title}...")
+
+    def report_finding(self, finding):
+        self.stdout.write(f"   ❌ {MODEL_TITLES[finding.model][2]} ID {finding.pk}: {str(finding.title)[:50]}")
+        for issue in finding.issues:
+            self.stdout.write(f"      • [{issue.check}] {issue.message}")
@@ -0,0 +1,74 @@
+"""
+Команда для заповнення збережених версій URL зображень (image_version)
+Версія рахується тією ж формулою, що й раніше, тому існуючі URL не змінюються
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from mainapp.models import Product, ProductImage, make_image_version
+
+
+class Command(BaseCommand):
+    help = 'Заповнення image_version для товарів та зображень галереї'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Перерахувати версії для всіх записів, а не лише порожніх'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Розмір пакету для bulk_update'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        recompute_all = options['all']
+
+        self.stdout.write('🖼️ Заповнення версій зображень...')
+
+        products = Product.objects.exclude(image='').only('id', 'image', 'updated_at', 'image_version')
+        if not recompute_all:
+            products = products.filter(image_version='')
+        products_updated = self.backfill(
+            Product,
+            products,
+            lambda product: make_image_version(product.image.name, product.updated_at)
+        )
+
+        # updated_at товару беремо через select_related одним запитом
+        images = ProductImage.objects.exclude(image='').select_related('product').only(
+            'id', 'image', 'image_version', 'product__updated_at'
+        )
+        if not recompute_all:
+            images = images.filter(image_version='')
+        images_updated = self.backfill(
+            ProductImage,
+            images,
+            lambda image: make_image_version(image.image.name, image.product.updated_at)
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Оновлено товарів: {products_updated}, зображень галереї: {images_updated}'
+        ))
+
+    def backfill(self, model, queryset, compute):
+        """Оновлює image_version пакетами через bulk_update (без save() і сигналів)"""
+        batch = []
+        updated = 0
+        for obj in queryset.iterator(chunk_size=self.batch_size):
+            obj.image_version = compute(obj)
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                updated += self.flush(model, batch)
+                batch = []
+        if batch:
+            updated += self.flush(model, batch)
+        return updated
+
+    def flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_update(batch, ['image_version'])
+        return len(batch)
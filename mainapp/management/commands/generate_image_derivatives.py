@@ -0,0 +1,86 @@
+"""
+Команда для генерації адаптивних варіантів зображень (thumb/card/detail/zoom)
+у форматах WebP/JPEG (та AVIF, якщо доступний) для товарів і портфоліо
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from mainapp.derivatives import DERIVATIVE_FORMATS, generate_derivatives, load_manifest, update_manifest
+from mainapp.models import Product, ProductImage, Portfolio
+
+
+class Command(BaseCommand):
+    help = 'Генерація адаптивних варіантів зображень (WebP/JPEG) у пулі процесів'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Кількість процесів (за замовчуванням — кількість CPU)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перегенерувати варіанти навіть якщо вони вже є'
+        )
+
+    def collect_names(self):
+        """Всі оригінали: поля моделей та файли папки портфоліо"""
+        names = set()
+        names.update(Product.objects.exclude(image='').values_list('image', flat=True))
+        names.update(ProductImage.objects.exclude(image='').values_list('image', flat=True))
+        names.update(Portfolio.objects.exclude(image='').values_list('image', flat=True))
+
+        # Портфоліо показує всі файли з media/portfolio (див. Portfolio.all_images)
+        portfolio_dir = os.path.join(str(settings.MEDIA_ROOT), 'portfolio')
+        if os.path.isdir(portfolio_dir):
+            for filename in os.listdir(portfolio_dir):
+                if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
+                    names.add(f'portfolio/{filename}')
+        return sorted(names)
+
+    def handle(self, *args, **options):
+        force = options['force']
+        workers = max(1, options['workers'])
+
+        names = self.collect_names()
+        if not force:
+            manifest = load_manifest()
+            names = [name for name in names if name not in manifest]
+
+        self.stdout.write(
+            f"🖼️ Генерація варіантів ({', '.join(DERIVATIVE_FORMATS)}) для {len(names)} зображень, процесів: {workers}"
+        )
+        if not names:
+            self.stdout.write(self.style.SUCCESS('✅ Всі варіанти вже згенеровані'))
+            return
+
+        media_root = str(settings.MEDIA_ROOT)
+        entries = {}
+        failed = 0
+
+        if workers == 1:
+            results = (generate_derivatives(name, media_root, force) for name in names)
+            for name, entry in results:
+                failed += self.collect(entries, name, entry)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(generate_derivatives, name, media_root, force) for name in names]
+                for future in as_completed(futures):
+                    name, entry = future.result()
+                    failed += self.collect(entries, name, entry)
+
+        update_manifest(entries)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Згенеровано варіанти для {len(entries)} зображень'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'⚠️ Пропущено (файл відсутній або пошкоджений): {failed}'))
+
+    def collect(self, entries, name, entry):
+        if entry:
+            entries[name] = entry
+            return 0
+        return 1
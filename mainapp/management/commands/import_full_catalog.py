@@ -2,38 +2,72 @@
 Команда для повного імпорту каталогу з Excel таблиць
 Імпортує всі 42 товари з автоматичним перекладом та очищенням HTML
 """
-import pandas as pd
-import requests
-import re
 import os
-import time
 import hashlib
-from urllib.parse import urlparse
+from collections import defaultdict
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.core.files.base import ContentFile
 from django.db import transaction
 from django.utils.text import slugify
-from mainapp.models import Product, Category, Brand, ProductImage
+from mainapp.models import Product, Category, ProductImage
+from mainapp.importers.bulk import BulkProductWriter, make_import_key, batched
+from mainapp.importers.downloader import ImageDownloader, safe_filename
+from mainapp.importers.reader import read_products
+from mainapp.normalization import translate_terms, has_russian_letters
+from mainapp.signals import catalog_changed, muted_catalog_signals
 from bs4 import BeautifulSoup
 
 class Command(BaseCommand):
     help = 'Повний імпорт каталогу з Excel таблиць (всі 42 товари)'
 
     def add_arguments(self, parser):
-        parser.add_argument(
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
             '--clear-existing',
             action='store_true',
             help='Видалити всі існуючі товари перед імпортом'
         )
+        mode.add_argument(
+            '--sync',
+            action='store_true',
+            help='Інкрементальна синхронізація: записати лише нові/змінені товари, видалити відсутні у файлі'
+        )
         parser.add_argument(
             '--dry-run',
             action='store_true',
             help='Режим попереднього перегляду'
         )
+        parser.add_argument(
+            '--products-file',
+            type=str,
+            default='export-products-10-07-25_11-38-56.xlsx',
+            help='Файл з товарами (XLSX або CSV)'
+        )
+        parser.add_argument(
+            '--download-workers',
+            type=int,
+            default=8,
+            help='Кількість паралельних завантажень зображень'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Кількість товарів в одній транзакції запису'
+        )
 
     def handle(self, *args, **options):
         self.clear_existing = options['clear_existing']
+        self.sync = options['sync']
         self.dry_run = options['dry_run']
+        self.products_file = options['products_file']
+        self.download_workers = options['download_workers']
+        self.writer = BulkProductWriter(
+            chunk_size=options['chunk_size'],
+            category_defaults=lambda name: {'description': self.CATEGORY_DESCRIPTIONS.get(name, '')},
+            brand_defaults=lambda name: {'description': f'Продукція бренду {name}'},
+        )
         
         if self.dry_run:
             self.stdout.write(self.style.WARNING("🔍 РЕЖИМ ПОПЕРЕДНЬОГО ПЕРЕГЛЯДУ"))
@@ -44,21 +78,22 @@ class Command(BaseCommand):
         # Ініціалізуємо статистику
         self.stats = {
             'products_created': 0,
+            'products_updated': 0,
+            'products_unchanged': 0,
+            'products_deleted': 0,
             'categories_created': 0,
             'brands_created': 0,
             'images_downloaded': 0,
             'products_skipped': 0,
             'products_translated': 0,
+            'rows_read': 0,
             'errors': 0
         }
         
         try:
             # Перевіряємо файли
-            if not os.path.exists('export-products-10-07-25_11-38-56.xlsx'):
-                raise CommandError('Файл export-products-10-07-25_11-38-56.xlsx не знайдений')
-            
-            if not os.path.exists('second.xlsx'):
-                raise CommandError('Файл second.xlsx не знайдений')
+            if not os.path.exists(self.products_file):
+                raise CommandError(f'Файл {self.products_file} не знайдений')
             
             # Очищуємо існуючі товари якщо потрібно
             if self.clear_existing:
@@ -88,47 +123,26 @@ class Command(BaseCommand):
             Product.objects.all().delete()
             self.stdout.write(f"🗑️ Видалено {count} існуючих товарів")
 
+    # 5 основних категорій каталогу
+    CATEGORY_DESCRIPTIONS = {
+        'Інвертори': 'Гібридні та сонячні інвертори для систем резервного живлення',
+        'Акумуляторні батареї': 'LiFePO4 та інші типи акумуляторів для систем накопичення енергії',
+        'Сонячні панелі': 'Монокристалічні та полікристалічні сонячні панелі',
+        'Комплекти резервного живлення': 'Готові рішення для автономного електропостачання',
+        'Додаткові послуги': 'Монтаж, налаштування та обслуговування обладнання',
+    }
+
     def create_main_categories(self):
-        """Створює 4 основні категорії"""
-        categories_data = [
-            {
-                'name': 'Інвертори',
-                'description': 'Гібридні та сонячні інвертори для систем резервного живлення'
-            },
-            {
-                'name': 'Акумуляторні батареї', 
-                'description': 'LiFePO4 та інші типи акумуляторів для систем накопичення енергії'
-            },
-            {
-                'name': 'Сонячні панелі',
-                'description': 'Монокристалічні та полікристалічні сонячні панелі'
-            },
-            {
-                'name': 'Комплекти резервного живлення',
-                'description': 'Готові рішення для автономного електропостачання'
-            },
-            {
-                'name': 'Додаткові послуги',
-                'description': 'Монтаж, налаштування та обслуговування обладнання'
-            }
-        ]
+        """Створює основні категорії (відсутні — одним пакетним запитом)"""
+        if self.dry_run:
+            for name in self.CATEGORY_DESCRIPTIONS:
+                self.stdout.write(f"   [DRY RUN] Створив би категорію: {name}")
+            return
         
-        for cat_data in categories_data:
-            if self.dry_run:
-                self.stdout.write(f"   [DRY RUN] Створив би категорію: {cat_data['name']}")
-                continue
-                
-            category, created = Category.objects.get_or_create(
-                name=cat_data['name'],
-                defaults={
-                    'description': cat_data['description'],
-                    'is_active': True
-                }
-            )
-            
-            if created:
-                self.stats['categories_created'] += 1
-                self.stdout.write(f"✅ Створено категорію: {category.name}")
+        self.writer.ensure_categories(self.CATEGORY_DESCRIPTIONS)
+        self.stats['categories_created'] = self.writer.stats['categories_created']
+        if self.stats['categories_created']:
+            self.stdout.write(f"✅ Створено категорій: {self.stats['categories_created']}")
 
     def get_category_mapping(self):
         """Мапінг груп товарів на основні категорії"""
@@ -145,83 +159,14 @@ class Command(BaseCommand):
         }
 
     def translate_russian_to_ukrainian(self, text):
-        """Автоматичний переклад російської на українську"""
-        if pd.isna(text):
+        """Автоматичний переклад російських термінів на українську (один прохід)"""
+        if not text:
             return ""
-            
-        text = str(text).strip()
-        
-        # Словник перекладів
-        translations = {
-            # Загальні терміни
-            'Гибридный': 'Гібридний',
-            'инвертор': 'інвертор',
-            'Инвертор': 'Інвертор',
-            'Аккумуляторная': 'Акумуляторна',
-            'батарея': 'батарея',
-            'Батарея': 'Батарея',
-            'Солнечная': 'Сонячна',
-            'панель': 'панель',
-            'Панель': 'Панель',
-            'Комплект': 'Комплект',
-            'резервного': 'резервного',
-            'питания': 'живлення',
-            'жизни': 'життя',
-            'мощность': 'потужність',
-            'напряжение': 'напруга',
-            'емкость': 'ємність',
-            'гарантия': 'гарантія',
-            'производитель': 'виробник',
-            'высокое': 'високе',
-            'низкое': 'низьке',
-            'система': 'система',
-            'хранения': 'зберігання',
-            'энергии': 'енергії',
-            'модулей': 'модулів',
-            'услуги': 'послуги',
-            'монтаж': 'монтаж',
-            'установка': 'встановлення',
-            
-            # Технічні терміни
-            'кВт': 'кВт',
-            'кВтч': 'кВт⋅год',
-            'литиевая': 'літієва',
-            'железофосфатная': 'залізно-фосфатна',
-            'LiFePO4': 'LiFePO4',
-            'фазный': 'фазний',
-            'автономный': 'автономний',
-            'гибридный': 'гібридний',
-            'высоковольтная': 'високовольтна',
-            'низковольтная': 'низьковольтна',
-            
-            # Бренди (зберігаємо як є)
-            'Must': 'Must',
-            'Deye': 'Deye',
-            'Longi': 'Longi',
-            'LONGI': 'LONGI',
-            'Risen': 'Risen',
-            'lvtopsun': 'lvtopsun',
-            'LVTOPSUN': 'LVTOPSUN',
-            
-            # Характеристики
-            'Характеристики': 'Характеристики',
-            'Технические': 'Технічні',
-            'параметры': 'параметри',
-            'описание': 'опис',
-            'применение': 'застосування',
-            'преимущества': 'переваги',
-            'особенности': 'особливості',
-        }
-        
-        # Заміна по словнику
-        for ru_word, uk_word in translations.items():
-            text = re.sub(re.escape(ru_word), uk_word, text, flags=re.IGNORECASE)
-            
-        return text
+        return translate_terms(str(text).strip())
 
     def clean_html_description(self, description):
         """Очищає опис від HTML тегів, але зберігає структуру"""
-        if pd.isna(description):
+        if not description:
             return ""
         
         description = str(description)
@@ -240,166 +185,139 @@ class Command(BaseCommand):
 
     def contains_russian(self, text):
         """Перевіряє чи містить текст російські символи"""
-        if pd.isna(text):
-            return False
-        
-        russian_chars = ['ы', 'э', 'ъ', 'ё']
-        text_lower = str(text).lower()
-        
-        # Перевіряємо російські літери
-        for char in russian_chars:
-            if char in text_lower:
-                return True
-                
-        return False
+        return has_russian_letters(str(text)) if text else False
 
-    def create_or_get_brand(self, brand_name):
-        """Створює або отримує бренд"""
-        if pd.isna(brand_name):
-            brand_name = "Невідомий"
-        
-        brand_name = str(brand_name).strip()
-        
-        if self.dry_run:
+    def image_file(self, result, product_name):
+        """ContentFile з результату завантаження"""
+        if result is None or result.error:
+            if result is not None:
+                self.stdout.write(f"⚠️ Помилка завантаження {result.url}: {result.error}")
             return None
-            
-        brand, created = Brand.objects.get_or_create(
-            name=brand_name,
-            defaults={
-                'description': f'Продукція бренду {brand_name}',
-                'is_active': True
-            }
-        )
         
-        if created:
-            self.stats['brands_created'] += 1
-            self.stdout.write(f"✅ Створено бренд: {brand.name}")
+        # Генеруємо унікальне ім'я файлу
+        url_hash = hashlib.md5(result.url.encode()).hexdigest()[:8]
+        filename = f"{safe_filename(product_name)}_{url_hash}{result.extension}"
         
-        return brand
+        self.stats['images_downloaded'] += 1
+        return ContentFile(result.content, name=filename)
 
-    def download_image(self, url, product_name):
-        """Завантажує зображення з URL"""
+    def attach_images(self, pending):
+        """
+        Паралельно завантажує зображення і прикріплює кожне до товарів,
+        щойно воно готове (вміст не накопичується для всього каталогу)
+        """
+        # URL -> [(товар, позиція зображення)]
+        uses = defaultdict(list)
+        for product, image_urls in pending:
+            for img_index, img_url in enumerate(image_urls):
+                if img_url and img_url.strip():
+                    uses[img_url.strip()].append((product, img_index))
+        if not uses:
+            return
+        
+        self.stdout.write(f"\n🖼️ Завантаження {len(uses)} зображень ({self.download_workers} потоків)...")
+        downloader = ImageDownloader(
+            workers=self.download_workers,
+            cache_dir=os.path.join(settings.IMPORT_CACHE_DIR, 'images'),
+        )
+        # Обробники сигналів на кожне зображення вимкнені (кеш, індекси
+        # пошуку, варіанти зображень): прикріплення не гальмує завантаження,
+        # варіанти генерує generate_image_derivatives після імпорту
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url.strip(), headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Генеруємо унікальне ім'я файлу
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-            safe_name = re.sub(r'[^\w\-_.]', '_', product_name)[:30]
-            
-            # Визначаємо розширення
-            parsed_url = urlparse(url)
-            path = parsed_url.path.lower()
-            if path.endswith('.jpg') or path.endswith('.jpeg'):
-                ext = '.jpg'
-            elif path.endswith('.png'):
-                ext = '.png'
-            else:
-                ext = '.jpg'  # За замовчуванням
-            
-            filename = f"{safe_name}_{url_hash}{ext}"
-            
-            self.stats['images_downloaded'] += 1
-            return ContentFile(response.content, name=filename)
-            
-        except Exception as e:
-            self.stdout.write(f"⚠️ Помилка завантаження {url}: {str(e)}")
-            return None
+            with muted_catalog_signals():
+                for result in downloader.iter_downloads(uses):
+                    for product, img_index in uses[result.url]:
+                        final_name = product.name
+                        image_file = self.image_file(result, final_name)
+                        if not image_file:
+                            continue
+                        if img_index == 0:
+                            # Перше зображення як головне (об'єкт з пакетного запису —
+                            # зберігаємо лише поле зображення і час оновлення)
+                            product.image = image_file
+                            product.save(update_fields=['image', 'updated_at'])
+                        else:
+                            # Додаткові зображення в галерею
+                            ProductImage.objects.create(
+                                product=product,
+                                image=image_file,
+                                alt_text=f"{final_name} - зображення {img_index + 1}",
+                                order=img_index
+                            )
+        finally:
+            catalog_changed()
+        self.stdout.write(
+            f"   Завантажено: {downloader.stats['downloaded']}, з кешу: {downloader.stats['cached']}, "
+            f"помилок: {downloader.stats['failed']}"
+        )
 
     def get_characteristics(self, row):
         """Витягує характеристики товару"""
         characteristics = {}
         
-        for i in range(15):  # 0-14 характеристики
-            name_col = f'Назва_Характеристики{"."+str(i) if i > 0 else ""}'
-            value_col = f'Значення_Характеристики{"."+str(i) if i > 0 else ""}'
-            unit_col = f'Одиниця_виміру_Характеристики{"."+str(i) if i > 0 else ""}'
-            
-            if name_col in row.index and value_col in row.index:
-                char_name = row[name_col]
-                char_value = row[value_col]
-                char_unit = row.get(unit_col, '')
+        for char_name, char_unit, char_value in row.characteristics[:15]:  # 0-14 характеристики
+            if char_name and char_value:
+                # Перекладаємо назву характеристики
+                char_name = self.translate_russian_to_ukrainian(char_name)
+                
+                value_str = char_value
+                if char_unit:
+                    char_unit = self.translate_russian_to_ukrainian(char_unit)
+                    if char_unit and not self.contains_russian(char_unit):
+                        value_str += f" {char_unit}"
                 
-                if pd.notna(char_name) and pd.notna(char_value):
-                    # Перекладаємо назву характеристики
-                    char_name = self.translate_russian_to_ukrainian(char_name)
-                    
-                    value_str = str(char_value)
-                    if pd.notna(char_unit):
-                        char_unit = self.translate_russian_to_ukrainian(char_unit)
-                        if char_unit and not self.contains_russian(char_unit):
-                            value_str += f" {char_unit}"
-                    
-                    if char_name and not self.contains_russian(char_name):
-                        characteristics[char_name] = value_str
+                if char_name and not self.contains_russian(char_name):
+                    characteristics[char_name] = value_str
         
         return characteristics
 
-    def import_products(self):
-        """Імпортує всі товари з Excel файлу"""
-        self.stdout.write("\n📦 Читання товарів з Excel...")
-        
-        df = pd.read_excel('export-products-10-07-25_11-38-56.xlsx')
+    def iter_product_rows(self, row_images):
+        """
+        Рядки товарів для пакетного запису. Файл читається потоково, по одному
+        рядку; посилання на зображення збираються в row_images.
+        """
         category_mapping = self.get_category_mapping()
         
-        self.stdout.write(f"📋 Знайдено {len(df)} товарів у файлі")
-        
-        for index, row in df.iterrows():
+        for row in read_products(self.products_file):
+            self.stats['rows_read'] += 1
             try:
-                # Отримуємо назви (українську або російську для перекладу)
-                ukrainian_name = row.get('Назва_позиції_укр')
-                russian_name = row.get('Назва_позиції')
-                
-                # Визначаємо фінальну назву
-                if pd.notna(ukrainian_name) and ukrainian_name.strip():
-                    final_name = self.clean_html_description(ukrainian_name)
-                elif pd.notna(russian_name) and russian_name.strip():
+                # Визначаємо фінальну назву (українську або переклад російської)
+                if row.name_uk:
+                    final_name = self.clean_html_description(row.name_uk)
+                elif row.name_ru:
                     # Перекладаємо з російської
-                    translated_name = self.translate_russian_to_ukrainian(russian_name)
+                    translated_name = self.translate_russian_to_ukrainian(row.name_ru)
                     final_name = self.clean_html_description(translated_name)
                     self.stats['products_translated'] += 1
-                    self.stdout.write(f"🔄 Переклад товару {index+1}: {russian_name[:50]}...")
+                    self.stdout.write(f"🔄 Переклад товару {row.line}: {row.name_ru[:50]}...")
                 else:
-                    self.stdout.write(f"⏭️ Пропускаємо товар {index+1}: немає назви")
+                    self.stdout.write(f"⏭️ Пропускаємо товар {row.line}: немає назви")
                     self.stats['products_skipped'] += 1
                     continue
                 
                 # Перевіряємо групу товару
-                product_group = row.get('Назва_групи')
-                if pd.isna(product_group) or product_group not in category_mapping:
-                    self.stdout.write(f"⏭️ Пропускаємо товар {index+1}: невідома група '{product_group}'")
+                if row.group not in category_mapping:
+                    self.stdout.write(f"⏭️ Пропускаємо товар {row.line}: невідома група '{row.group}'")
                     self.stats['products_skipped'] += 1
                     continue
                 
                 # Отримуємо дані товару
-                category_name = category_mapping[product_group]
+                category_name = category_mapping[row.group]
                 
                 # Обробляємо опис
-                ukrainian_description = row.get('Опис_укр')
-                russian_description = row.get('Опис')
-                
-                if pd.notna(ukrainian_description) and ukrainian_description.strip():
-                    final_description = self.clean_html_description(ukrainian_description)
-                elif pd.notna(russian_description) and russian_description.strip():
-                    translated_desc = self.translate_russian_to_ukrainian(russian_description)
+                if row.description_uk:
+                    final_description = self.clean_html_description(row.description_uk)
+                elif row.description_ru:
+                    translated_desc = self.translate_russian_to_ukrainian(row.description_ru)
                     final_description = self.clean_html_description(translated_desc)
                 else:
                     final_description = ""
                 
-                price = row.get('Ціна', 0)
-                brand_name = row.get('Виробник')
-                
                 if self.dry_run:
                     self.stdout.write(f"   [DRY RUN] Створив би товар: {final_name}")
                     continue
                 
-                # Отримуємо категорію та бренд
-                category = Category.objects.get(name=category_name)
-                brand = self.create_or_get_brand(brand_name)
+                brand_name = row.brand or "Невідомий"
                 
                 # Отримуємо характеристики
                 characteristics = self.get_characteristics(row)
@@ -411,55 +329,79 @@ class Command(BaseCommand):
                     for char_name, char_value in characteristics.items():
                         full_description += f"• {char_name}: {char_value}\n"
                 
-                # Створюємо товар
-                product = Product.objects.create(
-                    name=final_name,
-                    description=full_description,
-                    price=float(price) if pd.notna(price) else 0,
-                    category=category,
-                    brand=brand,
-                    model=f"{brand_name} Model" if brand_name else "Standard",
-                    in_stock=True,
-                    featured=False
-                )
-                
-                # Завантажуємо зображення
-                images_urls = row.get('Посилання_зображення')
-                if pd.notna(images_urls):
-                    image_urls = [url.strip() for url in str(images_urls).split(',')]
-                    
-                    for img_index, img_url in enumerate(image_urls):
-                        if img_url:
-                            image_file = self.download_image(img_url, final_name)
-                            if image_file:
-                                if img_index == 0:
-                                    # Перше зображення як головне
-                                    product.image = image_file
-                                    product.save()
-                                else:
-                                    # Додаткові зображення в галерею
-                                    ProductImage.objects.create(
-                                        product=product,
-                                        image=image_file,
-                                        alt_text=f"{final_name} - зображення {img_index + 1}",
-                                        order=img_index
-                                    )
-                
-                self.stats['products_created'] += 1
-                self.stdout.write(f"✅ Створено товар: {final_name}")
+                import_key = make_import_key(source_id=row.source_id, brand=brand_name, name=final_name)
+                product_row = {
+                    'import_key': import_key,
+                    'name': final_name,
+                    'description': full_description,
+                    'price': float(row.price) if row.price is not None else 0,
+                    'category': category_name,
+                    'brand': brand_name,
+                    'model': f"{brand_name} Model",
+                    'in_stock': True,
+                    'featured': False,
+                }
                 
-                # Невелика затримка між запитами
-                time.sleep(0.5)
+                # Зображення завантажуються пізніше, паралельно для всіх товарів
+                if row.image_links:
+                    image_urls = [url.strip() for url in row.image_links.split(',') if url.strip()]
+                    row_images[import_key] = image_urls
                 
             except Exception as e:
                 self.stats['errors'] += 1
-                self.stdout.write(f"❌ Помилка при створенні товару {index+1}: {str(e)}")
+                self.stdout.write(f"❌ Помилка при обробці товару {row.line}: {str(e)}")
+                continue
+            
+            yield product_row
+
+    def import_products(self):
+        """Імпортує всі товари з файлу (читання та запис частинами)"""
+        self.stdout.write(f"\n📦 Читання товарів з {self.products_file}...")
+        
+        row_images = {}
+        rows = self.iter_product_rows(row_images)
+        
+        if self.dry_run:
+            for _ in rows:
+                pass
+            self.stdout.write(f"📋 Прочитано {self.stats['rows_read']} рядків")
+            return
+        
+        if self.sync:
+            # Порівнюємо відбитки рядків з БД і записуємо лише різницю
+            self.stdout.write(f"🔁 Синхронізація з базою частинами по {self.writer.chunk_size}...")
+            needing_images = self.writer.sync(rows, row_images).needing_images
+        else:
+            # Пакетний запис (категорії та бренди — кількома запитами на частину)
+            self.stdout.write(f"💾 Запис товарів частинами по {self.writer.chunk_size}...")
+            needing_images = []
+            for chunk in batched(rows, self.writer.chunk_size):
+                needing_images += self.writer.needing_images(self.writer.write(chunk, row_images))
+        self.stats.update(self.writer.stats)
+        self.stdout.write(f"📋 Прочитано {self.stats['rows_read']} рядків")
+        self.stdout.write(
+            f"✅ Створено товарів: {self.stats['products_created']}, "
+            f"оновлено: {self.stats['products_updated']}, "
+            f"без змін: {self.stats['products_unchanged']}, "
+            f"видалено: {self.stats['products_deleted']}"
+        )
+        
+        pending_images = [
+            (product, row_images[product.import_key])
+            for product in needing_images
+            if product.import_key in row_images
+        ]
+        self.attach_images(pending_images)
 
     def show_final_stats(self):
         """Показує фінальну статистику"""
         self.stdout.write('\n' + '='*60)
         self.stdout.write('🎉 ІМПОРТ ЗАВЕРШЕНО')
         self.stdout.write(f"✅ Створено товарів: {self.stats['products_created']}")
+        self.stdout.write(f"♻️ Оновлено товарів: {self.stats['products_updated']}")
+        if self.sync:
+            self.stdout.write(f"⏸️ Без змін: {self.stats['products_unchanged']}")
+            self.stdout.write(f"🗑️ Видалено відсутніх у файлі: {self.stats['products_deleted']}")
         self.stdout.write(f"🔄 Перекладено з російської: {self.stats['products_translated']}")
         self.stdout.write(f"📂 Створено категорій: {self.stats['categories_created']}")
         self.stdout.write(f"🏷️ Створено брендів: {self.stats['brands_created']}")
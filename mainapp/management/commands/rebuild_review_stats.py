@@ -0,0 +1,23 @@
+"""
+Команда для повного перерахунку підсумку відгуків (ReviewStats).
+Потрібна лише після масових змін через QuerySet.update(), які не
+викликають сигналів; звичайні save()/delete() оновлюють підсумок самі.
+"""
+from django.core.management.base import BaseCommand
+
+from mainapp.cache import bump_version, REVIEWS
+from mainapp.reviews import recalculate_review_stats
+
+
+class Command(BaseCommand):
+    help = 'Перерахунок статистики опублікованих відгуків'
+
+    def handle(self, *args, **options):
+        self.stdout.write('⭐ Перерахунок статистики відгуків...')
+        stats = recalculate_review_stats()
+        bump_version(REVIEWS)
+
+        histogram = ', '.join(f'{rating}★: {count}' for rating, count in stats.histogram)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Відгуків: {stats.count}, середня оцінка: {stats.average:.2f} ({histogram})'
+        ))
@@ -0,0 +1,34 @@
+"""
+Команда для повного перерахунку схожих товарів (SimilarProduct).
+Після цього списки підтримуються інкрементально сигналами та імпортом.
+"""
+from django.core.management.base import BaseCommand
+
+from mainapp.cache import bump_version, CATALOG
+from mainapp.models import Product
+from mainapp.recommendations import rebuild_similar, SIMILAR_LIMIT
+
+
+class Command(BaseCommand):
+    help = 'Перерахунок схожих товарів для сторінок товарів'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product',
+            type=int,
+            action='append',
+            help='Перерахувати лише вказані товари (можна повторювати)'
+        )
+
+    def handle(self, *args, **options):
+        product_ids = options['product']
+        self.stdout.write('🔗 Перерахунок схожих товарів...')
+
+        links = rebuild_similar(product_ids)
+        products = len(product_ids) if product_ids else Product.objects.filter(in_stock=True).count()
+        # Сторінки товарів кешуються разом зі списком схожих
+        bump_version(CATALOG)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Товарів: {products}, збережено зв\'язків: {links} (до {SIMILAR_LIMIT} на товар)'
+        ))
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from mainapp.models import Category, Product
 
 class Command(BaseCommand):
@@ -48,7 +49,8 @@ class Command(BaseCommand):
                     
                     if not dry_run:
                         with transaction.atomic():
-                            products_to_move.update(category=ukrainian_category)
+                            # update() не викликає save(): updated_at ставимо явно (ETag живих фідів)
+                            products_to_move.update(category=ukrainian_category, updated_at=timezone.now())
                             moved_products += product_count
                             self.stdout.write(f"   ✅ Перенесено {product_count} товарів")
                     else:
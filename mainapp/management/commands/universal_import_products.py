@@ -1,14 +1,19 @@
-import pandas as pd
-import requests
 import re
 import os
-import time
-from urllib.parse import urlparse, urljoin
+from collections import defaultdict
+from decimal import Decimal
+from urllib.parse import urlparse
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.core.files.base import ContentFile
 from django.db import transaction, models
 from django.utils.text import slugify
 from mainapp.models import Product, Category, Brand, ProductImage
+from mainapp.importers.bulk import BulkProductWriter, make_import_key, batched
+from mainapp.importers.downloader import ImageDownloader
+from mainapp.importers.reader import read_products, read_groups
+from mainapp.normalization import translate, has_russian_letters
+from mainapp.signals import catalog_changed, muted_catalog_signals
 from bs4 import BeautifulSoup
 from django.db import models
 
@@ -21,13 +26,13 @@ class Command(BaseCommand):
             '--products-file',
             type=str,
             default='export-products-10-07-25_11-38-56.xlsx',
-            help='Файл з товарами'
+            help='Файл з товарами (XLSX або CSV)'
         )
         parser.add_argument(
             '--categories-file', 
             type=str,
             default='second.xlsx',
-            help='Файл з категоріями'
+            help='Файл з категоріями (XLSX або CSV)'
         )
         parser.add_argument(
             '--clear-existing',
@@ -44,6 +49,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Детальний вивід'
         )
+        parser.add_argument(
+            '--download-workers',
+            type=int,
+            default=8,
+            help='Кількість паралельних завантажень зображень'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Кількість товарів в одній транзакції запису'
+        )
 
     def handle(self, *args, **options):
         self.products_file = options['products_file']
@@ -51,6 +68,19 @@ class Command(BaseCommand):
         self.clear_existing = options['clear_existing']
         self.dry_run = options['dry_run']
         self.verbose = options['verbose']
+        self.download_workers = options['download_workers']
+        # (товар, [URL]) — зображення завантажуються окремим етапом після запису товарів
+        self.pending_images = []
+        # Рядки товарів для пакетного запису та посилання на їх зображення
+        self.product_rows = []
+        self.row_images = {}
+        self.brand_countries = {}
+        self.writer = BulkProductWriter(
+            chunk_size=options['chunk_size'],
+            brand_defaults=lambda name: {
+                'description': f'Бренд {name}' + (f' з {self.brand_countries[name]}' if self.brand_countries.get(name) else '')
+            },
+        )
 
         # Перевіряємо файли
         for file_path in [self.products_file, self.categories_file]:
@@ -65,6 +95,7 @@ class Command(BaseCommand):
         # Ініціалізуємо статистику
         self.stats = {
             'products_created': 0,
+            'products_updated': 0,
             'categories_created': 0,
             'brands_created': 0,
             'images_downloaded': 0,
@@ -83,6 +114,9 @@ class Command(BaseCommand):
             # Крок 3: Імпортуємо товари
             self.import_products(category_mapping)
 
+            # Крок 3.1: Паралельно завантажуємо зображення
+            self.attach_pending_images()
+
             # Крок 4: Показуємо результати
             self.show_final_stats()
 
@@ -109,7 +143,6 @@ class Command(BaseCommand):
         self.stdout.write("📂 Обробка категорій...")
         
         try:
-            df = pd.read_excel(self.categories_file)
             category_mapping = {}
             
             # Базові категорії для правильного мапування на сайт
@@ -121,12 +154,12 @@ class Command(BaseCommand):
                 'Додаткові послуги': ['монтаж', 'послуг', 'сервіс']
             }
             
-            for index, row in df.iterrows():
-                ukr_name = str(row.get('Назва_групи_укр', '')).strip()
-                rus_name = str(row.get('Назва_групи', '')).strip()
+            for row in read_groups(self.categories_file):
+                ukr_name = row.name_uk
+                rus_name = row.name_ru
                 
                 # Тільки якщо є українська назва
-                if ukr_name and pd.notna(row.get('Назва_групи_укр')) and ukr_name != 'nan':
+                if ukr_name:
                     # Очищаємо українську назву (БЕЗ перекладу)
                     clean_ukr_name = self.clean_ukrainian_text_only(ukr_name)
                     
@@ -136,7 +169,7 @@ class Command(BaseCommand):
                         mapped_category = self.map_to_base_category(clean_ukr_name, base_categories)
                         
                         # Зберігаємо мапінг від російської до української
-                        if rus_name and pd.notna(row.get('Назва_групи')):
+                        if rus_name:
                             category_mapping[rus_name] = mapped_category
                         
                         if self.verbose:
@@ -199,28 +232,24 @@ class Command(BaseCommand):
         self.stdout.write("📦 Імпорт товарів...")
         
         try:
-            # Читаємо файл товарів
-            try:
-                df = pd.read_excel(self.products_file, sheet_name='Export Products Sheet')
-            except:
-                try:
-                    df = pd.read_excel(self.products_file, sheet_name=0)
-                except:
-                    df = pd.read_excel(self.products_file)
+            # Файл читається потоково, товари записуються частинами по chunk_size
+            rows_read = 0
+            batch_size = 50
+            for batch in batched(read_products(self.products_file), batch_size):
+                self.process_product_batch(batch, category_mapping)
+                rows_read += len(batch)
+                
+                if rows_read % 100 == 0:
+                    self.stdout.write(f"⏳ Оброблено {rows_read} товарів...")
+                if len(self.product_rows) >= self.writer.chunk_size:
+                    self.write_products()
 
-            self.stdout.write(f"📋 Знайдено {len(df)} товарів у файлі")
+            self.stdout.write(f"📋 Прочитано {rows_read} товарів з файлу")
             
-            if len(df) == 0:
+            if rows_read == 0:
                 raise CommandError('Файл з товарами порожній')
 
-            # Обробляємо товари пакетами для продуктивності
-            batch_size = 50
-            for i in range(0, len(df), batch_size):
-                batch = df.iloc[i:i+batch_size]
-                self.process_product_batch(batch, category_mapping)
-                
-                if (i + batch_size) % 100 == 0:
-                    self.stdout.write(f"⏳ Оброблено {min(i + batch_size, len(df))}/{len(df)} товарів...")
+            self.write_products()
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"❌ Помилка імпорту товарів: {str(e)}"))
@@ -228,25 +257,25 @@ class Command(BaseCommand):
 
     def process_product_batch(self, batch, category_mapping):
         """Обробляє пакет товарів"""
-        for index, row in batch.iterrows():
+        for row in batch:
             try:
                 self.process_single_product(row, category_mapping)
             except Exception as e:
                 self.stats['errors'] += 1
                 if self.verbose:
-                    self.stdout.write(f"❌ Помилка товару {index}: {str(e)}")
+                    self.stdout.write(f"❌ Помилка товару {row.line}: {str(e)}")
 
     def process_single_product(self, row, category_mapping):
         """Обробляє один товар з логічним перекладом російських назв"""
         # Отримуємо українську та російську назви
-        name_ukr = str(row.get('Назва_позиції_укр', '')).strip() if pd.notna(row.get('Назва_позиції_укр')) else ''
-        name_rus = str(row.get('Назва_позиції', '')).strip() if pd.notna(row.get('Назва_позиції')) else ''
+        name_ukr = row.name_uk or ''
+        name_rus = row.name_ru or ''
         
         # Визначаємо фінальну назву
-        if name_ukr and name_ukr != 'nan' and len(name_ukr) > 4:
+        if len(name_ukr) > 4:
             # Є українська назва - використовуємо її
             final_name = self.clean_and_translate_text(name_ukr)
-        elif name_rus and name_rus != 'nan' and len(name_rus) > 4:
+        elif len(name_rus) > 4:
             # Немає української - ЧІТКО перекладаємо російську
             final_name = self.clean_and_translate_text(name_rus)
         else:
@@ -264,14 +293,14 @@ class Command(BaseCommand):
             return
 
         # Отримуємо описи
-        description_ukr = str(row.get('Опис_укр', '')).strip() if pd.notna(row.get('Опис_укр')) else ''
-        description_rus = str(row.get('Опис', '')).strip() if pd.notna(row.get('Опис')) else ''
+        description_ukr = row.description_uk or ''
+        description_rus = row.description_ru or ''
         
         # Визначаємо фінальний опис
-        if description_ukr and description_ukr != 'nan' and len(description_ukr) > 10:
+        if len(description_ukr) > 10:
             # Є український опис
             clean_description = self.clean_description(description_ukr)
-        elif description_rus and description_rus != 'nan' and len(description_rus) > 10:
+        elif len(description_rus) > 10:
             # Немає українського - перекладаємо російський
             clean_description = self.clean_description(description_rus)
         else:
@@ -279,10 +308,10 @@ class Command(BaseCommand):
             clean_description = f"Професійний {final_name} від надійного виробника. Висока якість та гарантія."
 
         # Отримуємо інші дані
-        price = self.parse_price(row.get('Ціна', 0))
+        price = self.parse_price(row.price)
         
         # Для категорії використовуємо мапінг + логіку за назвою товару
-        category_name_rus = str(row.get('Назва_групи', '')).strip() if pd.notna(row.get('Назва_групи')) else ''
+        category_name_rus = row.group or ''
         category_name = category_mapping.get(category_name_rus, '')
         
         # ЗАВЖДИ перевіряємо категорію за назвою товару (пріоритет над мапінгом!)
@@ -305,10 +334,10 @@ class Command(BaseCommand):
             self.stats['products_skipped'] += 1
             return
         
-        brand_name = str(row.get('Виробник', '')).strip() if pd.notna(row.get('Виробник')) else ''
-        country = str(row.get('Країна_виробник', '')).strip() if pd.notna(row.get('Країна_виробник')) else ''
-        model = str(row.get('Код_товару', '')).strip() if pd.notna(row.get('Код_товару')) else ''
-        image_links = str(row.get('Посилання_зображення', '')).strip() if pd.notna(row.get('Посилання_зображення')) else ''
+        brand_name = row.brand or ''
+        country = row.country or ''
+        model = row.code or ''
+        image_links = row.image_links or ''
 
         if self.verbose:
             self.stdout.write(f"  ✅ Обробка: {final_name[:50]}...")
@@ -318,57 +347,54 @@ class Command(BaseCommand):
             self.stats['products_created'] += 1
             return
 
-        # Створюємо товар
-        product = self.create_product_with_relations(
-            final_name, clean_description, price, category_name, 
-            brand_name, model, country, image_links, category_mapping
+        # Товар записується пакетно після обробки всього файлу
+        brand = self.resolve_brand_name(brand_name)
+        if country:
+            self.brand_countries.setdefault(brand, country)
+        import_key = make_import_key(
+            source_id=row.source_id,
+            brand=brand,
+            model=model,
+            name=final_name,
         )
-        
-        if product:
-            self.stats['products_created'] += 1
-        else:
-            self.stats['products_skipped'] += 1
+        self.product_rows.append({
+            'import_key': import_key,
+            'name': final_name,
+            'description': clean_description,
+            'price': price,
+            'category': self.resolve_category_name(category_name, category_mapping),
+            'brand': brand,
+            'model': model,
+            'country': country,
+            'in_stock': True,
+            'featured': False,  # Можна додати логіку для визначення рекомендованих
+        })
+        if image_links:
+            self.row_images[import_key] = image_links
+
+    def write_products(self):
+        """Пакетно записує всі оброблені товари та ставить зображення в чергу"""
+        if self.dry_run or not self.product_rows:
+            return
 
-    def create_product_with_relations(self, name, description, price, category_name, 
-                                    brand_name, model, country, image_links, category_mapping):
-        """Створює товар з усіма зв'язками"""
-        try:
-            # Створюємо/отримуємо категорію
-            category = self.get_or_create_category(category_name, category_mapping)
-            
-            # Створюємо/отримуємо бренд
-            brand = self.get_or_create_brand(brand_name, country)
-            
-            # Створюємо товар
-            product = Product.objects.create(
-                name=name,
-                description=description,
-                price=price,
-                category=category,
-                brand=brand,
-                model=model,
-                country=country,
-                in_stock=True,
-                featured=False  # Можна додати логіку для визначення рекомендованих
-            )
-            
-            # Додаємо зображення
+        self.stdout.write(f"💾 Запис {len(self.product_rows)} товарів пакетами по {self.writer.chunk_size}...")
+        images = {key: re.split(r'[,;\n]+', links) for key, links in self.row_images.items()}
+        results = self.writer.write(self.product_rows, images)
+        self.stats.update(self.writer.stats)
+
+        for product in self.writer.needing_images(results):
+            image_links = self.row_images.get(product.import_key)
             if image_links:
                 try:
                     self.add_product_images(product, image_links)
                 except Exception as e:
                     if self.verbose:
-                        self.stdout.write(f"  ⚠️ Помилка зображень для {name}: {str(e)}")
-            
-            return product
-            
-        except Exception as e:
-            if self.verbose:
-                self.stdout.write(f"  ❌ Помилка створення {name}: {str(e)}")
-            return None
+                        self.stdout.write(f"  ⚠️ Помилка зображень для {product.name}: {str(e)}")
+        self.product_rows = []
+        self.row_images = {}
 
-    def get_or_create_category(self, category_name, category_mapping):
-        """Створює або отримує категорію з мапінгом"""
+    def resolve_category_name(self, category_name, category_mapping):
+        """Фінальна назва категорії з мапінгом (сама категорія створюється пакетно)"""
         if not category_name:
             category_name = "Інше обладнання"
         
@@ -376,115 +402,101 @@ class Command(BaseCommand):
         mapped_name = category_mapping.get(category_name, category_name)
         clean_name = self.clean_and_translate_text(mapped_name)
         
-        if not clean_name:
-            clean_name = "Інше обладнання"
-        
-        category, created = Category.objects.get_or_create(
-            name=clean_name,
-            defaults={
-                'description': f'Категорія {clean_name}',
-                'is_active': True
-            }
-        )
-        
-        if created:
-            self.stats['categories_created'] += 1
-            if self.verbose:
-                self.stdout.write(f"  📂 Створено категорію: {clean_name}")
-        
-        return category
+        return clean_name or "Інше обладнання"
 
-    def get_or_create_brand(self, brand_name, country=""):
-        """Створює або отримує бренд"""
+    def resolve_brand_name(self, brand_name):
+        """Фінальна назва бренду (сам бренд створюється пакетно)"""
         if not brand_name:
             brand_name = "Загальний"
         
         clean_name = self.clean_and_translate_text(brand_name)
-        if not clean_name:
-            clean_name = "Загальний"
-        
-        brand, created = Brand.objects.get_or_create(
-            name=clean_name,
-            defaults={
-                'description': f'Бренд {clean_name}' + (f' з {country}' if country else ''),
-                'is_active': True
-            }
-        )
-        
-        if created:
-            self.stats['brands_created'] += 1
-            if self.verbose:
-                self.stdout.write(f"  🏷️ Створено бренд: {clean_name}")
-        
-        return brand
+        return clean_name or "Загальний"
 
     def add_product_images(self, product, image_links):
-        """Додає зображення до товару"""
+        """Ставить зображення товару в чергу на паралельне завантаження"""
         if not image_links:
             return
         
         # Розділяємо посилання
         links = re.split(r'[,;\n]+', image_links)
+        links = [link.strip() for link in links[:5]]  # Максимум 5 зображень
+        self.pending_images.append((product, links))
+
+    def attach_pending_images(self):
+        """
+        Завантажує всі зображення з черги пулом потоків і зберігає кожне,
+        щойно воно готове (вміст не накопичується для всього каталогу)
+        """
+        # URL -> [(товар, позиція зображення)]
+        uses = defaultdict(list)
+        for product, links in self.pending_images:
+            for i, link in enumerate(links):
+                if link and link.startswith('http'):
+                    uses[link].append((product, i))
+        if not uses or self.dry_run:
+            return
         
-        for i, link in enumerate(links[:5]):  # Максимум 5 зображень
-            link = link.strip()
-            if not link or not link.startswith('http'):
-                continue
-                
-            try:
-                if self.download_and_save_image(product, link, i):
-                    self.stats['images_downloaded'] += 1
-                    if i == 0:  # Затримка лише після першого зображення
-                        time.sleep(0.5)
-                    
-            except Exception as e:
-                if self.verbose:
-                    self.stdout.write(f"    ⚠️ Помилка зображення {link}: {str(e)}")
-
-    def download_and_save_image(self, product, image_url, index):
-        """Завантажує та зберігає зображення"""
+        self.stdout.write(f"🖼️ Завантаження {len(uses)} зображень ({self.download_workers} потоків)...")
+        downloader = ImageDownloader(
+            workers=self.download_workers,
+            timeout=15,
+            cache_dir=os.path.join(settings.IMPORT_CACHE_DIR, 'images'),
+        )
+        # Обробники сигналів на кожне зображення вимкнені (кеш, індекси
+        # пошуку, варіанти зображень): прикріплення не гальмує завантаження,
+        # варіанти генерує generate_image_derivatives після імпорту
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(image_url, timeout=15, headers=headers)
-            response.raise_for_status()
-            
-            # Отримуємо назву файлу
-            parsed_url = urlparse(image_url)
-            original_filename = os.path.basename(parsed_url.path)
-            
-            if original_filename and '.' in original_filename:
-                name_part, ext_part = original_filename.rsplit('.', 1)
-                filename = f"product_{product.id}_{index}_{name_part[:20]}.{ext_part}"
-            else:
-                filename = f"product_{product.id}_{index}.jpg"
-            
-            content = ContentFile(response.content, name=filename)
-            
-            if index == 0:
-                # Головне зображення
-                product.image.save(filename, content, save=True)
-                if self.verbose:
-                    self.stdout.write(f"    🖼️ Головне зображення: {filename}")
-            else:
-                # Додаткові зображення
-                ProductImage.objects.create(
-                    product=product,
-                    image=content,
-                    alt_text=f"{product.name} - зображення {index+1}",
-                    order=index
-                )
-                if self.verbose:
-                    self.stdout.write(f"    🖼️ Додаткове зображення: {filename}")
-            
-            return True
-            
-        except Exception as e:
-            if self.verbose:
-                self.stdout.write(f"    ❌ Помилка завантаження {image_url}: {str(e)}")
+            with muted_catalog_signals():
+                for result in downloader.iter_downloads(uses):
+                    for product, i in uses[result.url]:
+                        try:
+                            if self.save_downloaded_image(product, result, i):
+                                self.stats['images_downloaded'] += 1
+                        except Exception as e:
+                            if self.verbose:
+                                self.stdout.write(f"    ⚠️ Помилка зображення {result.url}: {str(e)}")
+        finally:
+            catalog_changed()
+        self.pending_images = []
+
+    def save_downloaded_image(self, product, result, index):
+        """Зберігає завантажене зображення як головне або в галерею"""
+        if result is None or result.error:
+            if self.verbose and result is not None:
+                self.stdout.write(f"    ❌ Помилка завантаження {result.url}: {result.error}")
             return False
+        
+        # Отримуємо назву файлу
+        parsed_url = urlparse(result.url)
+        original_filename = os.path.basename(parsed_url.path)
+        
+        if original_filename and '.' in original_filename:
+            name_part, ext_part = original_filename.rsplit('.', 1)
+            filename = f"product_{product.id}_{index}_{name_part[:20]}.{ext_part}"
+        else:
+            filename = f"product_{product.id}_{index}{result.extension}"
+        
+        content = ContentFile(result.content, name=filename)
+        
+        if index == 0:
+            # Головне зображення (об'єкт з пакетного запису — зберігаємо лише
+            # зображення і час оновлення)
+            product.image.save(filename, content, save=False)
+            product.save(update_fields=['image', 'updated_at'])
+            if self.verbose:
+                self.stdout.write(f"    🖼️ Головне зображення: {filename}")
+        else:
+            # Додаткові зображення
+            ProductImage.objects.create(
+                product=product,
+                image=content,
+                alt_text=f"{product.name} - зображення {index+1}",
+                order=index
+            )
+            if self.verbose:
+                self.stdout.write(f"    🖼️ Додаткове зображення: {filename}")
+        
+        return True
 
     # === ФУНКЦІЇ ОЧИСТКИ ТА ПЕРЕКЛАДУ ===
 
@@ -532,83 +544,8 @@ class Command(BaseCommand):
         return result
 
     def translate_to_ukrainian(self, text):
-        """Розширений перекладач російсько-українських термінів"""
-        if not text:
-            return ""
-        
-        # Логічний словник перекладів - російська ↔ українська
-        translations = {
-            # Основні терміни
-            'Гибридный': 'Гібридний', 'гибридный': 'гібридний',
-            'инвертор': 'інвертор', 'Инвертор': 'Інвертор',
-            'Солнечная': 'Сонячна', 'солнечная': 'сонячна', 'Солнечные': 'Сонячні', 'солнечные': 'сонячні',
-            'панель': 'панель', 'Панель': 'Панель', 'панели': 'панелі', 'Панели': 'Панелі',
-            'Аккумуляторная': 'Акумуляторна', 'аккумуляторная': 'акумуляторна',
-            'батарея': 'батарея', 'Батарея': 'Батарея',
-            'аккумулятор': 'акумулятор', 'Аккумулятор': 'Акумулятор',
-            'система': 'система', 'Система': 'Система',
-            'комплект': 'комплект', 'Комплект': 'Комплект',
-            'мощность': 'потужність', 'Мощность': 'Потужність',
-            'эффективность': 'ефективність', 'Эффективность': 'Ефективність',
-            'напряжение': 'напруга', 'Напряжение': 'Напруга',
-            'емкость': 'ємність', 'Емкость': 'Ємність',
-            'энергии': 'енергії', 'Энергии': 'Енергії', 'энергия': 'енергія', 'Энергия': 'Енергія',
-            'резервного': 'резервного', 'Резервного': 'Резервного',
-            'питания': 'живлення', 'Питания': 'Живлення', 'питание': 'живлення', 'Питание': 'Живлення',
-            'производитель': 'виробник', 'Производитель': 'Виробник',
-            'качество': 'якість', 'Качество': 'Якість',
-            'надежность': 'надійність', 'Надежность': 'Надійність',
-            'гарантия': 'гарантія', 'Гарантия': 'Гарантія',
-            'установка': 'установка', 'Установка': 'Установка',
-            'монтаж': 'монтаж', 'Монтаж': 'Монтаж',
-            'хранения': 'зберігання', 'Хранения': 'Зберігання', 'хранение': 'зберігання', 'Хранение': 'Зберігання',
-            'высоковольтная': 'високовольтна', 'Высоковольтная': 'Високовольтна',
-            'модулей': 'модулів', 'Модулей': 'Модулів', 'модули': 'модулі', 'Модули': 'Модулі',
-            
-            # Технічні терміни
-            'фазный': 'фазний', 'Фазный': 'Фазний',
-            'контроллер': 'контролер', 'Контроллер': 'Контролер',
-            'зарядное': 'зарядний', 'Зарядное': 'Зарядний',
-            'устройство': 'пристрій', 'Устройство': 'Пристрій',
-            'подключение': 'підключення', 'Подключение': 'Підключення',
-            'максимальный': 'максимальний', 'максимальная': 'максимальна', 'Максимальный': 'Максимальний',
-            'минимальный': 'мінімальний', 'минимальная': 'мінімальна', 'Минимальный': 'Мінімальний',
-            'номинальный': 'номінальний', 'номинальная': 'номінальна', 'Номинальный': 'Номінальний',
-            'рабочий': 'робочий', 'рабочая': 'робоча', 'Рабочий': 'Робочий',
-            'температура': 'температура', 'Температура': 'Температура',
-            'защита': 'захист', 'Защита': 'Захист',
-            'размер': 'розмір', 'Размер': 'Розмір',
-            'вес': 'вага', 'Вес': 'Вага',
-            
-            # Матеріали та типи
-            'литиевый': 'літієвий', 'литиевая': 'літієва', 'Литиевый': 'Літієвий',
-            'монокристалический': 'монокристалічний', 'Монокристалический': 'Монокристалічний',
-            'поликристалический': 'полікристалічний', 'Поликристалический': 'Полікристалічний',
-            
-            # Збереження відповідних одиниць
-            'кВт': 'кВт', 'квт': 'кВт', 'КВТ': 'кВт',
-            'кВтч': 'кВт·год', 'квтч': 'кВт·год', 'КВТЧ': 'кВт·год',
-            'Ватт': 'Вт', 'ватт': 'Вт', 'ВАТТ': 'Вт',
-            'Вольт': 'В', 'вольт': 'В', 'ВОЛЬТ': 'В',
-            'Ампер': 'А', 'ампер': 'А', 'АМПЕР': 'А'
-        }
-        
-        result = str(text)
-        
-        # Застосовуємо переклади
-        for rus, ukr in translations.items():
-            result = result.replace(rus, ukr)
-        
-        # Заміняємо російські літери
-        russian_letters = {
-            'ы': 'и', 'Ы': 'И', 'э': 'е', 'Э': 'Е',
-            'ё': 'е', 'Ё': 'Е', 'ъ': '', 'Ъ': ''
-        }
-        
-        for rus, ukr in russian_letters.items():
-            result = result.replace(rus, ukr)
-        
-        return result
+        """Переклад російських термінів та літер (спільний словник, один прохід)"""
+        return translate(str(text)) if text else ""
 
     def clean_text_content(self, text):
         """Очищає текст від небажаних символів та форматує"""
@@ -632,9 +569,8 @@ class Command(BaseCommand):
             return False
         
         ukrainian_chars = len(re.findall(r'[абвгґдежзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ]', text))
-        russian_chars = len(re.findall(r'[ыъэёЫЪЭЁ]', text))
         
-        return ukrainian_chars >= 3 and russian_chars == 0
+        return ukrainian_chars >= 3 and not has_russian_letters(text)
 
     def is_pure_ukrainian_text(self, text):
         """Перевірка на українську мову після перекладу"""
@@ -642,8 +578,7 @@ class Command(BaseCommand):
             return False
         
         # Перевіряємо наявність ЯВНИХ російських символів
-        russian_chars = re.findall(r'[ыъэёЫЪЭЁ]', text)
-        if russian_chars:
+        if has_russian_letters(text):
             return False
             
         # Перевіряємо наявність українських літер
@@ -702,10 +637,10 @@ class Command(BaseCommand):
 
     def parse_price(self, price_value):
         """Парсить ціну з різних форматів"""
-        if pd.isna(price_value):
+        if price_value is None:
             return 0.0
         
-        if isinstance(price_value, (int, float)):
+        if isinstance(price_value, (int, float, Decimal)):
             return float(price_value)
         
         price_str = re.sub(r'[^\d.,]', '', str(price_value))
@@ -736,6 +671,7 @@ class Command(BaseCommand):
                 self.style.SUCCESS(
                     f"\n🎉 УНІВЕРСАЛЬНИЙ ІМПОРТ ЗАВЕРШЕНО\n"
                     f"✅ Створено товарів: {self.stats['products_created']}\n"
+                    f"♻️ Оновлено товарів: {self.stats['products_updated']}\n"
                     f"📂 Створено категорій: {self.stats['categories_created']}\n"
                     f"🏷️ Створено брендів: {self.stats['brands_created']}\n"
                     f"🖼️ Завантажено зображень: {self.stats['images_downloaded']}\n"
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0007_finalize_category_brand_migration'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['in_stock', 'featured', 'name'], name='product_stock_featured_name'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'in_stock'], name='product_category_stock'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['brand', 'in_stock'], name='product_brand_stock'),
+        ),
+    ]
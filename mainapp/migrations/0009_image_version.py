@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0008_product_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_version',
+            field=models.CharField(blank=True, editable=False, max_length=8, verbose_name='Версія зображення'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_version',
+            field=models.CharField(blank=True, editable=False, max_length=8, verbose_name='Версія зображення'),
+        ),
+    ]
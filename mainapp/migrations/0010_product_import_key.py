@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0009_image_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, help_text='Стабільний ключ товару у джерелі імпорту (для оновлення замість дублювання)', max_length=64, null=True, unique=True, verbose_name='Ключ імпорту'),
+        ),
+    ]
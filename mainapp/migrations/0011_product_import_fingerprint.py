@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0010_product_import_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='import_fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='Хеш полів рядка джерела та посилань на зображення (для інкрементальної синхронізації)', max_length=32, verbose_name='Відбиток імпорту'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0011_product_import_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50, verbose_name='Модель')),
+                ('checks', models.CharField(max_length=200, verbose_name='Перевірки та їх версії')),
+                ('audited_at', models.DateTimeField(verbose_name='Початок останнього аудиту')),
+                ('row_hashes', models.JSONField(blank=True, default=dict, verbose_name='Хеші записів')),
+            ],
+            options={
+                'verbose_name': 'Контрольна точка аудиту',
+                'verbose_name_plural': 'Контрольні точки аудиту',
+                'unique_together': {('model', 'checks')},
+            },
+        ),
+    ]
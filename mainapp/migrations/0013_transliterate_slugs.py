@@ -0,0 +1,69 @@
+import re
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+# Копія mainapp.slugs на момент міграції: міграція не повинна залежати від
+# живого коду, який може змінитись або зникнути
+TRANSLITERATION = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ie', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia',
+    "'": '', 'ʼ': '', '’': '',
+    'ё': 'e', 'ы': 'y', 'э': 'e', 'ъ': '',
+    'зг': 'zgh',
+}
+
+WORD_START = {'є': 'ye', 'ї': 'yi', 'й': 'y', 'ю': 'yu', 'я': 'ya'}
+
+_word_start = re.compile(r"(?<![^\W\d_])[єїйюя]")
+_letters = re.compile('зг|[' + ''.join(key for key in TRANSLITERATION if len(key) == 1) + ']')
+
+
+def transliterate(text):
+    text = _word_start.sub(lambda match: WORD_START[match.group(0)], str(text).lower())
+    return _letters.sub(lambda match: TRANSLITERATION[match.group(0)], text)
+
+
+def make_slug(text, max_length=100):
+    return slugify(transliterate(text))[:max_length].strip('-')
+
+
+def next_free_slug(base, taken):
+    slug = base
+    counter = 1
+    while slug in taken:
+        slug = f"{base}-{counter}"
+        counter += 1
+    return slug
+
+
+def transliterate_slugs(apps, schema_editor):
+    """
+    Категорії та бренди з кириличними назвами отримали від slugify() порожні
+    slug або "-1", "-2"... Перегенеровуємо їх з транслітерацією; коректні
+    латинські slug не змінюються.
+    """
+    for model_name in ('Category', 'Brand'):
+        model = apps.get_model('mainapp', model_name)
+        objects = list(model.objects.order_by('pk'))
+        broken = [obj for obj in objects if not any(char.isalpha() for char in obj.slug)]
+        taken = {obj.slug for obj in objects if obj not in broken}
+        for obj in broken:
+            obj.slug = next_free_slug(make_slug(obj.name, 94) or model_name.lower(), taken)
+            taken.add(obj.slug)
+        model.objects.bulk_update(broken, ['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0012_audit_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(transliterate_slugs, migrations.RunPython.noop),
+    ]
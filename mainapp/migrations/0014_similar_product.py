@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0013_transliterate_slugs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Позиція')),
+                ('score', models.FloatField(verbose_name='Оцінка схожості')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_links', to='mainapp.product', verbose_name='Товар')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='mainapp.product', verbose_name='Схожий товар')),
+            ],
+            options={
+                'verbose_name': 'Схожий товар',
+                'verbose_name_plural': 'Схожі товари',
+                'ordering': ['product', 'rank'],
+                'unique_together': {('product', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 02:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_review_stats(apps, schema_editor):
+    """Початковий підсумок з уже опублікованих відгуків"""
+    Review = apps.get_model('mainapp', 'Review')
+    ReviewStats = apps.get_model('mainapp', 'ReviewStats')
+    histogram = dict(
+        Review.objects.filter(is_published=True).values_list('rating').annotate(Count('id')).order_by()
+    )
+    ReviewStats.objects.update_or_create(pk=1, defaults={
+        'count': sum(histogram.values()),
+        'rating_sum': sum(rating * count for rating, count in histogram.items()),
+        **{f'rating_{rating}': histogram.get(rating, 0) for rating in range(1, 6)},
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mainapp', '0014_similar_product'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Кількість')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сума оцінок')),
+                ('rating_1', models.PositiveIntegerField(default=0, verbose_name='Оцінок 1★')),
+                ('rating_2', models.PositiveIntegerField(default=0, verbose_name='Оцінок 2★')),
+                ('rating_3', models.PositiveIntegerField(default=0, verbose_name='Оцінок 3★')),
+                ('rating_4', models.PositiveIntegerField(default=0, verbose_name='Оцінок 4★')),
+                ('rating_5', models.PositiveIntegerField(default=0, verbose_name='Оцінок 5★')),
+            ],
+            options={
+                'verbose_name': 'Статистика відгуків',
+                'verbose_name_plural': 'Статистика відгуків',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='review_published_created'),
+        ),
+        migrations.RunPython(fill_review_stats, migrations.RunPython.noop),
+    ]
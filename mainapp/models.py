@@ -1,13 +1,41 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
-from django.utils.text import slugify
 from django.conf import settings
 import os
 import hashlib
 from django.core.files.storage import default_storage
+from .slugs import unique_slug
 
 # Create your models here.
 
+def make_image_version(name, stamp):
+    """Короткий хеш для кешбастингу URL зображення"""
+    return hashlib.md5(f"{name}{stamp}".encode()).hexdigest()[:8]
+
+
+def uses_static_media():
+    """Чи це продакшн (якщо DEBUG=False або MEDIA_URL=/static/media/)"""
+    return not settings.DEBUG or settings.MEDIA_URL == '/static/media/'
+
+
+def build_image_url(image, version):
+    """Формує URL зображення для поточного середовища з готовою версією"""
+    if not uses_static_media():
+        # ЛОКАЛЬНА РОЗРОБКА: стандартний Django URL
+        return image.url
+    
+    # ПРОДАКШН: файли обслуговуються через WhiteNoise з staticfiles/media/
+    image_path = str(image.name)
+    if image_path.startswith('products/'):
+        # URL вже правильний відносно MEDIA_URL
+        static_url = f"{settings.MEDIA_URL}{image_path}"
+    else:
+        static_url = f"{settings.MEDIA_URL}products/gallery/{image_path}"
+    
+    return f"{static_url}?v={version}" if version else static_url
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True, verbose_name="Назва категорії")
     slug = models.SlugField(max_length=100, unique=True, verbose_name="URL-фрагмент")
@@ -22,13 +50,8 @@ class Category(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Category.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            # Транслітерація + перевірка унікальності одним запитом
+            self.slug = unique_slug(Category, self.name, exclude_pk=self.pk)
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -51,13 +74,8 @@ class Brand(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Brand.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            # Транслітерація + перевірка унікальності одним запитом
+            self.slug = unique_slug(Brand, self.name, exclude_pk=self.pk)
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -80,43 +98,51 @@ class Product(models.Model):
     featured = models.BooleanField(default=False, verbose_name="Рекомендований")
     created_at = models.DateTimeField(default=timezone.now, verbose_name="Дата створення")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
+    image_version = models.CharField(max_length=8, blank=True, editable=False, verbose_name="Версія зображення")
+    import_key = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False,
+        verbose_name="Ключ імпорту",
+        help_text="Стабільний ключ товару у джерелі імпорту (для оновлення замість дублювання)",
+    )
+    import_fingerprint = models.CharField(
+        max_length=32, blank=True, editable=False,
+        verbose_name="Відбиток імпорту",
+        help_text="Хеш полів рядка джерела та посилань на зображення (для інкрементальної синхронізації)",
+    )
     
     class Meta:
         verbose_name = "Товар"
         verbose_name_plural = "Товари"
         ordering = ['-created_at']
+        indexes = [
+            # Списки каталогу: in_stock + сортування (-featured, name)
+            models.Index(fields=['in_stock', 'featured', 'name'], name='product_stock_featured_name'),
+            # Фільтрація за категорією / брендом серед товарів у наявності
+            models.Index(fields=['category', 'in_stock'], name='product_category_stock'),
+            models.Index(fields=['brand', 'in_stock'], name='product_brand_stock'),
+        ]
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        # Оновлюємо збережену версію URL зображення (кешбастинг) при кожному збереженні
+        self.image_version = make_image_version(self.image.name, timezone.now()) if self.image else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image_version' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['image_version']
+        self.__dict__.pop('_image_url', None)
+        super().save(*args, **kwargs)
+    
     def get_image_url(self):
         """Отримує правильний URL зображення для всіх середовищ"""
         if not self.image:
             return ''
         
         try:
-            # Перевіряємо чи це продакшн (якщо DEBUG=False або MEDIA_URL=/static/media/)
-            if not settings.DEBUG or settings.MEDIA_URL == '/static/media/':
-                # ПРОДАКШН: файли обслуговуються через WhiteNoise 
-                # Формуємо URL для staticfiles/media/ через MEDIA_URL
-                image_path = str(self.image.name)
-                if image_path.startswith('products/'):
-                    # URL вже правильний відносно MEDIA_URL
-                    static_url = f"{settings.MEDIA_URL}{image_path}"
-                else:
-                    static_url = f"{settings.MEDIA_URL}products/gallery/{image_path}"
-                
-                # Додаємо кешбастинг для продакшн
-                try:
-                    import hashlib
-                    file_hash = hashlib.md5(f"{self.image.name}{self.updated_at}".encode()).hexdigest()[:8]
-                    return f"{static_url}?v={file_hash}"
-                except:
-                    return static_url
-            else:
-                # ЛОКАЛЬНА РОЗРОБКА: стандартний Django URL
-                return self.image.url
-                
+            # Старі записи без збереженої версії: рахуємо як раніше
+            version = self.image_version or make_image_version(self.image.name, self.updated_at)
+            return build_image_url(self.image, version)
         except Exception as e:
             # Fallback: якщо щось не працює, повертаємо порожній рядок
             print(f"Error generating image URL for product {self.id}: {e}")
@@ -125,7 +151,30 @@ class Product(models.Model):
     @property
     def image_url(self):
         """Властивість для зручного доступу до URL зображення"""
-        return self.get_image_url()
+        if '_image_url' not in self.__dict__:
+            self._image_url = self.get_image_url()
+        return self._image_url
+
+
+class SimilarProduct(models.Model):
+    """
+    Заздалегідь порахований список схожих товарів (mainapp.recommendations).
+    Сторінка товару читає його одним запитом по індексу (product, rank);
+    список перераховується сигналами при зміні товарів.
+    """
+    product = models.ForeignKey(Product, related_name='similar_links', on_delete=models.CASCADE, verbose_name="Товар")
+    similar = models.ForeignKey(Product, related_name='similar_to', on_delete=models.CASCADE, verbose_name="Схожий товар")
+    rank = models.PositiveSmallIntegerField(verbose_name="Позиція")
+    score = models.FloatField(verbose_name="Оцінка схожості")
+
+    class Meta:
+        verbose_name = "Схожий товар"
+        verbose_name_plural = "Схожі товари"
+        ordering = ['product', 'rank']
+        unique_together = ['product', 'rank']
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.similar_id} (#{self.rank})"
 
 
 class ProductImage(models.Model):
@@ -134,6 +183,7 @@ class ProductImage(models.Model):
     alt_text = models.CharField(max_length=200, blank=True, verbose_name="Альтернативний текст")
     is_main = models.BooleanField(default=False, verbose_name="Головне зображення")
     order = models.PositiveIntegerField(default=0, verbose_name="Порядок відображення")
+    image_version = models.CharField(max_length=8, blank=True, editable=False, verbose_name="Версія зображення")
     
     class Meta:
         verbose_name = "Зображення товару"
@@ -143,34 +193,26 @@ class ProductImage(models.Model):
     def __str__(self):
         return f"{self.product.name} - Зображення {self.order}"
     
+    def save(self, *args, **kwargs):
+        # Імена файлів галереї унікальні, тому версія змінюється разом з файлом
+        self.image_version = make_image_version(self.image.name, timezone.now()) if self.image else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image_version' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['image_version']
+        self.__dict__.pop('_image_url', None)
+        super().save(*args, **kwargs)
+    
     def get_image_url(self):
         """Отримує правильний URL зображення для всіх середовищ"""
         if not self.image:
             return ''
         
         try:
-            # Перевіряємо чи це продакшн (якщо DEBUG=False або MEDIA_URL=/static/media/)
-            if not settings.DEBUG or settings.MEDIA_URL == '/static/media/':
-                # ПРОДАКШН: файли обслуговуються через WhiteNoise 
-                # Формуємо URL для staticfiles/media/ через MEDIA_URL
-                image_path = str(self.image.name)
-                if image_path.startswith('products/'):
-                    # URL вже правильний відносно MEDIA_URL
-                    static_url = f"{settings.MEDIA_URL}{image_path}"
-                else:
-                    static_url = f"{settings.MEDIA_URL}products/gallery/{image_path}"
-                
-                # Додаємо кешбастинг для продакшн
-                try:
-                    import hashlib
-                    file_hash = hashlib.md5(f"{self.image.name}{self.product.updated_at}".encode()).hexdigest()[:8]
-                    return f"{static_url}?v={file_hash}"
-                except:
-                    return static_url
-            else:
-                # ЛОКАЛЬНА РОЗРОБКА: стандартний Django URL
-                return self.image.url
-                
+            version = self.image_version
+            if not version and uses_static_media():
+                # Старі записи без збереженої версії (потребує завантаження товару)
+                version = make_image_version(self.image.name, self.product.updated_at)
+            return build_image_url(self.image, version)
         except Exception as e:
             # Fallback: якщо щось не працює, повертаємо порожній рядок
             print(f"Error generating image URL for product image {self.id}: {e}")
@@ -179,7 +221,9 @@ class ProductImage(models.Model):
     @property
     def image_url(self):
         """Властивість для зручного доступу до URL зображення"""
-        return self.get_image_url()
+        if '_image_url' not in self.__dict__:
+            self._image_url = self.get_image_url()
+        return self._image_url
 
 
 class Portfolio(models.Model):
@@ -287,6 +331,69 @@ class Review(models.Model):
         verbose_name = "Відгук"
         verbose_name_plural = "Відгуки"
         ordering = ['-created_at']
+        indexes = [
+            # Сторінка відгуків: keyset пагінація опублікованих по (-created_at, -id).
+            # Частковий індекс: умову "WHERE is_published" SQLite не зіставляє
+            # зі складеним індексом, а з умовою часткового — зіставляє
+            models.Index(
+                fields=['-created_at', '-id'], condition=Q(is_published=True), name='review_published_created',
+            ),
+        ]
     
     def __str__(self):
         return f"Відгук від {self.client_name} - {self.rating}★"
+
+
+class ReviewStats(models.Model):
+    """
+    Підсумок опублікованих відгуків одним рядком (pk=1): кількість, сума
+    оцінок і гістограма. Оновлюється сигналами Review (mainapp.reviews),
+    тож сторінці відгуків не потрібні COUNT та AVG по всій таблиці.
+    """
+    count = models.PositiveIntegerField(default=0, verbose_name="Кількість")
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name="Сума оцінок")
+    rating_1 = models.PositiveIntegerField(default=0, verbose_name="Оцінок 1★")
+    rating_2 = models.PositiveIntegerField(default=0, verbose_name="Оцінок 2★")
+    rating_3 = models.PositiveIntegerField(default=0, verbose_name="Оцінок 3★")
+    rating_4 = models.PositiveIntegerField(default=0, verbose_name="Оцінок 4★")
+    rating_5 = models.PositiveIntegerField(default=0, verbose_name="Оцінок 5★")
+
+    class Meta:
+        verbose_name = "Статистика відгуків"
+        verbose_name_plural = "Статистика відгуків"
+
+    def __str__(self):
+        return f"{self.count} відгуків, {self.average:.1f}★"
+
+    @property
+    def average(self):
+        return self.rating_sum / self.count if self.count else 0
+
+    @property
+    def histogram(self):
+        """[(оцінка, кількість)] від 5★ до 1★"""
+        return [(rating, getattr(self, f'rating_{rating}')) for rating in range(5, 0, -1)]
+
+
+class AuditCheckpoint(models.Model):
+    """
+    Стан останнього аудиту контенту (mainapp.audit) для моделі та набору
+    перевірок. Наступний аудит з тим самим набором перевірок обробляє лише
+    записи, змінені після audited_at (моделі з updated_at) або з іншим
+    хешем вмісту (решта моделей). Для моделей з updated_at row_hashes
+    містить час, який аудит поставив виправленим записам: такі записи не
+    перевіряються повторно, доки їх не змінять. Зміна правил перевірки
+    змінює підпис checks, тож нова версія починає з повного проходу.
+    """
+    model = models.CharField(max_length=50, verbose_name="Модель")
+    checks = models.CharField(max_length=200, verbose_name="Перевірки та їх версії")
+    audited_at = models.DateTimeField(verbose_name="Початок останнього аудиту")
+    row_hashes = models.JSONField(default=dict, blank=True, verbose_name="Хеші записів")
+
+    class Meta:
+        verbose_name = "Контрольна точка аудиту"
+        verbose_name_plural = "Контрольні точки аудиту"
+        unique_together = ['model', 'checks']
+
+    def __str__(self):
+        return f"{self.model} [{self.checks}] - {self.audited_at:%Y-%m-%d %H:%M}"
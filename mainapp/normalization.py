@@ -0,0 +1,318 @@
+"""
+Нормалізація текстів каталогу: переклад російських термінів на українську
+та виявлення російського контенту.
+
+Словники компілюються один раз при імпорті модуля в регулярні вирази-trie
+(спільні префікси винесені, тож рушій не перебирає тисячі альтернатив у
+кожній позиції). Переклад і перевірка проходять текст один раз, незалежно
+від розміру словника. Використовується командами імпорту
+(universal_import_products, import_full_catalog) та очищення
+(clean_russian_content, prevent_russian_import, check_spelling_errors).
+"""
+import re
+
+
+# Межі слова для перекладу: поруч не літера (цифри — межа, тож "6квт" теж
+# перекладається, на відміну від \b)
+_WORD_START = r'(?<![^\W\d_])'
+_WORD_END = r'(?![^\W\d_])'
+
+
+def trie_pattern(words):
+    """Регулярний вираз-trie для набору рядків (найдовший збіг має пріоритет)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        optional = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+    return build(trie)
+
+
+def match_case(source, target):
+    """Переносить регістр збігу (ВЕСЬ / Перша / малі) на переклад"""
+    if len(source) > 1 and source.isupper():
+        return target.upper()
+    if source[:1].isupper():
+        return target[:1].upper() + target[1:]
+    return target
+
+
+class Replacer:
+    """
+    Заміна за словником за один прохід.
+
+    ignore_case — ключі шукаються без урахування регістру, регістр збігу
+    переноситься на значення (крім значень з великими літерами на кшталт
+    'кВт', які вставляються як є); whole_words — лише цілі слова.
+    """
+
+    def __init__(self, mapping, ignore_case=False, whole_words=False, letters=None):
+        self.ignore_case = ignore_case
+        self.mapping = {key.lower(): value for key, value in mapping.items()} if ignore_case else dict(mapping)
+        self.letters = letters or {}
+        pattern = trie_pattern(self.mapping) if self.mapping else ''
+        if pattern and whole_words:
+            pattern = f'{_WORD_START}{pattern}{_WORD_END}'
+        if self.letters:
+            letter_class = '[' + ''.join(re.escape(char) for char in self.letters) + ']'
+            pattern = f'(?:{pattern})|{letter_class}' if pattern else letter_class
+        self.regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0) if pattern else None
+
+    def _replace(self, match):
+        found = match.group(0)
+        if found in self.letters:
+            return self.letters[found]
+        if not self.ignore_case:
+            return self.mapping[found]
+        value = self.mapping[found.lower()]
+        return value if any(char.isupper() for char in value) else match_case(found, value)
+
+    def __call__(self, text):
+        if not text or self.regex is None:
+            return text
+        return self.regex.sub(self._replace, text)
+
+
+class Detector:
+    """
+    Пошук за кількома словниками одним скомпільованим виразом:
+    літери, цілі слова (\\b), підрядки та довільні regex-конструкції.
+    """
+
+    def __init__(self, letters='', words=(), substrings=(), patterns=()):
+        parts = []
+        if letters:
+            parts.append('[' + re.escape(letters) + ']')
+        if words:
+            parts.append(r'\b' + trie_pattern(words) + r'\b')
+        if substrings:
+            parts.append(trie_pattern(substrings))
+        parts.extend(patterns)
+        self.regex = re.compile('|'.join(parts), re.IGNORECASE)
+
+    def search(self, text):
+        return bool(text) and self.regex.search(text) is not None
+
+    def distinct_matches(self, text):
+        """Множина різних знайдених слів (у нижньому регістрі)"""
+        if not text:
+            return set()
+        return {match.group(0).lower() for match in self.regex.finditer(text)}
+
+
+# ---------------------------------------------------------------------------
+# Словники
+# ---------------------------------------------------------------------------
+
+RUSSIAN_LETTERS = 'ёъыэ'
+
+# Російські літери -> українські
+LETTER_REPLACEMENTS = {
+    'ы': 'и', 'Ы': 'И', 'э': 'е', 'Э': 'Е',
+    'ё': 'е', 'Ё': 'Е', 'ъ': '', 'Ъ': '',
+}
+
+# Російські терміни каталогу -> українські (регістр переноситься автоматично)
+TRANSLATIONS = {
+    # Основні терміни (слова шукаються цілком, тому поширені відмінки окремо)
+    'гибридный': 'гібридний', 'гибридные': 'гібридні', 'гибридного': 'гібридного',
+    'инвертор': 'інвертор', 'инвертора': 'інвертора', 'инвертору': 'інвертору',
+    'инвертором': 'інвертором', 'инверторы': 'інвертори', 'инверторов': 'інверторів',
+    'солнечная': 'сонячна', 'солнечные': 'сонячні', 'солнечный': 'сонячний',
+    'солнечной': 'сонячної', 'солнечных': 'сонячних',
+    'панели': 'панелі',
+    'батареи': 'батареї',
+    'аккумуляторная': 'акумуляторна', 'аккумулятор': 'акумулятор', 'аккумулятора': 'акумулятора',
+    'аккумуляторы': 'акумулятори', 'аккумуляторов': 'акумуляторів',
+    'мощность': 'потужність', 'мощности': 'потужності', 'мощностью': 'потужністю',
+    'эффективность': 'ефективність', 'эффективности': 'ефективності',
+    'производительность': 'продуктивність', 'производительности': 'продуктивності',
+    'напряжение': 'напруга', 'напряжения': 'напруги',
+    'емкость': 'ємність',
+    'энергии': 'енергії', 'энергия': 'енергія', 'энергией': 'енергією',
+    'электроэнергии': 'електроенергії', 'электроэнергия': 'електроенергія',
+    'питания': 'живлення', 'питание': 'живлення',
+    'жизни': 'життя',
+    'производитель': 'виробник',
+    'качество': 'якість',
+    'надежность': 'надійність',
+    'гарантия': 'гарантія',
+    'хранения': 'зберігання', 'хранение': 'зберігання',
+    'высоковольтная': 'високовольтна', 'низковольтная': 'низьковольтна',
+    'высокое': 'високе', 'низкое': 'низьке',
+    'модулей': 'модулів', 'модули': 'модулі',
+    'услуги': 'послуги',
+
+    # Технічні терміни
+    'фазный': 'фазний',
+    'автономный': 'автономний',
+    'контроллер': 'контролер',
+    'зарядное': 'зарядний',
+    'устройство': 'пристрій', 'устройства': 'пристрою',
+    'подключение': 'підключення',
+    'максимальный': 'максимальний', 'максимальная': 'максимальна',
+    'минимальный': 'мінімальний', 'минимальная': 'мінімальна',
+    'номинальный': 'номінальний', 'номинальная': 'номінальна',
+    'рабочий': 'робочий', 'рабочая': 'робоча',
+    'защита': 'захист', 'защиты': 'захисту',
+    'размер': 'розмір',
+    'вес': 'вага',
+
+    # Матеріали та типи
+    'литиевый': 'літієвий', 'литиевая': 'літієва',
+    'железофосфатная': 'залізно-фосфатна',
+    'монокристалический': 'монокристалічний',
+    'поликристалический': 'полікристалічний',
+
+    # Характеристики
+    'технические': 'технічні',
+    'параметры': 'параметри',
+    'описание': 'опис',
+    'применение': 'застосування',
+    'преимущества': 'переваги',
+    'особенности': 'особливості',
+
+    # Одиниці вимірювання (вставляються як є)
+    'квт': 'кВт',
+    'квтч': 'кВт·год',
+    'ватт': 'Вт',
+    'вольт': 'В',
+    'ампер': 'А',
+}
+
+# Російські службові слова та загальна лексика (clean_russian_content)
+RUSSIAN_COMMON_WORDS = [
+    'это', 'для', 'что', 'как', 'или', 'его', 'ее', 'их', 'от', 'до', 'при',
+    'без', 'под', 'над', 'про', 'через', 'после', 'перед', 'вместо', 'кроме',
+    'среди', 'между', 'внутри', 'снаружи', 'около', 'возле', 'вокруг', 'против',
+    'благодаря', 'согласно', 'вследствие', 'несмотря', 'является', 'имеет',
+    'может', 'должен', 'будет', 'была', 'были', 'есть', 'чтобы',
+    'потому', 'поэтому', 'если', 'когда', 'где', 'куда', 'откуда', 'зачем',
+    'почему', 'сколько', 'который', 'какой', 'чей', 'такой', 'этот', 'тот',
+    'мой', 'твой', 'наш', 'ваш', 'свой', 'весь', 'каждый', 'любой', 'другой',
+    'новый', 'старый', 'большой', 'маленький', 'хороший', 'плохой', 'лучший',
+    'худший', 'первый', 'последний', 'следующий', 'предыдущий', 'высокий',
+    'низкий', 'длинный', 'короткий', 'широкий', 'узкий', 'толстый', 'тонкий',
+    'обеспечивает', 'позволяет', 'используется', 'применяется', 'предназначен',
+    'разработан', 'создан', 'изготовлен', 'производится', 'выпускается',
+]
+
+# Російські технічні терміни (шукаються як підрядки)
+RUSSIAN_TECH_TERMS = [
+    'гибридный', 'инвертор', 'солнечная', 'панель', 'батарея', 'система',
+    'энергия', 'мощность', 'напряжение', 'ток', 'емкость', 'зарядка',
+    'разрядка', 'контроллер', 'преобразователь', 'устройство', 'оборудование',
+    'установка', 'монтаж', 'подключение', 'эффективность', 'производительность',
+    'надежность', 'качество', 'гарантия', 'сертификат', 'стандарт',
+]
+
+# Специфічно російські слова (не використовуються в українській)
+DEFINITELY_RUSSIAN_WORDS = [
+    'является', 'имеет', 'может', 'должен', 'будет', 'была', 'были', 'есть',
+    'чтобы', 'потому', 'поэтому', 'если', 'когда', 'где', 'куда', 'откуда',
+    'зачем', 'почему', 'сколько', 'который', 'какой', 'чей', 'такой',
+    'этот', 'тот', 'мой', 'твой', 'наш', 'ваш', 'свой', 'весь', 'каждый',
+    'любой', 'другой', 'новый', 'старый', 'большой', 'маленький', 'хороший',
+    'плохой', 'лучший', 'худший', 'первый', 'последний', 'следующий',
+    'предыдущий', 'высокий', 'низкий', 'длинный', 'короткий', 'широкий',
+    'узкий', 'толстый', 'тонкий', 'обеспечивает', 'позволяет', 'используется',
+    'применяется', 'предназначен', 'разработан', 'создан', 'изготовлен',
+    'производится', 'выпускается', 'гибридный', 'инвертор', 'солнечная',
+    'батарея', 'энергия', 'мощность', 'напряжение', 'емкость', 'зарядка',
+    'разрядка', 'контроллер', 'преобразователь', 'устройство', 'оборудование',
+    'установка', 'подключение', 'эффективность', 'производительность',
+    'надежность', 'качество', 'гарантия', 'сертификат', 'стандарт',
+]
+
+# Російські граматичні конструкції
+RUSSIAN_CONSTRUCTIONS = [
+    r'\bчто\s+является\b',
+    r'\bкоторый\s+имеет\b',
+    r'\bто\s+что\b',
+    r'\bдля\s+того\s+чтобы\b',
+    r'\bв\s+связи\s+с\b',
+    r'\bпо\s+сравнению\s+с\b',
+]
+
+# Підозрілі слова (можуть бути російськими або українськими)
+SUSPICIOUS_WORDS = [
+    'это', 'что', 'как', 'или', 'его', 'ее', 'их', 'от', 'до', 'при',
+    'без', 'под', 'над', 'про', 'через', 'после', 'перед', 'вместо',
+    'кроме', 'среди', 'между', 'внутри', 'снаружи', 'около', 'возле',
+    'вокруг', 'против', 'благодаря', 'согласно', 'вследствие', 'несмотря',
+]
+
+# Корені російських термінів (для звітів check_spelling_errors)
+RUSSIAN_STEMS = [
+    r'\bгибридн\w+', r'\bинвертор\w*', r'\bсолнечн\w+', r'\bаккумулятор\w+',
+    r'\bхранени\w+', r'\bэнерги\w+', r'\bмощност\w+', r'\bнапряжени\w+',
+]
+
+
+# ---------------------------------------------------------------------------
+# Скомпільовані нормалізатори
+# ---------------------------------------------------------------------------
+
+_translator = Replacer(TRANSLATIONS, ignore_case=True, whole_words=True, letters=LETTER_REPLACEMENTS)
+_term_translator = Replacer(TRANSLATIONS, ignore_case=True, whole_words=True)
+_letter_replacer = Replacer({}, letters=LETTER_REPLACEMENTS)
+
+_russian_letters = Detector(letters=RUSSIAN_LETTERS)
+_russian_text = Detector(letters=RUSSIAN_LETTERS, words=RUSSIAN_COMMON_WORDS, substrings=RUSSIAN_TECH_TERMS)
+_definitely_russian = Detector(letters=RUSSIAN_LETTERS, words=DEFINITELY_RUSSIAN_WORDS, patterns=RUSSIAN_CONSTRUCTIONS)
+_suspicious_words = Detector(words=SUSPICIOUS_WORDS)
+_russian_stems = Detector(patterns=RUSSIAN_STEMS)
+
+
+def translate(text):
+    """Переклад термінів та заміна російських літер за один прохід"""
+    return _translator(text) if text else ""
+
+
+def translate_terms(text):
+    """Переклад лише термінів (російські літери залишаються для перевірок)"""
+    return _term_translator(text) if text else ""
+
+
+def replace_russian_letters(text):
+    return _letter_replacer(text)
+
+
+def has_russian_letters(text):
+    """ё, ъ, ы, э — літери, яких немає в українській"""
+    return _russian_letters.search(text)
+
+
+def is_russian_text(text):
+    """Російські літери, службові слова або технічні терміни"""
+    return _russian_text.search(text)
+
+
+def is_definitely_russian(text):
+    """Строга перевірка — лише очевидно російський контент"""
+    return _definitely_russian.search(text)
+
+
+def is_possibly_russian(text, threshold=3):
+    """Очевидно російський текст або більше threshold різних підозрілих слів"""
+    if is_definitely_russian(text):
+        return True
+    return len(_suspicious_words.distinct_matches(text)) > threshold
+
+
+def find_russian_stems(text):
+    """Слова з російськими коренями (гибридн..., инвертор... тощо)"""
+    if not text:
+        return []
+    return [match.group(0) for match in _russian_stems.regex.finditer(text)]
@@ -0,0 +1,201 @@
+"""
+Keyset (seek) пагінація каталогу товарів і відгуків.
+
+Замість OFFSET/LIMIT сторінка відбирається умовою "після курсора" по
+впорядкуванню (товари: -featured, name, id; відгуки: -created_at, -id),
+тому вартість запиту не залежить від номера сторінки чи розміру списку.
+"""
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 96
+
+
+def encode_cursor(position):
+    """Кодує позицію (список значень ключа сортування) у безпечний для URL курсор"""
+    payload = json.dumps(list(position), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Декодує курсор у список значень або None, якщо курсор пошкоджений"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+    return position if isinstance(position, list) else None
+
+
+def clamp_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Обмежує розмір сторінки діапазоном 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """Сторінка результатів з курсорами на сусідні сторінки"""
+
+    def __init__(self, object_list, params, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        # Копія GET-параметрів (без прив'язки до request, щоб сторінку можна було кешувати)
+        self.params = params.copy()
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _url_with(self, param, cursor):
+        params = self.params.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[param] = cursor
+        return f'?{params.urlencode()}'
+
+    @property
+    def next_url(self):
+        return self._url_with('after', self.next_cursor) if self.has_next else ''
+
+    @property
+    def previous_url(self):
+        return self._url_with('before', self.previous_cursor) if self.has_previous else ''
+
+
+class KeysetPaginator:
+    """
+    Пагінатор по (-featured, name, id).
+
+    Курсори передаються в параметрах ?after=... / ?before=..., розмір сторінки
+    у ?per_page=... (з обмеженням MAX_PAGE_SIZE).
+    """
+
+    ordering = ('-featured', 'name', 'id')
+    reverse_ordering = ('featured', '-name', '-id')
+
+    def __init__(self, queryset, page_size=DEFAULT_PAGE_SIZE):
+        self.queryset = queryset
+        self.page_size = clamp_page_size(page_size)
+
+    @staticmethod
+    def position(obj):
+        """Значення ключа сортування для курсора"""
+        return [int(obj.featured), obj.name, obj.pk]
+
+    @staticmethod
+    def parse_position(values):
+        """Позиція з курсора або None, якщо значення некоректні"""
+        try:
+            featured, name, pk = values
+            return bool(featured), str(name), int(pk)
+        except (ValueError, TypeError):
+            return None
+
+    def _cursor(self, obj):
+        return encode_cursor(self.position(obj))
+
+    def _decode(self, cursor):
+        values = decode_cursor(cursor)
+        return self.parse_position(values) if values is not None else None
+
+    @staticmethod
+    def _after(position):
+        featured, name, pk = position
+        return (
+            Q(featured__lt=featured)
+            | Q(featured=featured, name__gt=name)
+            | Q(featured=featured, name=name, id__gt=pk)
+        )
+
+    @staticmethod
+    def _before(position):
+        featured, name, pk = position
+        return (
+            Q(featured__gt=featured)
+            | Q(featured=featured, name__lt=name)
+            | Q(featured=featured, name=name, id__lt=pk)
+        )
+
+    def get_page(self, request):
+        """Повертає KeysetPage для поточного запиту"""
+        after = self._decode(request.GET.get('after'))
+        before = self._decode(request.GET.get('before')) if after is None else None
+        size = self.page_size
+
+        if before is not None:
+            # Йдемо назад: беремо size+1 рядків у зворотному порядку
+            rows = list(self.queryset.filter(self._before(before)).order_by(*self.reverse_ordering)[:size + 1])
+            has_more = len(rows) > size
+            rows = rows[:size]
+            rows.reverse()
+            previous_cursor = self._cursor(rows[0]) if has_more and rows else None
+            next_cursor = self._cursor(rows[-1]) if rows else None
+            return KeysetPage(rows, request.GET, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+        queryset = self.queryset
+        if after is not None:
+            queryset = queryset.filter(self._after(after))
+        rows = list(queryset.order_by(*self.ordering)[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        next_cursor = self._cursor(rows[-1]) if has_more and rows else None
+        previous_cursor = self._cursor(rows[0]) if after is not None and rows else None
+        return KeysetPage(rows, request.GET, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+class ReviewPaginator(KeysetPaginator):
+    """Пагінатор відгуків по (-created_at, -id): спершу найновіші"""
+
+    ordering = ('-created_at', '-id')
+    reverse_ordering = ('created_at', 'id')
+
+    @staticmethod
+    def position(obj):
+        return [obj.created_at.isoformat(), obj.pk]
+
+    @staticmethod
+    def parse_position(values):
+        try:
+            created_at, pk = values
+            created_at = parse_datetime(created_at)
+            return (created_at, int(pk)) if created_at else None
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _after(position):
+        created_at, pk = position
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+
+    @staticmethod
+    def _before(position):
+        created_at, pk = position
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
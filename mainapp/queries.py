@@ -0,0 +1,56 @@
+"""
+Запити "перші N у кожній групі" для каруселей каталогу.
+
+Замість окремого запиту (і окремого prefetch зображень) на кожну категорію
+всі групи вибираються одним запитом з ROW_NUMBER() OVER (PARTITION BY ...),
+а зображення підвантажуються одним prefetch для всіх груп разом.
+"""
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.db.models import prefetch_related_objects
+
+
+# Порядок товарів у каруселі: рекомендовані першими, далі за назвою
+DEFAULT_ORDERING = (F('featured').desc(), F('name').asc(), F('id').asc())
+
+
+def top_n_per_group(queryset, group_field, group_values, n, ordering=DEFAULT_ORDERING, prefetch=('images',)):
+    """
+    Повертає dict {значення групи: [перші n об'єктів]} для group_values.
+
+    Якщо БД не підтримує віконні функції, групує у Python (один запит,
+    сортований по групі, з відсіканням зайвих рядків).
+    """
+    group_values = [value for value in group_values if value is not None]
+    groups = defaultdict(list)
+    if not group_values or n <= 0:
+        return groups
+
+    queryset = queryset.filter(**{f'{group_field}__in': group_values}).prefetch_related(None)
+
+    if connection.features.supports_over_clause:
+        rows = list(
+            queryset.annotate(
+                row_number=Window(
+                    expression=RowNumber(),
+                    partition_by=[F(group_field)],
+                    order_by=list(ordering),
+                )
+            ).filter(row_number__lte=n).order_by(group_field, *ordering)
+        )
+        for obj in rows:
+            groups[getattr(obj, group_field)].append(obj)
+    else:
+        rows = []
+        for obj in queryset.order_by(group_field, *ordering).iterator(chunk_size=500):
+            bucket = groups[getattr(obj, group_field)]
+            if len(bucket) < n:
+                bucket.append(obj)
+                rows.append(obj)
+
+    if prefetch:
+        prefetch_related_objects(rows, *prefetch)
+    return groups
@@ -0,0 +1,215 @@
+"""
+Схожі товари для сторінки товару.
+
+Для кожного товару в наявності заздалегідь рахується до SIMILAR_LIMIT
+схожих товарів і зберігається в SimilarProduct, тож сторінка товару робить
+один запит по індексу замість OR по двох зовнішніх ключах.
+
+Кандидати — товари в наявності з тієї ж категорії або того ж бренду.
+Оцінка: категорія + бренд + близькість ціни + близькість потужності
+(потужність розбирається з поля power або з назви: "6 кВт", "420Вт",
+"5 kWt"). Близькість рахується за логарифмом відношення, тож 5 і 6 кВт
+ближчі, ніж 5 і 50 кВт, незалежно від масштабу.
+
+Після зміни товарів update_similar() (signals.py, пакетний імпорт)
+перераховує повністю лише списки самих товарів і списки, у яких вони вже
+були (оцінка могла впасти, і місце має зайняти інший кандидат). Решта
+сусідів по категорії та бренду змінюється, лише якщо змінений товар тепер
+потрапляє в їхній топ: він порівнюється з уже збереженими рядками списку,
+без перебору всіх кандидатів. Для великих пакетів (імпорт) вигідніше
+перерахувати всіх зачеплених повністю.
+"""
+import math
+import re
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Product, SimilarProduct
+from .search.text import normalize
+
+
+SIMILAR_LIMIT = 6
+
+# Поля товару, від яких залежать списки схожих товарів
+SCORING_FIELDS = frozenset({'name', 'price', 'power', 'category', 'brand', 'in_stock', 'featured'})
+
+# Більші пакети змін перераховуються повністю (всі зачеплені списки)
+INCREMENTAL_LIMIT = 50
+
+CATEGORY_WEIGHT = 4.0
+BRAND_WEIGHT = 2.0
+PRICE_WEIGHT = 2.0
+POWER_WEIGHT = 2.0
+# Відношення, за якого близькість ціни/потужності стає нульовою
+MAX_RATIO = 4.0
+
+# Число з одиницею потужності (кВт*год батарей теж рахується як кВт)
+_power = re.compile(r'(\d+(?:[.,]\d+)?)\s*(квт|kwt|kw|вт|w)(?![a-zа-яіїєґ])')
+
+Candidate = namedtuple('Candidate', ['id', 'category_id', 'brand_id', 'price', 'power', 'featured'])
+
+
+def parse_power(*texts):
+    """Потужність у кВт з першого тексту, де вона вказана, або None"""
+    for text in texts:
+        match = _power.search(normalize(text or ''))
+        if match:
+            value = float(match.group(1).replace(',', '.'))
+            return value if match.group(2).startswith(('к', 'k')) else value / 1000
+    return None
+
+
+def closeness(a, b):
+    """1 для рівних значень, 0 для відношення MAX_RATIO і більше"""
+    if not a or not b or a <= 0 or b <= 0:
+        return 0.0
+    return max(0.0, 1 - abs(math.log(a / b)) / math.log(MAX_RATIO))
+
+
+def similarity(product, other):
+    score = CATEGORY_WEIGHT * (product.category_id == other.category_id)
+    score += BRAND_WEIGHT * (product.brand_id == other.brand_id)
+    score += PRICE_WEIGHT * closeness(product.price, other.price)
+    score += POWER_WEIGHT * closeness(product.power, other.power)
+    return score
+
+
+def rank_similar(product, candidates, limit=SIMILAR_LIMIT):
+    """[(оцінка, кандидат)] найсхожіших; рівні оцінки — спершу рекомендовані"""
+    scored = [(similarity(product, other), other) for other in candidates if other.id != product.id]
+    scored.sort(key=lambda item: (-item[0], not item[1].featured, item[1].id))
+    return scored[:limit]
+
+
+def _candidates(queryset):
+    rows = queryset.values_list('id', 'category_id', 'brand_id', 'price', 'power', 'name', 'featured')
+    return [
+        Candidate(product_id, category_id, brand_id, float(price or 0), parse_power(power, name), featured)
+        for product_id, category_id, brand_id, price, power, name, featured in rows.iterator()
+    ]
+
+
+def rebuild_similar(product_ids=None):
+    """
+    Перераховує списки для product_ids (None — для всіх товарів).
+    Кандидати всіх товарів завантажуються одним запитом. Повертає
+    кількість збережених рядків.
+    """
+    products = Product.objects.order_by()
+    if product_ids is not None:
+        products = products.filter(pk__in=list(product_ids))
+    targets = _candidates(products.filter(in_stock=True))
+
+    pool = Product.objects.filter(in_stock=True).order_by()
+    if product_ids is not None:
+        pool = pool.filter(
+            Q(category_id__in={target.category_id for target in targets})
+            | Q(brand_id__in={target.brand_id for target in targets})
+        )
+    by_category = defaultdict(list)
+    by_brand = defaultdict(list)
+    for candidate in _candidates(pool):
+        by_category[candidate.category_id].append(candidate)
+        by_brand[candidate.brand_id].append(candidate)
+
+    links = []
+    for target in targets:
+        candidates = {other.id: other for other in by_category[target.category_id] + by_brand[target.brand_id]}
+        for rank, (score, other) in enumerate(rank_similar(target, candidates.values())):
+            links.append(SimilarProduct(product_id=target.id, similar_id=other.id, rank=rank, score=round(score, 4)))
+
+    with transaction.atomic():
+        stale = SimilarProduct.objects.all()
+        if product_ids is not None:
+            stale = stale.filter(product_id__in=list(product_ids))
+        stale.delete()
+        SimilarProduct.objects.bulk_create(links, batch_size=500)
+    return len(links)
+
+
+def affected_products(product_ids):
+    """Товари, чиї списки можуть змінитись після зміни product_ids"""
+    product_ids = set(product_ids)
+    neighbours = Product.objects.filter(
+        Q(category__product__in=product_ids) | Q(brand__product__in=product_ids),
+        in_stock=True,
+    ).values_list('id', flat=True)
+    referencing = SimilarProduct.objects.filter(similar_id__in=product_ids).values_list('product_id', flat=True)
+    return product_ids | set(neighbours) | set(referencing)
+
+
+def insert_into_neighbours(changed, skip):
+    """
+    Додає товари changed (Candidate у наявності) у збережені списки сусідів
+    по категорії та бренду, якщо вони тепер входять у топ. Списки товарів
+    skip не чіпаються (їх перераховано повністю). Повертає кількість
+    змінених списків.
+    """
+    if not changed:
+        return 0
+    neighbours = _candidates(
+        Product.objects.filter(
+            Q(category_id__in={product.category_id for product in changed})
+            | Q(brand_id__in={product.brand_id for product in changed}),
+            in_stock=True,
+        ).exclude(pk__in=skip).order_by()
+    )
+    if not neighbours:
+        return 0
+
+    stored = defaultdict(list)
+    rows = SimilarProduct.objects.filter(product_id__in=[neighbour.id for neighbour in neighbours])
+    for product_id, similar_id, score in rows.values_list('product_id', 'similar_id', 'score'):
+        stored[product_id].append((score, similar_id))
+    featured = dict(
+        Product.objects.filter(pk__in={similar_id for links in stored.values() for _, similar_id in links})
+        .values_list('id', 'featured')
+    )
+    featured.update((product.id, product.featured) for product in changed)
+
+    def order(link):
+        score, similar_id = link
+        return (-score, not featured[similar_id], similar_id)
+
+    updated = {}
+    for neighbour in neighbours:
+        links = stored[neighbour.id]
+        entering = [
+            (round(similarity(neighbour, product), 4), product.id) for product in changed
+            if product.id != neighbour.id
+            and (product.category_id == neighbour.category_id or product.brand_id == neighbour.brand_id)
+        ]
+        if not entering:
+            continue
+        ranked = sorted(links + entering, key=order)[:SIMILAR_LIMIT]
+        if ranked != sorted(links, key=order):
+            updated[neighbour.id] = ranked
+
+    if updated:
+        with transaction.atomic():
+            SimilarProduct.objects.filter(product_id__in=list(updated)).delete()
+            SimilarProduct.objects.bulk_create([
+                SimilarProduct(product_id=product_id, similar_id=similar_id, rank=rank, score=score)
+                for product_id, ranked in updated.items()
+                for rank, (score, similar_id) in enumerate(ranked)
+            ], batch_size=500)
+    return len(updated)
+
+
+def update_similar(product_ids):
+    """Інкрементальне оновлення після зміни (або видалення) товарів product_ids"""
+    product_ids = set(product_ids)
+    if not product_ids:
+        return 0
+    if len(product_ids) > INCREMENTAL_LIMIT:
+        return rebuild_similar(affected_products(product_ids))
+
+    referencing = set(
+        SimilarProduct.objects.filter(similar_id__in=product_ids).values_list('product_id', flat=True)
+    )
+    rebuilt = product_ids | referencing
+    links = rebuild_similar(rebuilt)
+    insert_into_neighbours(_candidates(Product.objects.filter(pk__in=product_ids, in_stock=True)), rebuilt)
+    return links
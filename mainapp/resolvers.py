@@ -0,0 +1,99 @@
+"""
+Перетворення ключів URL та GET-параметрів на первинні ключі Category/Brand.
+
+Таблиці категорій і брендів маленькі, тому їх назви та slug читаються
+двома запитами і кешуються в області каталогу (скидаються сигналами при
+зміні категорій/брендів). Фільтрація товарів після цього йде по індексованих
+FK (category_id / brand_id) замість icontains по назвах.
+"""
+from .cache import get_or_build
+from .models import Category, Brand
+
+
+# Ключі URL категорій -> ключові слова назв (українські та старі російські назви)
+CATEGORY_URL_KEYWORDS = {
+    'inverters': ['Інвертор', 'Инвертор'],
+    'solar-panels': ['панел'],
+    'batteries': ['Акумулятор', 'Аккумулятор'],
+    'backup-power': ['Комплекти резервного живлення', 'комплект', 'комплек'],
+}
+
+# Назви категорій для відображення
+CATEGORY_URL_NAMES = {
+    'inverters': 'Інвертори',
+    'solar-panels': 'Сонячні панелі',
+    'batteries': 'Акумуляторні батареї',
+    'backup-power': 'Комплекти резервного живлення',
+}
+
+
+class CatalogLookup:
+    """Словники name/slug/id -> pk для категорій і брендів"""
+
+    def __init__(self, categories, brands):
+        # categories / brands: списки кортежів (id, name, slug)
+        self.categories = categories
+        self.brands = brands
+        self.category_index = self._index(categories)
+        self.brand_index = self._index(brands)
+        self.category_keys = {
+            key: self._match(categories, keywords)
+            for key, keywords in CATEGORY_URL_KEYWORDS.items()
+        }
+
+    @staticmethod
+    def _index(rows):
+        index = {}
+        for pk, name, slug in rows:
+            index[str(pk)] = pk
+            index[name.lower()] = pk
+            if slug:
+                index[slug.lower()] = pk
+        return index
+
+    @staticmethod
+    def _match(rows, keywords):
+        keywords = [keyword.lower() for keyword in keywords]
+        return [pk for pk, name, _ in rows if any(keyword in name.lower() for keyword in keywords)]
+
+    def _resolve(self, rows, index, value):
+        if not value:
+            return []
+        value = value.strip().lower()
+        if value in index:
+            return [index[value]]
+        # Сумісність зі старими посиланнями: часткове співпадіння назви
+        return self._match(rows, [value])
+
+    def category_ids(self, value):
+        """PK категорій для параметра ?category= (id, slug, назва або її частина)"""
+        return self._resolve(self.categories, self.category_index, value)
+
+    def brand_ids(self, value):
+        """PK брендів для параметра ?brand= (id, slug, назва або її частина)"""
+        return self._resolve(self.brands, self.brand_index, value)
+
+    def category_url_key(self, category_id, slug=''):
+        """Ключ URL /catalog/<key>/ категорії: ключ меню або slug"""
+        for key, category_ids in self.category_keys.items():
+            if category_id in category_ids:
+                return key
+        return slug or str(category_id)
+
+    def category_ids_for_key(self, category_key):
+        """PK категорій для ключа URL /catalog/<category>/"""
+        if category_key in self.category_keys:
+            return self.category_keys[category_key]
+        return self.category_ids(category_key)
+
+
+def build_catalog_lookup():
+    return CatalogLookup(
+        list(Category.objects.values_list('id', 'name', 'slug')),
+        list(Brand.objects.values_list('id', 'name', 'slug')),
+    )
+
+
+def get_catalog_lookup():
+    """Кешований резолвер (перебудовується після змін каталогу)"""
+    return get_or_build('lookup', build_catalog_lookup)
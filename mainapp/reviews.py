@@ -0,0 +1,89 @@
+"""
+Статистика та сторінки відгуків.
+
+Підсумок опублікованих відгуків (ReviewStats, один рядок) оновлюється
+сигналами Review на різницю "до/після": save() відгуку знає попередній
+стан (pre_save), тож зміна оцінки чи публікація в адмінці коригує
+лічильники через F() без перерахунку всієї таблиці. recalculate_review_stats()
+відновлює підсумок після масових змін через QuerySet.update().
+
+Список відгуків іде keyset пагінацією по індексу (is_published,
+-created_at, -id); перша сторінка і статистика кешуються в області
+REVIEWS до наступної зміни відгуків.
+"""
+from django.db.models import Count, F
+
+from .cache import REVIEWS, get_or_build, request_key_parts
+from .models import Review, ReviewStats
+from .pagination import ReviewPaginator
+
+
+REVIEWS_PAGE_SIZE = 12
+
+STATS_PK = 1
+
+
+def contribution(is_published, rating):
+    """Внесок відгуку в підсумок: (кількість, сума, {поле гістограми: 1})"""
+    if not is_published or rating not in range(1, 6):
+        return 0, 0, {}
+    return 1, rating, {f'rating_{rating}': 1}
+
+
+def apply_review_change(old, new):
+    """
+    Коригує підсумок на різницю внесків old -> new, де кожен з них —
+    (is_published, rating) або None (відгук створено / видалено).
+    """
+    old_count, old_sum, old_histogram = contribution(*old) if old else (0, 0, {})
+    new_count, new_sum, new_histogram = contribution(*new) if new else (0, 0, {})
+    if (old_count, old_sum, old_histogram) == (new_count, new_sum, new_histogram):
+        return
+    changes = {}
+    for field in set(old_histogram) | set(new_histogram):
+        changes[field] = F(field) + new_histogram.get(field, 0) - old_histogram.get(field, 0)
+    updated = ReviewStats.objects.filter(pk=STATS_PK).update(
+        count=F('count') + new_count - old_count,
+        rating_sum=F('rating_sum') + new_sum - old_sum,
+        **changes,
+    )
+    if not updated:
+        # Рядка ще немає (нова БД) — рахуємо з нуля, він уже враховує зміну
+        recalculate_review_stats()
+
+
+def recalculate_review_stats():
+    """Повний перерахунок підсумку одним агрегуючим запитом"""
+    histogram = dict(
+        Review.objects.filter(is_published=True).values_list('rating').annotate(Count('id')).order_by()
+    )
+    stats, _ = ReviewStats.objects.update_or_create(pk=STATS_PK, defaults={
+        'count': sum(histogram.values()),
+        'rating_sum': sum(rating * count for rating, count in histogram.items()),
+        **{f'rating_{rating}': histogram.get(rating, 0) for rating in range(1, 6)},
+    })
+    return stats
+
+
+def get_review_stats():
+    """Підсумок відгуків (кешується до наступної зміни відгуків)"""
+    def build():
+        return ReviewStats.objects.filter(pk=STATS_PK).first() or recalculate_review_stats()
+    return get_or_build('review_stats', build, scope=REVIEWS)
+
+
+def published_reviews():
+    return Review.objects.filter(is_published=True)
+
+
+def get_reviews_page(request):
+    """
+    KeysetPage опублікованих відгуків. Перша сторінка (без курсора)
+    кешується, решта — один запит по індексу.
+    """
+    paginator = ReviewPaginator(published_reviews(), REVIEWS_PAGE_SIZE)
+    if request.GET.get('after') or request.GET.get('before'):
+        return paginator.get_page(request)
+    return get_or_build(
+        'reviews_first_page', lambda: paginator.get_page(request), *request_key_parts(request), scope=REVIEWS
+    )
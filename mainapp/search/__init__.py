@@ -0,0 +1,5 @@
+"""
+Пошук товарів: нормалізація тексту (text), інвертований індекс у пам'яті
+процесу (index) та префіксний індекс підказок (suggest). Використовується
+сторінкою /search/ та API /api/search/ і /api/suggest/.
+"""
@@ -0,0 +1,172 @@
+"""
+Інвертований індекс товарів у пам'яті процесу.
+
+Індекс будується одним запитом (values по товарах у наявності) і живе у
+модулі, доки не зміниться версія кешу каталогу (сигнали товарів, категорій
+і брендів її збільшують). Пошук не торкається БД: ключі запиту шукаються
+у словнику постингів, префікси — бінарним пошуком по відсортованому
+словнику, тож відповідь займає мілісекунди замість LIKE-сканування.
+
+Ранжування: сума по словах запиту найкращої ваги поля (модель > назва >
+бренд > категорія > характеристики > опис) × idf ключа; збіг за префіксом
+важить менше за точний. Спершу шукаються товари з усіма словами запиту,
+якщо таких немає — з будь-яким.
+
+Бекенд БД. Локально сайт працює на SQLite, на production — на PostgreSQL
+(settings_production, DATABASE_URL), і обидва використовують цей самий
+індекс, а не tsvector/GIN чи FTS5. Причина — нормалізація з text.py
+(російські терміни, гомогліфи в кодах моделей, транслітерація, злиті
+частини моделей, стемер), яку жодна вбудована конфігурація
+повнотекстового пошуку не повторює, тож результати на різних БД
+розходились би. Каталог невеликий (тисячі товарів), і індекс будується
+одним SELECT. Кожен воркер тримає свою копію і бачить зміни через
+спільну версію кешу каталогу (на production за замовчуванням файловий
+кеш, див. CACHE_BACKEND), тому з locmem у кількох процесах пошук може
+відставати до перезапуску. Якщо перебудова індексу в кожному воркері
+стане дорогою, наступний крок — колонка tsvector з ключами index_terms()
+та GIN-індексом на PostgreSQL з цим модулем як запасним варіантом для
+SQLite.
+"""
+import math
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from mainapp.cache import CATALOG, get_version
+from mainapp.models import Product
+
+from .text import index_terms, terms
+
+
+# Поле -> вага збігу
+FIELD_WEIGHTS = {
+    'model': 8,
+    'name': 6,
+    'brand__name': 4,
+    'category__name': 3,
+    'power': 2,
+    'efficiency': 2,
+    'description': 1,
+}
+
+# Множник ваги для збігу за префіксом (запит "інверт" -> "інвертор")
+PREFIX_FACTOR = 0.6
+# Скільки ключів словника перебирається для одного префікса
+MAX_EXPANSIONS = 64
+# Коротші ключі шукаються лише точно
+MIN_PREFIX = 2
+
+
+class SearchIndex:
+    def __init__(self, rows):
+        postings = defaultdict(dict)
+        self.order = {}
+        for row in rows:
+            product_id = row['id']
+            # Однакові бали: спершу рекомендовані, далі за назвою
+            self.order[product_id] = (not row['featured'], row['name'])
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in index_terms(row[field] or ''):
+                    posting = postings[term]
+                    if posting.get(product_id, 0) < weight:
+                        posting[product_id] = weight
+        self.size = len(self.order)
+        self.postings = dict(postings)
+        self.vocabulary = sorted(self.postings)
+
+    def _candidates(self, term):
+        """(ключ словника, множник) для точного збігу і збігів за префіксом"""
+        if term in self.postings:
+            yield term, 1.0
+        if len(term) < MIN_PREFIX:
+            return
+        position = bisect_left(self.vocabulary, term)
+        for candidate in self.vocabulary[position:position + MAX_EXPANSIONS]:
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                yield candidate, PREFIX_FACTOR
+
+    def _match(self, group):
+        """{product_id: бал} для одного слова запиту (варіанти слова — group)"""
+        scores = {}
+        for term in group:
+            for candidate, factor in self._candidates(term):
+                posting = self.postings[candidate]
+                idf = math.log(1 + self.size / len(posting))
+                for product_id, weight in posting.items():
+                    score = weight * idf * factor
+                    if score > scores.get(product_id, 0):
+                        scores[product_id] = score
+        return scores
+
+    def search(self, query):
+        """PK товарів у порядку релевантності"""
+        matches = [self._match(group) for group in terms(query)]
+        if not matches:
+            return []
+        found = set.intersection(*(set(match) for match in matches))
+        if not found:
+            found = set().union(*matches)
+        scores = {product_id: sum(match.get(product_id, 0) for match in matches) for product_id in found}
+        return sorted(found, key=lambda product_id: (-scores[product_id], self.order[product_id]))
+
+
+def build_search_index():
+    """Будує індекс одним запитом по товарах у наявності"""
+    rows = (
+        Product.objects.filter(in_stock=True)
+        .values('id', 'featured', *FIELD_WEIGHTS)
+        .order_by()
+    )
+    return SearchIndex(rows.iterator())
+
+
+class ProcessIndex:
+    """
+    Індекс, що живе у пам'яті процесу до зміни версії кешу каталогу.
+    Версію збільшують сигнали товарів, категорій і брендів (signals.py),
+    тож після змін індекс перебудовується при першому зверненні.
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self.lock = threading.Lock()
+        self.version = None
+        self.index = None
+
+    def get(self):
+        version = get_version(CATALOG)
+        if self.version != version:
+            with self.lock:
+                if self.version != version:
+                    self.index = self.builder()
+                    self.version = version
+        return self.index
+
+    def reset(self):
+        """Перебудувати індекс при наступному зверненні"""
+        self.version = None
+
+
+_search_index = ProcessIndex(build_search_index)
+
+
+def get_search_index():
+    """Індекс поточної версії каталогу (перебудовується після змін каталогу)"""
+    return _search_index.get()
+
+
+def reset_search_index():
+    _search_index.reset()
+
+
+def search_products(query, offset=0, limit=None):
+    """
+    (кількість знайдених, товари сторінки) — товари з category/brand
+    одним запитом по PK у порядку релевантності.
+    """
+    product_ids = get_search_index().search(query)
+    page_ids = product_ids[offset:offset + limit if limit else None]
+    products = Product.objects.filter(pk__in=page_ids).select_related('category', 'brand').in_bulk()
+    return len(product_ids), [products[product_id] for product_id in page_ids if product_id in products]
@@ -0,0 +1,178 @@
+"""
+Підказки пошуку (typeahead) для /api/suggest/.
+
+Індекс — відсортований масив ключів з посиланнями на підказки (товари та
+бренди). Ключ — "злитий" текст без пробілів і дефісів від початку кожного
+слова назви чи моделі: "Гібридний інвертор Deye SUN-12K-SG04LP3" дає
+"гібриднийінверторdeyesun12k...", "deyesun12ksg04lp3", "sun12ksg04lp3",
+"12ksg04lp3"... Тож запит "SUN-12K", "sun12k" чи "12K-SG" знаходиться
+бінарним пошуком за префіксом, без звернень до БД.
+
+Ранжується весь діапазон ключів з префіксом запиту. Діапазони до MAX_SCAN
+ключів переглядаються під час запиту; для коротких префіксів з більшими
+діапазонами ("і", "ін", "sun") найкращі MAX_LIMIT підказок рахуються під час
+побудови індексу, тож відповідь не залежить від розміру каталогу.
+
+Індекс будується одним запитом values_list() і живе у процесі до наступної
+зміни каталогу (signals.py скидає його при збереженні товарів і брендів).
+"""
+import heapq
+import re
+from bisect import bisect_left
+
+from django.urls import reverse
+
+from mainapp.models import Product
+from mainapp.slugs import transliterate
+
+from .index import ProcessIndex
+from .text import HOMOGLYPHS, normalize
+
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Довші ключі обрізаються: префікс такої довжини вже однозначний
+MAX_KEY_LENGTH = 40
+# Діапазони з більшою кількістю ключів не переглядаються під час запиту:
+# для їх префіксів найкращі підказки рахуються заздалегідь
+MAX_SCAN = 256
+
+# Верхня межа для ключів з префіксом: prefix <= key < prefix + _LAST
+_LAST = '\U0010ffff'
+
+_word = re.compile(r'[^\W_]+')
+_cyrillic = re.compile('[а-яіїєґ]')
+
+
+def compact(text):
+    """Нижній регістр без роздільників: "SUN-12K SG04" -> "sun12ksg04" """
+    return ''.join(_word.findall(normalize(text)))
+
+
+def word_keys(text):
+    """Злиті хвости тексту від початку кожного слова (позиція слова, ключ)"""
+    words = _word.findall(normalize(text))
+    for position in range(len(words)):
+        yield position, ''.join(words[position:])[:MAX_KEY_LENGTH]
+
+
+class SuggestIndex:
+    def __init__(self, products):
+        # Підказка: (тип, текст, модель, бренд, url, рекомендований)
+        self.suggestions = []
+        keys = []
+        brands = {}
+        for product_id, name, model, brand_name, brand_slug, featured in products:
+            self.suggestions.append((
+                'product', name, model, brand_name,
+                reverse('mainapp:product_detail', args=[product_id]), featured,
+            ))
+            entry = len(self.suggestions) - 1
+            for text in (name, model):
+                for position, key in word_keys(text or ''):
+                    keys.append((key, position, entry))
+            brands.setdefault(brand_name, brand_slug)
+
+        for brand_name, brand_slug in brands.items():
+            self.suggestions.append((
+                'brand', brand_name, '', brand_name,
+                reverse('mainapp:catalog') + f'?brand={brand_slug or brand_name}', True,
+            ))
+            entry = len(self.suggestions) - 1
+            for position, key in word_keys(brand_name):
+                keys.append((key, position, entry))
+
+        keys.sort()
+        self.keys = [key for key, _, _ in keys]
+        self.entries = [(position, entry) for _, position, entry in keys]
+        self.top = self._build_top()
+
+    def rank(self, entry, position):
+        """Бренди, потім збіг ближче до початку назви, рекомендовані, коротші назви"""
+        kind, text, _, _, _, featured = self.suggestions[entry]
+        return (kind != 'brand', position, not featured, len(text), text, entry)
+
+    def _best(self, start, stop):
+        """[(entry, позиція)] найкращих MAX_LIMIT підказок для ключів start:stop"""
+        found = {}
+        for position, entry in self.entries[start:stop]:
+            if position < found.get(entry, MAX_KEY_LENGTH):
+                found[entry] = position
+        return heapq.nsmallest(MAX_LIMIT, found.items(), key=lambda item: self.rank(*item))
+
+    def _build_top(self):
+        """
+        {префікс: найкращі підказки} для префіксів з понад MAX_SCAN ключами.
+        Діапазони вкладені, тож кожна довжина префікса перебирає лише
+        великі діапазони попередньої.
+        """
+        top = {}
+        ranges = [(0, len(self.keys))]
+        for length in range(1, MAX_KEY_LENGTH + 1):
+            large = []
+            for start, end in ranges:
+                index = start
+                while index < end:
+                    if len(self.keys[index]) < length:
+                        index += 1
+                        continue
+                    prefix = self.keys[index][:length]
+                    stop = bisect_left(self.keys, prefix + _LAST, index, end)
+                    if stop - index > MAX_SCAN:
+                        top[prefix] = self._best(index, stop)
+                        large.append((index, stop))
+                    index = stop
+            if not large:
+                break
+            ranges = large
+        return top
+
+    def _lookup(self, prefix, found):
+        """Додає до found {entry: найкраща позиція слова} для ключів з префіксом"""
+        start = bisect_left(self.keys, prefix)
+        stop = bisect_left(self.keys, prefix + _LAST, start)
+        if stop - start > MAX_SCAN:
+            # Топ MAX_LIMIT діапазону містить усі підказки, що можуть потрапити у відповідь
+            matches = self.top[prefix]
+        else:
+            matches = ((entry, position) for position, entry in self.entries[start:stop])
+        for entry, position in matches:
+            if position < found.get(entry, MAX_KEY_LENGTH):
+                found[entry] = position
+
+    def suggest(self, query, limit=DEFAULT_LIMIT):
+        """Топ-limit підказок (limit не більше MAX_LIMIT) у порядку rank()"""
+        prefix = compact(query)[:MAX_KEY_LENGTH]
+        if not prefix:
+            return []
+        found = {}
+        self._lookup(prefix, found)
+        if _cyrillic.search(prefix):
+            # Код моделі з кириличними двійниками або бренд кирилицею (деye, лонгі)
+            variants = {prefix.translate(HOMOGLYPHS), transliterate(prefix), transliterate(prefix.replace('г', 'ґ'))}
+            for variant in variants - {prefix}:
+                self._lookup(variant, found)
+
+        best = heapq.nsmallest(min(limit, MAX_LIMIT), found, key=lambda entry: self.rank(entry, found[entry]))
+        return [dict(zip(('type', 'text', 'model', 'brand', 'url'), self.suggestions[entry][:5])) for entry in best]
+
+
+def build_suggest_index():
+    """Будує індекс одним запитом по товарах у наявності"""
+    products = (
+        Product.objects.filter(in_stock=True)
+        .order_by()
+        .values_list('id', 'name', 'model', 'brand__name', 'brand__slug', 'featured')
+    )
+    return SuggestIndex(products.iterator())
+
+
+_suggest_index = ProcessIndex(build_suggest_index)
+
+
+def get_suggest_index():
+    return _suggest_index.get()
+
+
+def reset_suggest_index():
+    _suggest_index.reset()
@@ -0,0 +1,101 @@
+"""
+Нормалізація тексту для пошуку: однакові правила для індексу і запиту.
+
+- російські терміни й літери замінюються українськими (normalization.translate);
+- слова стемуються легким українським стемером (відкидання закінчень),
+  тож "інвертори", "інверторів" та "інвертор" дають один ключ;
+- кириличні слова додатково індексуються в латинській транслітерації
+  (запит "invertor" знаходить "інвертор");
+- у моделях кириличні літери-двійники замінюються латинськими
+  ("SUN-5К" набране з кириличною К == "SUN-5K"), а частини моделі через
+  дефіс індексуються і окремо, і злитно ("sun5ksg03lp1"), тож запит
+  знаходить модель з дефісами чи без.
+"""
+import re
+
+from mainapp.normalization import translate
+from mainapp.slugs import transliterate
+
+
+# Кириличні літери, що виглядають як латинські (плутаються в кодах моделей)
+HOMOGLYPHS = str.maketrans({
+    'а': 'a', 'в': 'b', 'е': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o',
+    'р': 'p', 'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'і': 'i',
+})
+
+APOSTROPHES = str.maketrans('', '', "'ʼ’`")
+
+# Закінчення від найдовших до найкоротших; основа — щонайменше MIN_STEM літер
+ENDINGS = sorted({
+    'ами', 'ями', 'ові', 'еві', 'ого', 'ому', 'ими', 'іми',
+    'ій', 'ий', 'ої', 'ою', 'ею', 'єю', 'ів', 'ам', 'ям', 'ах', 'ях', 'ом', 'ем',
+    'их', 'іх', 'им', 'ім', 'ей',
+    'а', 'я', 'о', 'е', 'є', 'и', 'і', 'ї', 'у', 'ю', 'й', 'ь',
+}, key=len, reverse=True)
+MIN_STEM = 3
+
+# Слова без пошукової ваги
+STOP_WORDS = {'і', 'й', 'та', 'з', 'із', 'зі', 'в', 'у', 'на', 'до', 'для', 'від', 'по', 'або', 'чи'}
+
+_cyrillic = re.compile('[а-яіїєґ]')
+_digit = re.compile(r'\d')
+# Послідовності букв/цифр, з'єднані дефісами, крапками чи слешами (коди моделей)
+_compound = re.compile(r'\w+(?:[-./]\w+)*')
+_part = re.compile(r'[^\W_]+')
+
+
+def stem(word):
+    """Легкий стемер: відкидає найдовше закінчення, якщо лишається основа"""
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+def word_terms(word):
+    """Ключі індексу для одного слова (без роздільників)"""
+    if _digit.search(word):
+        # Код моделі чи характеристика: лише латинські двійники
+        return [word.translate(HOMOGLYPHS)]
+    if _cyrillic.search(word):
+        stemmed = stem(word)
+        variants = [stemmed, transliterate(stemmed)]
+        if 'г' in stemmed:
+            # Іноземні назви пишуть "г" на місці "g" (Лонгі -> Longi)
+            variants.append(transliterate(stemmed.replace('г', 'ґ')))
+        return variants
+    return [word]
+
+
+def normalize(text):
+    return translate(str(text)).lower().replace('ё', 'е').replace('ґ', 'г').translate(APOSTROPHES)
+
+
+def terms(text):
+    """
+    Групи ключів запиту: одна група (стем + транслітерація) на слово.
+    Коди моделей розбиваються на частини (SUN-5K-SG03 -> sun, 5k, sg03).
+    """
+    groups = []
+    for part in _part.findall(normalize(text)):
+        if part not in STOP_WORDS:
+            groups.append(word_terms(part))
+    return groups
+
+
+def index_terms(text):
+    """
+    Всі ключі поля одним набором. Для складених кодів додаються також злиті
+    хвости (sun5ksg03lp1, 5ksg03lp1, sg03lp1...), тож запит, набраний без
+    дефісів, знаходить модель за префіксом з будь-якої частини.
+    """
+    keys = set()
+    for compound in _compound.findall(normalize(text)):
+        parts = _part.findall(compound)
+        for part in parts:
+            if part not in STOP_WORDS:
+                keys.update(word_terms(part))
+        if len(parts) > 1 and _digit.search(compound):
+            for start in range(len(parts) - 1):
+                keys.add(''.join(parts[start:]).translate(HOMOGLYPHS))
+    return keys
@@ -0,0 +1,166 @@
+"""
+Сигнали моделей: інвалідація кешу після змін каталогу та відгуків,
+підсумок відгуків, скидання індексів пошуку, перерахунок схожих товарів,
+генерація адаптивних варіантів для нових завантажених зображень.
+
+Масові операції (синхронізація імпорту, прикріплення завантажених
+зображень) виконуються всередині muted_catalog_signals(): обробники
+каталогу і генерація варіантів зображень не спрацьовують на кожен рядок,
+а викликач один раз інвалідує кеш (catalog_changed()) і перераховує
+похідні дані.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import CATALOG, REVIEWS, bump_version
+from .derivatives import ensure_derivatives
+from .models import Product, ProductImage, Category, Brand, Review, Portfolio, SimilarProduct
+from .recommendations import SCORING_FIELDS, update_similar, rebuild_similar
+from .reviews import apply_review_change
+from .search.index import reset_search_index
+from .search.suggest import reset_suggest_index
+
+
+_state = threading.local()
+
+
+@contextmanager
+def muted_catalog_signals():
+    """Вимикає обробники сигналів каталогу в поточному потоці"""
+    previous = getattr(_state, 'muted', False)
+    _state.muted = True
+    try:
+        yield
+    finally:
+        _state.muted = previous
+
+
+def catalog_signals_muted():
+    return getattr(_state, 'muted', False)
+
+
+def catalog_changed():
+    """
+    Те, що обробники каталогу зробили б на кожен рядок, одним викликом
+    після роботи всередині muted_catalog_signals(): інвалідація кешу та
+    індексів пошуку. Варіанти зображень потім генерує generate_image_derivatives.
+    """
+    bump_version(CATALOG)
+    reset_search_index()
+    reset_suggest_index()
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Brand)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Будь-яка зміна товарів, зображень, категорій чи брендів скидає кеш каталогу"""
+    if catalog_signals_muted():
+        return
+    bump_version(CATALOG)
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def touch_gallery_product(sender, instance, raw=False, **kwargs):
+    """
+    Зміна галереї оновлює updated_at товару: версія живих фідів з
+    галереєю рахується агрегатом по товарах без читання рядків зображень
+    """
+    if raw or catalog_signals_muted():
+        return
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Brand)
+def reset_search_indexes(sender, **kwargs):
+    """
+    Індекси пошуку й підказок у пам'яті цього процесу перебудуються при
+    наступному запиті (навіть якщо лічильник версії випав з кешу)
+    """
+    if catalog_signals_muted():
+        return
+    reset_search_index()
+    reset_suggest_index()
+
+
+@receiver(post_save, sender=Product)
+def update_similar_products(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Оновлює схожі товари для товару та списки, на які впливає його зміна"""
+    if raw or catalog_signals_muted():
+        return
+    if update_fields is not None and not SCORING_FIELDS.intersection(update_fields):
+        return
+    update_similar([instance.pk])
+
+
+@receiver(pre_delete, sender=Product)
+def remember_similar_references(sender, instance, **kwargs):
+    if catalog_signals_muted():
+        return
+    # Рядки SimilarProduct видаляються каскадом разом з товаром, тож
+    # товари, у списках яких він був, запам'ятовуємо заздалегідь
+    instance._similar_referencing = list(
+        SimilarProduct.objects.filter(similar=instance).values_list('product_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Product)
+def refill_similar_products(sender, instance, **kwargs):
+    """Доповнює списки товарів, які посилались на видалений товар"""
+    referencing = getattr(instance, '_similar_referencing', None)
+    if referencing:
+        rebuild_similar(referencing)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_state(sender, instance, raw=False, **kwargs):
+    # Попередній стан потрібен, щоб скоригувати підсумок на різницю
+    instance._stats_state = None
+    if not raw and instance.pk:
+        instance._stats_state = (
+            Review.objects.filter(pk=instance.pk).values_list('is_published', 'rating').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_review_stats(sender, instance, raw=False, **kwargs):
+    """Оновлює лічильники ReviewStats на різницю до/після збереження"""
+    if raw:
+        return
+    apply_review_change(getattr(instance, '_stats_state', None), (instance.is_published, instance.rating))
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    apply_review_change((instance.is_published, instance.rating), None)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_reviews_cache(sender, **kwargs):
+    """Зміна відгуків скидає кеш сторінки відгуків"""
+    bump_version(REVIEWS)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Portfolio)
+def generate_image_derivatives(sender, instance, raw=False, **kwargs):
+    """Варіанти WebP/JPEG для нового зображення (існуючі у маніфесті пропускаються)"""
+    if raw or not getattr(settings, 'IMAGE_DERIVATIVES_ON_SAVE', False) or not instance.image:
+        return
+    if catalog_signals_muted():
+        # Масові операції (імпорт) генерують варіанти окремою командою з пулом процесів
+        return
+    try:
+        ensure_derivatives(instance.image.name)
+    except Exception as e:
+        # Генерація варіантів не повинна ламати збереження об'єкта
+        print(f"Помилка генерації варіантів зображення {instance.image.name}: {e}")
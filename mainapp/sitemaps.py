@@ -0,0 +1,161 @@
+"""
+Sitemap сайту: індекс /sitemap.xml і шарди по розділах.
+
+- pages — статичні сторінки (lastmod каталогу = найсвіжіший товар);
+- categories — активні категорії з товарами в наявності;
+- products-N — товари в наявності, не більше SITEMAP_LIMIT URL у шарді.
+
+lastmod береться з updated_at товарів, тож краулери повторно відвідують
+лише змінені сторінки. XML генерується потоком з values_list().iterator(),
+а готові шарди кешуються view до наступної зміни каталогу.
+"""
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, Max, Q
+from django.urls import reverse
+
+from .feeds.records import SITE_URL
+from .models import Product, Category
+from .resolvers import get_catalog_lookup
+
+
+# Максимум URL в одному файлі sitemap (обмеження протоколу)
+SITEMAP_LIMIT = 50000
+
+# url name -> (changefreq, priority)
+STATIC_PAGES = {
+    'mainapp:index': ('monthly', '1.0'),
+    'mainapp:catalog': ('daily', '0.9'),
+    'mainapp:portfolio': ('monthly', '0.8'),
+    'mainapp:reviews': ('weekly', '0.7'),
+    'mainapp:contact': ('monthly', '0.6'),
+    'mainapp:shipping_policy': ('yearly', '0.5'),
+    'mainapp:return_policy': ('yearly', '0.5'),
+    'mainapp:privacy_policy': ('yearly', '0.5'),
+}
+
+XML_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = '</sitemapindex>\n'
+
+
+def w3c_date(value):
+    return value.strftime('%Y-%m-%d') if value else None
+
+
+def url_entry(path, lastmod=None, changefreq=None, priority=None):
+    parts = [f'<url><loc>{escape(SITE_URL + path)}</loc>']
+    if lastmod:
+        parts.append(f'<lastmod>{w3c_date(lastmod)}</lastmod>')
+    if changefreq:
+        parts.append(f'<changefreq>{changefreq}</changefreq>')
+    if priority:
+        parts.append(f'<priority>{priority}</priority>')
+    parts.append('</url>\n')
+    return ''.join(parts)
+
+
+def published_products():
+    """Товари, сторінки яких відкриваються (деталі показують лише товари в наявності)"""
+    return Product.objects.filter(in_stock=True)
+
+
+def published_categories():
+    """Активні категорії з товарами в наявності та їх найсвіжіший товар"""
+    in_stock = Q(product__in_stock=True)
+    return (
+        Category.objects.filter(is_active=True)
+        .annotate(products=Count('product', filter=in_stock), lastmod=Max('product__updated_at', filter=in_stock))
+        .filter(products__gt=0)
+        .exclude(slug='')
+        .order_by('pk')
+    )
+
+
+def page_urls():
+    catalog_lastmod = published_products().aggregate(lastmod=Max('updated_at'))['lastmod']
+    for name, (changefreq, priority) in STATIC_PAGES.items():
+        lastmod = catalog_lastmod if name == 'mainapp:catalog' else None
+        yield url_entry(reverse(name), lastmod, changefreq, priority)
+
+
+def category_urls():
+    """
+    Категорії під тими ж ключами URL, що й у меню (/catalog/inverters/);
+    решта — під slug. Кілька категорій одного ключа дають один URL.
+    """
+    lookup = get_catalog_lookup()
+    entries = {}
+    for category_id, slug, lastmod in published_categories().values_list('pk', 'slug', 'lastmod'):
+        key = lookup.category_url_key(category_id, slug)
+        entries[key] = max(filter(None, (entries.get(key), lastmod)), default=None)
+    for key, lastmod in entries.items():
+        yield url_entry(reverse('mainapp:category', args=[key]), lastmod, 'weekly', '0.8')
+
+
+def product_urls(page):
+    """Товари шарду page (нумерація з 1) у порядку pk"""
+    start = (page - 1) * SITEMAP_LIMIT
+    rows = published_products().order_by('pk').values_list('id', 'updated_at')[start:start + SITEMAP_LIMIT]
+    for product_id, updated_at in rows.iterator():
+        yield url_entry(reverse('mainapp:product_detail', args=[product_id]), updated_at, 'weekly', '0.7')
+
+
+def product_pages():
+    """Кількість шардів товарів (щонайменше один, навіть порожній)"""
+    return max(1, -(-published_products().count() // SITEMAP_LIMIT))
+
+
+def sections():
+    """
+    [(ім'я шарду, lastmod)] для індексу. lastmod шарду товарів — найсвіжіший
+    товар у ньому, тож незмінені шарди краулери не перечитують.
+    """
+    products = published_products()
+    result = [
+        ('pages', products.aggregate(lastmod=Max('updated_at'))['lastmod']),
+        ('categories', max(filter(None, published_categories().values_list('lastmod', flat=True)), default=None)),
+    ]
+    ids = products.order_by('pk').values_list('id', flat=True)
+    for page in range(1, product_pages() + 1):
+        # Межі шарду за pk, щоб lastmod рахувався індексованим запитом
+        first = ids[(page - 1) * SITEMAP_LIMIT:(page - 1) * SITEMAP_LIMIT + 1].first()
+        following = ids[page * SITEMAP_LIMIT:page * SITEMAP_LIMIT + 1].first()
+        shard = products.filter(pk__gte=first) if first is not None else products.none()
+        if following is not None:
+            shard = shard.filter(pk__lt=following)
+        result.append((f'products-{page}', shard.aggregate(lastmod=Max('updated_at'))['lastmod']))
+    return result
+
+
+def sitemap_index():
+    yield XML_HEAD + INDEX_OPEN
+    for name, lastmod in sections():
+        loc = escape(SITE_URL + reverse('mainapp:sitemap_section', args=[name]))
+        lastmod = f'<lastmod>{w3c_date(lastmod)}</lastmod>' if lastmod else ''
+        yield f'<sitemap><loc>{loc}</loc>{lastmod}</sitemap>\n'
+    yield INDEX_CLOSE
+
+
+def sitemap_section(name):
+    """Генератор XML шарду або None, якщо такого шарду немає"""
+    if name == 'pages':
+        urls = page_urls()
+    elif name == 'categories':
+        urls = category_urls()
+    elif name.startswith('products-') and name[len('products-'):].isdigit():
+        page = int(name[len('products-'):])
+        if not 1 <= page <= product_pages():
+            return None
+        urls = product_urls(page)
+    else:
+        return None
+    return _urlset(urls)
+
+
+def _urlset(urls):
+    yield XML_HEAD + URLSET_OPEN
+    yield from urls
+    yield URLSET_CLOSE
@@ -0,0 +1,66 @@
+"""
+Генерація slug для категорій і брендів.
+
+slugify() просто відкидає кирилицю, тож "Інвертори" давали порожній slug,
+а наступні категорії — "-1", "-2"... Тут назва спершу транслітерується
+(українська офіційна транслітерація, плюс російські літери), а унікальність
+перевіряється одним запитом: всі зайняті slug з тим самим початком
+вибираються разом, і вільний суфікс шукається в пам'яті.
+"""
+import re
+
+from django.utils.text import slugify
+
+
+TRANSLITERATION = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e',
+    'є': 'ie', 'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i',
+    'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia',
+    "'": '', 'ʼ': '', '’': '',
+    # Російські літери
+    'ё': 'e', 'ы': 'y', 'э': 'e', 'ъ': '',
+    # "зг" передається як "zgh", щоб не читалось як "ж"
+    'зг': 'zgh',
+}
+
+# На початку слова є/ї/й/ю/я передаються інакше (Єнакієве -> Yenakiieve)
+WORD_START = {'є': 'ye', 'ї': 'yi', 'й': 'y', 'ю': 'yu', 'я': 'ya'}
+
+_word_start = re.compile(r"(?<![^\W\d_])[єїйюя]")
+_letters = re.compile('зг|[' + ''.join(key for key in TRANSLITERATION if len(key) == 1) + ']')
+
+
+def transliterate(text):
+    """Кирилиця -> латиниця (у нижньому регістрі)"""
+    text = _word_start.sub(lambda match: WORD_START[match.group(0)], str(text).lower())
+    return _letters.sub(lambda match: TRANSLITERATION[match.group(0)], text)
+
+
+def make_slug(text, max_length=100):
+    return slugify(transliterate(text))[:max_length].strip('-')
+
+
+def next_free_slug(base, taken):
+    """base, base-1, base-2... — перший, якого немає у taken"""
+    slug = base
+    counter = 1
+    while slug in taken:
+        slug = f"{base}-{counter}"
+        counter += 1
+    return slug
+
+
+def unique_slug(model, name, exclude_pk=None):
+    """
+    Унікальний slug для об'єкта моделі з полем slug одним запитом до БД.
+    Для назв без жодної літери чи цифри основою стає назва моделі.
+    """
+    max_length = model._meta.get_field('slug').max_length
+    # Запас під суфікс "-N"
+    base = make_slug(name, max_length - 6) or model._meta.model_name
+    taken = model.objects.filter(slug__startswith=base)
+    if exclude_pk is not None:
+        taken = taken.exclude(pk=exclude_pk)
+    return next_free_slug(base, set(taken.values_list('slug', flat=True)))
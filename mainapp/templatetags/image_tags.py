@@ -0,0 +1,95 @@
+"""
+Теги для адаптивних зображень (srcset з похідних варіантів WebP/JPEG/AVIF)
+
+Використання у шаблоні:
+    {% load image_tags %}
+    {% responsive_image product 'card' alt=product.name css_class='product-card__image' %}
+"""
+from urllib.parse import quote
+
+from django import template
+from django.conf import settings
+from django.utils.html import format_html, format_html_join
+
+from mainapp.derivatives import DERIVATIVE_FORMATS, DERIVATIVE_SIZES, get_derivatives
+
+register = template.Library()
+
+# Атрибут sizes за замовчуванням для кожного варіанту
+DEFAULT_SIZES = {
+    'thumb': '100px',
+    'card': '(max-width: 768px) 50vw, 240px',
+    'detail': '(max-width: 768px) 100vw, 600px',
+    'zoom': '100vw',
+}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def _source(image):
+    """(ім'я файлу відносно MEDIA_ROOT, URL оригіналу) для моделі або рядка"""
+    if isinstance(image, str):
+        return image, f'{settings.MEDIA_URL}{image}'
+    field = getattr(image, 'image', None)
+    if not field:
+        return '', ''
+    return field.name, getattr(image, 'image_url', '') or field.url
+
+
+def _media_url(relative):
+    return settings.MEDIA_URL + quote(relative)
+
+
+def _srcset(entry, fmt):
+    return ', '.join(
+        f"{_media_url(variant[fmt])} {variant['width']}w"
+        for variant in entry['variants'].values()
+        if fmt in variant
+    )
+
+
+@register.simple_tag
+def image_srcset(image, fmt='webp'):
+    """Рядок srcset для зображення (порожній, якщо варіантів ще немає)"""
+    name, _ = _source(image)
+    entry = get_derivatives(name)
+    return _srcset(entry, fmt) if entry else ''
+
+
+@register.simple_tag
+def responsive_image(image, size='card', alt='', css_class='', sizes=None, loading='lazy'):
+    """
+    <picture> з AVIF/WebP джерелами та JPEG fallback.
+    Якщо варіанти ще не згенеровані — звичайний <img> з оригіналом.
+    """
+    name, original_url = _source(image)
+    if not original_url:
+        return ''
+
+    entry = get_derivatives(name)
+    if not entry or size not in DERIVATIVE_SIZES:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}">',
+            original_url, alt, css_class, loading,
+        )
+
+    sizes = sizes or DEFAULT_SIZES[size]
+    variants = entry['variants']
+    # Найближчий доступний варіант (малі оригінали можуть не мати великих розмірів)
+    chosen = variants.get(size) or list(variants.values())[-1]
+    fallback = _media_url(chosen['jpeg']) if 'jpeg' in chosen else original_url
+
+    sources = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[fmt], _srcset(entry, fmt), sizes)
+            for fmt in DERIVATIVE_FORMATS if fmt != 'jpeg'
+        ),
+    )
+    return format_html(
+        '<picture class="responsive-image">{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}"'
+        ' width="{}" height="{}"></picture>',
+        sources, fallback, _srcset(entry, "jpeg"), sizes, alt, css_class, loading,
+        chosen['width'], round(entry['height'] * chosen['width'] / entry['width']),
+    )
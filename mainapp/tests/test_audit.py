@@ -0,0 +1,109 @@
+"""Тести аудиту контенту (mainapp.audit)"""
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from unittest import mock
+
+from mainapp.audit.checks import inspect_rows
+from mainapp.audit.content import RussianContentCheck, SpellingCheck
+from mainapp.audit.runner import ContentAudit
+from mainapp.feeds.exporter import FeedExporter
+from mainapp.models import AuditCheckpoint, Brand, Product
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class AuditFixTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category()
+        brand = make_brand()
+        self.product = make_product(category, brand, name='Гибридный інветор Deye')
+        self.clean = make_product(category, brand, name='Гібридний інвертор Must')
+
+    def test_fix_bumps_updated_at(self):
+        before = Product.objects.get(pk=self.product.pk).updated_at
+
+        result = ContentAudit([SpellingCheck()], fix=True).run()
+
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(result.fixed['Product'], 1)
+        self.assertEqual(product.name, 'Гибридний інвертор Deye')
+        self.assertGreater(product.updated_at, before)
+        self.assertEqual(Product.objects.get(pk=self.clean.pk).updated_at, self.clean.updated_at)
+
+    def test_fixed_product_is_exported_again(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        FeedExporter(output_dir).export()
+
+        ContentAudit([SpellingCheck()], fix=True).run()
+        result = FeedExporter(output_dir).export()
+
+        self.assertIn(os.path.join(output_dir, 'products.json'), result['files'])
+        with open(os.path.join(output_dir, 'products.json'), encoding='utf-8') as f:
+            names = {record['id']: record['name'] for record in json.load(f)['products']}
+        self.assertEqual(names[self.product.pk], Product.objects.get(pk=self.product.pk).name)
+
+
+class AuditCheckpointTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category()
+        self.brand = make_brand(description='Виробник інверторів')
+        self.products = [make_product(category, self.brand, name=f'Інвертор {index}') for index in range(3)]
+
+    def audit(self, **kwargs):
+        """(кількість перевірених рядків по моделях, AuditResult) інкрементального аудиту з виправленнями"""
+        inspected = Counter()
+
+        def counting(checks, model, title_field, rows):
+            inspected[model] += len(rows)
+            return inspect_rows(checks, model, title_field, rows)
+
+        with mock.patch('mainapp.audit.runner.inspect_rows', counting):
+            result = ContentAudit([RussianContentCheck(), SpellingCheck()], fix=True, incremental=True, **kwargs).run()
+        return inspected, result
+
+    def test_second_run_skips_unchanged_rows(self):
+        first, _ = self.audit()
+        second, result = self.audit()
+
+        self.assertEqual(first['Product'], 3)
+        self.assertEqual(first['Brand'], 1)
+        self.assertEqual(second['Product'], 0)
+        self.assertEqual(second['Brand'], 0)
+        self.assertEqual(sum(result.findings.values()), 0)
+
+    def test_changed_rows_are_revisited(self):
+        self.audit()
+        product = self.products[1]
+        product.description = 'Это устройство является лучшим'
+        product.save()
+        # Без save(): зміна без updated_at ловиться хешем вмісту
+        Brand.objects.filter(pk=self.brand.pk).update(description='Является производителем')
+
+        inspected, result = self.audit()
+
+        self.assertEqual(inspected['Product'], 1)
+        self.assertEqual(inspected['Brand'], 1)
+        self.assertEqual(result.findings['Product'], 1)
+        self.assertEqual(result.findings['Brand'], 1)
+
+    def test_unfixed_issue_is_not_reported_again_until_changed(self):
+        Product.objects.filter(pk=self.products[0].pk).update(description='Это устройство')
+
+        _, first = self.audit()
+        _, second = self.audit()
+
+        self.assertEqual(first.findings['Product'], 1)
+        self.assertEqual(second.findings['Product'], 0)
+
+    def test_other_check_set_starts_from_scratch(self):
+        self.audit()
+
+        result = ContentAudit([SpellingCheck()], fix=True, incremental=True).run()
+        self.assertEqual(AuditCheckpoint.objects.filter(model='Product').count(), 2)
+        self.assertEqual(result.fixed['Product'], 0)
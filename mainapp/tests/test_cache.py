@@ -0,0 +1,85 @@
+"""Тести версіонованого кешу сторінок (mainapp.cache, signals.py)"""
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mainapp.cache import CATALOG, REVIEWS, bump_version, get_or_build, get_version, make_key
+from mainapp.models import Review
+from mainapp.signals import muted_catalog_signals
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class VersionTests(CatalogTestCase):
+    def test_bump_changes_keys_of_one_scope_only(self):
+        catalog_key = make_key('page', 'a')
+        reviews_key = make_key('page', 'a', scope=REVIEWS)
+
+        bump_version(CATALOG)
+
+        self.assertNotEqual(make_key('page', 'a'), catalog_key)
+        self.assertEqual(make_key('page', 'a', scope=REVIEWS), reviews_key)
+
+    def test_get_or_build_calls_builder_once_per_version(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(get_or_build('value', build), 1)
+        self.assertEqual(get_or_build('value', build), 1)
+        bump_version(CATALOG)
+        self.assertEqual(get_or_build('value', build), 2)
+
+
+class SignalInvalidationTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category()
+        self.brand = make_brand()
+        self.product = make_product(self.category, self.brand, name='Інвертор Deye 5 кВт')
+
+    def test_model_changes_bump_their_scope(self):
+        for change in (
+            lambda: self.product.save(),
+            lambda: self.category.save(),
+            lambda: self.brand.save(),
+            lambda: make_product(self.category, self.brand).delete(),
+        ):
+            version = get_version(CATALOG)
+            change()
+            self.assertGreater(get_version(CATALOG), version)
+
+        reviews = get_version(REVIEWS)
+        catalog = get_version(CATALOG)
+        Review.objects.create(client_name='Олена', review_text='Дякую', rating=5)
+        self.assertGreater(get_version(REVIEWS), reviews)
+        self.assertEqual(get_version(CATALOG), catalog)
+
+    def test_muted_signals_leave_version(self):
+        version = get_version(CATALOG)
+        with muted_catalog_signals():
+            self.product.save()
+        self.assertEqual(get_version(CATALOG), version)
+
+    def test_cached_product_page_follows_price_change(self):
+        url = reverse('mainapp:product_detail', args=[self.product.pk])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertEqual(len(queries), 0)
+
+        self.product.price = Decimal('43210')
+        self.product.save()
+
+        self.assertEqual(self.client.get(url).context['product'].price, Decimal('43210'))
+
+    def test_cached_sitemap_follows_new_product(self):
+        url = reverse('mainapp:sitemap_section', args=['products-1'])
+        self.client.get(url)
+        product = make_product(self.category, self.brand)
+
+        self.assertContains(self.client.get(url), reverse('mainapp:product_detail', args=[product.pk]))
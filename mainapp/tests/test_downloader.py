@@ -0,0 +1,157 @@
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from mainapp.importers.downloader import DownloadResult, ImageDownloader
+from mainapp.management.commands.universal_import_products import Command as UniversalImportCommand
+from mainapp.models import Product, ProductImage
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Локальний сервер зображень: /img/N, /flaky/N (спершу 503), /slow, /missing"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if self.path.startswith('/flaky/') and hits == 1:
+                return self.reply(503, b'')
+            if self.path == '/slow':
+                time.sleep(1)
+            if self.path == '/missing':
+                return self.reply(404, b'')
+            time.sleep(server.delay)
+            self.reply(200, f'image {self.path}'.encode(), 'image/png')
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ImageDownloaderTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+        self.server.lock = threading.Lock()
+        self.server.hits = {}
+        self.server.active = self.server.peak = 0
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def downloader(self, **kwargs):
+        options = {'workers': 4, 'timeout': 5, 'retries': 2, 'backoff': 0.01, 'per_host_interval': 0}
+        options.update(kwargs)
+        return ImageDownloader(**options)
+
+    def test_downloads_each_url_once_with_bounded_concurrency(self):
+        self.server.delay = 0.1
+        urls = [f'{self.base}/img/{index}.png' for index in range(12)]
+        downloader = self.downloader(per_host_concurrency=2)
+        results = {result.url: result for result in downloader.iter_downloads(urls + urls[:3])}
+
+        self.assertEqual(set(results), set(urls))
+        self.assertTrue(all(result.error is None and result.extension == '.png' for result in results.values()))
+        self.assertEqual(results[urls[0]].content, b'image /img/0.png')
+        self.assertEqual(sum(self.server.hits.values()), 12)
+        self.assertEqual(self.server.peak, 2)
+
+    def test_retries_server_errors_but_not_client_errors(self):
+        downloader = self.downloader()
+        results = {result.url: result for result in downloader.iter_downloads([
+            f'{self.base}/flaky/1.jpg', f'{self.base}/missing',
+        ])}
+
+        self.assertIsNone(results[f'{self.base}/flaky/1.jpg'].error)
+        self.assertEqual(self.server.hits['/flaky/1.jpg'], 2)
+        self.assertIsNotNone(results[f'{self.base}/missing'].error)
+        self.assertEqual(self.server.hits['/missing'], 1)
+        self.assertEqual(downloader.stats, {'downloaded': 1, 'cached': 0, 'failed': 1})
+
+    def test_timeout_gives_up_after_retries(self):
+        downloader = self.downloader(timeout=0.2, retries=1)
+        [result] = downloader.iter_downloads([f'{self.base}/slow'])
+
+        self.assertIsNotNone(result.error)
+        self.assertEqual(self.server.hits['/slow'], 2)
+
+    def test_disk_cache_skips_repeated_downloads(self):
+        url = f'{self.base}/img/cached.png'
+        list(self.downloader(cache_dir=self.cache_dir).iter_downloads([url]))
+        again = self.downloader(cache_dir=self.cache_dir)
+        [result] = again.iter_downloads([url])
+
+        self.assertEqual(result.content, b'image /img/cached.png')
+        self.assertEqual(self.server.hits['/img/cached.png'], 1)
+        self.assertEqual(again.stats['cached'], 1)
+
+
+@override_settings(IMAGE_DERIVATIVES_ON_SAVE=True)
+class AttachImagesTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media, IMPORT_CACHE_DIR=media))
+        self.product = make_product(make_category(), make_brand(), name='Інвертор Deye 5 кВт')
+
+    def attach(self):
+        command = UniversalImportCommand()
+        command.verbose = False
+        command.dry_run = False
+        command.download_workers = 2
+        command.stats = {'images_downloaded': 0}
+        command.pending_images = [(self.product, ['http://img.test/main.png', 'http://img.test/side.png'])]
+        results = [
+            DownloadResult(url, b'\x89PNG image', 'digest', '.png', None)
+            for url in ('http://img.test/main.png', 'http://img.test/side.png')
+        ]
+        with mock.patch.object(ImageDownloader, 'iter_downloads', return_value=iter(results)):
+            command.attach_pending_images()
+        return command
+
+    def test_attach_skips_per_image_handlers(self):
+        with mock.patch('mainapp.signals.ensure_derivatives') as derivatives, \
+                mock.patch('mainapp.signals.bump_version') as bump, \
+                mock.patch('mainapp.signals.reset_search_index') as reset:
+            command = self.attach()
+
+        self.assertEqual(command.stats['images_downloaded'], 2)
+        self.assertTrue(Product.objects.get(pk=self.product.pk).image)
+        self.assertEqual(ProductImage.objects.filter(product=self.product).count(), 1)
+        derivatives.assert_not_called()
+        bump.assert_called_once()
+        reset.assert_called_once()
+
+    def test_main_image_stamps_updated_at(self):
+        before = Product.objects.get(pk=self.product.pk).updated_at
+        self.attach()
+        self.assertGreater(Product.objects.get(pk=self.product.pk).updated_at, before)
+
+    def test_derivatives_still_generated_on_regular_save(self):
+        with mock.patch('mainapp.signals.ensure_derivatives') as derivatives:
+            ProductImage.objects.create(product=self.product, image='products/gallery/x.png')
+        derivatives.assert_called_once_with('products/gallery/x.png')
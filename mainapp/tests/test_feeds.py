@@ -0,0 +1,150 @@
+"""Тести фідів: інкрементальний експорт шардів (mainapp.feeds)"""
+import json
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mainapp.feeds.exporter import FeedExporter
+from mainapp.feeds.manifest import load_manifest
+from mainapp.feeds.records import shard_name
+from mainapp.importers.bulk import BulkProductWriter
+from mainapp.models import Product, ProductImage
+
+from .test_import import row
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class FeedExportTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        self.inverters = make_category('Інвертори')
+        self.panels = make_category('Сонячні панелі')
+        self.deye = make_brand('Deye')
+        self.longi = make_brand('LONGi')
+        self.inverter = make_product(self.inverters, self.deye, name='Інвертор Deye 6 кВт')
+        self.panel = make_product(self.panels, self.longi, name='Панель LONGi 450 Вт')
+
+    def export(self):
+        return FeedExporter(self.output_dir).export()
+
+    def written(self, result):
+        return {os.path.basename(path) for path in result['files']}
+
+    def shard(self, prefix, obj):
+        return shard_name(prefix, obj) + '.json'
+
+    def read(self, filename):
+        with open(os.path.join(self.output_dir, filename), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_unchanged_catalog_writes_nothing(self):
+        first = self.export()
+        second = self.export()
+
+        self.assertIn('products.json', self.written(first))
+        self.assertEqual(second['files'], [])
+        self.assertCountEqual(second['skipped'], self.written(first))
+
+    def test_update_without_save_rewrites_only_affected_shards(self):
+        self.export()
+        etags = {filename: entry['etag'] for filename, entry in load_manifest(self.output_dir)['shards'].items()}
+
+        # updated_at не змінюється
+        Product.objects.filter(pk=self.inverter.pk).update(price=Decimal('1234.00'))
+        result = self.export()
+
+        self.assertEqual(self.written(result), {
+            'products.json', 'full_catalog.json',
+            self.shard('category', self.inverters), self.shard('brand', self.deye),
+        })
+        self.assertIn(self.shard('category', self.panels), result['skipped'])
+        shards = load_manifest(self.output_dir)['shards']
+        self.assertNotEqual(shards['products.json']['etag'], etags['products.json'])
+        prices = {record['id']: record['price'] for record in self.read('products.json')['products']}
+        self.assertEqual(prices[self.inverter.pk], 1234.0)
+
+    def test_renamed_product_rewrites_only_its_brand_shard(self):
+        self.export()
+        Product.objects.filter(pk=self.panel.pk).update(name='Панель LONGi 455 Вт')
+
+        result = self.export()
+
+        self.assertIn(self.shard('brand', self.longi), self.written(result))
+        self.assertNotIn(self.shard('brand', self.deye), self.written(result))
+
+    def test_deleted_category_shard_is_removed(self):
+        self.export()
+        filename = self.shard('category', self.panels)
+        self.panels.delete()
+
+        result = self.export()
+
+        self.assertEqual(result['removed'], [filename])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, filename)))
+        self.assertEqual([record['id'] for record in self.read('products.json')['products']], [self.inverter.pk])
+
+
+class LiveFeedTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category()
+        self.brand = make_brand()
+        self.product = make_product(self.category, self.brand, name='Інвертор Deye 6 кВт')
+        self.image = ProductImage.objects.create(product=self.product, image='products/gallery/deye.jpg', order=1)
+        self.url = reverse('mainapp:live_feed', args=['products.json'])
+
+    def etag(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        b''.join(response.streaming_content)
+        return response['ETag']
+
+    def test_unchanged_feed_answers_304(self):
+        etag = self.etag(images='1')
+
+        response = self.client.get(self.url, {'images': '1'}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_conditional_get_does_not_read_gallery_rows(self):
+        etag = self.etag(images='1')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'images': '1'}, HTTP_IF_NONE_MATCH=etag)
+
+        gallery = [query['sql'] for query in queries if 'productimage' in query['sql'].lower()]
+        self.assertEqual(len(gallery), 1)
+        self.assertIn('COUNT(', gallery[0])
+
+    def test_gallery_edit_changes_etag(self):
+        etag = self.etag(images='1')
+
+        self.image.alt_text = 'Інвертор спереду'
+        self.image.save()
+
+        self.assertNotEqual(self.etag(images='1'), etag)
+
+    def test_bulk_upsert_changes_etag(self):
+        writer = BulkProductWriter()
+        writer.write([row(1, 'Інвертор Must 5 кВт', price='30000')])
+        etag = self.etag()
+
+        # Той самий товар, лише нова ціна: кількість і id не змінюються
+        writer.write([row(1, 'Інвертор Must 5 кВт', price='31000')])
+
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_category_rename_changes_etag(self):
+        etag = self.etag()
+
+        self.category.name = 'Гібридні інвертори'
+        self.category.save()
+
+        self.assertNotEqual(self.etag(), etag)
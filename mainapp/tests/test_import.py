@@ -0,0 +1,112 @@
+from decimal import Decimal
+from unittest import mock
+
+from mainapp.importers.bulk import BulkProductWriter, make_import_key
+from mainapp.models import Product, Category, Brand, SimilarProduct
+
+from .utils import CatalogTestCase
+
+
+def row(source_id, name, price='1000', category='Інвертори', brand='Deye'):
+    return {
+        'import_key': make_import_key(source_id),
+        'name': name,
+        'description': f'Опис {name}',
+        'price': Decimal(price),
+        'category': category,
+        'brand': brand,
+        'model': f'M-{source_id}',
+    }
+
+
+class BulkUpsertTests(CatalogTestCase):
+    def test_creates_categories_brands_and_products(self):
+        writer = BulkProductWriter(chunk_size=2)
+        results = writer.write([
+            row(1, 'Інвертор 1'), row(2, 'Інвертор 2'), row(3, 'Панель', category='Панелі', brand='Longi'),
+        ])
+
+        self.assertEqual([result.created for result in results], [True, True, True])
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(set(Category.objects.values_list('name', flat=True)), {'Інвертори', 'Панелі'})
+        self.assertEqual(set(Brand.objects.values_list('name', flat=True)), {'Deye', 'Longi'})
+        self.assertEqual(writer.stats['products_created'], 3)
+
+    def test_repeated_import_updates_in_place(self):
+        BulkProductWriter().write([row(1, 'Інвертор 1', price='1000')])
+        product_id = Product.objects.get().pk
+
+        writer = BulkProductWriter()
+        [result] = writer.write([row(1, 'Інвертор 1', price='1200')])
+
+        self.assertFalse(result.created)
+        product = Product.objects.get()
+        self.assertEqual(product.pk, product_id)
+        self.assertEqual(product.price, Decimal('1200'))
+        self.assertEqual(writer.stats['products_updated'], 1)
+
+    def test_duplicate_keys_in_one_file_keep_last_row(self):
+        BulkProductWriter().write([row(1, 'Перша назва'), row(1, 'Остання назва')])
+
+        self.assertEqual(list(Product.objects.values_list('name', flat=True)), ['Остання назва'])
+
+    def test_legacy_product_adopts_import_key(self):
+        category = Category.objects.create(name='Інвертори')
+        brand = Brand.objects.create(name='Deye')
+        legacy = Product.objects.create(
+            name='Інвертор 1', description='', price=1, category=category, brand=brand, model='M',
+        )
+
+        BulkProductWriter().write([row(1, 'Інвертор 1')])
+
+        self.assertEqual(Product.objects.count(), 1)
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.import_key, make_import_key(1))
+
+
+class SyncTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        BulkProductWriter().write([row(index, f'Інвертор {index}', price=str(1000 + index)) for index in range(1, 6)])
+
+    def test_writes_only_changed_rows_and_deletes_missing(self):
+        rows = [row(index, f'Інвертор {index}', price=str(1000 + index)) for index in range(1, 4)]
+        rows[0]['price'] = Decimal('999')
+
+        writer = BulkProductWriter()
+        result = writer.sync(rows)
+
+        self.assertEqual(len(result.results), 1)
+        self.assertEqual(result.unchanged, 2)
+        self.assertEqual(result.deleted, 2)
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(Product.objects.get(import_key=make_import_key(1)).price, Decimal('999'))
+
+    def test_empty_source_deletes_nothing(self):
+        result = BulkProductWriter().sync([])
+
+        self.assertEqual(result.deleted, 0)
+        self.assertEqual(Product.objects.count(), 5)
+
+    def test_deletions_skip_per_row_signal_handlers(self):
+        kept = [row(1, 'Інвертор 1', price='1001')]
+        with mock.patch('mainapp.signals.bump_version') as signal_bump, \
+                mock.patch('mainapp.signals.rebuild_similar') as signal_rebuild, \
+                mock.patch('mainapp.importers.bulk.bump_version') as writer_bump:
+            result = BulkProductWriter().sync(kept)
+
+        self.assertEqual(result.deleted, 4)
+        signal_bump.assert_not_called()
+        signal_rebuild.assert_not_called()
+        writer_bump.assert_called_once()
+
+    def test_similar_lists_drop_deleted_products(self):
+        survivor = Product.objects.get(import_key=make_import_key(1))
+        self.assertTrue(SimilarProduct.objects.filter(product=survivor).exists())
+
+        BulkProductWriter().sync([row(1, 'Інвертор 1', price='1001'), row(2, 'Інвертор 2', price='1002')])
+
+        self.assertEqual(
+            list(SimilarProduct.objects.filter(product=survivor).values_list('similar__import_key', flat=True)),
+            [make_import_key(2)],
+        )
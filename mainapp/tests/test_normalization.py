@@ -0,0 +1,77 @@
+"""Тести нормалізатора RU→UK (mainapp.normalization)"""
+import re
+
+from django.test import SimpleTestCase
+
+from mainapp.normalization import (
+    Replacer, trie_pattern, translate, translate_terms, replace_russian_letters,
+    has_russian_letters, is_russian_text, is_definitely_russian, is_possibly_russian, find_russian_stems,
+)
+
+
+class TriePatternTests(SimpleTestCase):
+    def test_shared_prefixes_are_factored_out(self):
+        self.assertEqual(trie_pattern(['инвертор', 'инвертора', 'ток']), '(?:инвертор(?:а)?|ток)')
+
+    def test_longest_match_wins(self):
+        regex = re.compile(trie_pattern(['квт', 'квтч']))
+        self.assertEqual(regex.findall('квтч квт'), ['квтч', 'квт'])
+
+
+class TranslateTests(SimpleTestCase):
+    def test_terms_and_letters_in_one_pass(self):
+        self.assertEqual(translate('Гибридный инвертор, объём'), 'Гібридний інвертор, обем')
+
+    def test_case_is_carried_over(self):
+        self.assertEqual(translate('ИНВЕРТОР'), 'ІНВЕРТОР')
+        self.assertEqual(translate('Солнечные панели'), 'Сонячні панелі')
+
+    def test_units_are_inserted_as_is(self):
+        self.assertEqual(translate('Мощность 6квт'), 'Потужність 6кВт')
+        self.assertEqual(translate('КВТ'), 'кВт')
+
+    def test_only_whole_words_are_translated(self):
+        self.assertEqual(translate_terms('Инверторный блок'), 'Инверторный блок')
+
+    def test_translate_terms_keeps_russian_letters(self):
+        self.assertEqual(translate_terms('Это устройство'), 'Это пристрій')
+        self.assertEqual(replace_russian_letters('Это'), 'Ето')
+
+    def test_empty_text(self):
+        self.assertEqual(translate(None), '')
+        self.assertEqual(translate_terms(''), '')
+
+    def test_matches_naive_replacement(self):
+        mapping = {'панели': 'панелі', 'батареи': 'батареї'}
+        replacer = Replacer(mapping, ignore_case=True, whole_words=True)
+        text = 'панели и батареи, Панели'
+        naive = text
+        for source, target in mapping.items():
+            naive = re.sub(rf'\b{source}\b', target, naive)
+            naive = re.sub(rf'\b{source.capitalize()}\b', target.capitalize(), naive)
+        self.assertEqual(replacer(text), naive)
+
+
+class DetectionTests(SimpleTestCase):
+    def test_russian_letters(self):
+        self.assertTrue(has_russian_letters('объём'))
+        self.assertFalse(has_russian_letters('Гібридний інвертор'))
+
+    def test_russian_text(self):
+        self.assertTrue(is_russian_text('Гибридный инвертор'))
+        self.assertFalse(is_russian_text('Гібридний інвертор Deye 6 кВт'))
+
+    def test_definitely_russian_constructions(self):
+        self.assertTrue(is_definitely_russian('для того чтобы'))
+        self.assertFalse(is_definitely_russian('для того, щоб'))
+
+    def test_possibly_russian_threshold(self):
+        self.assertFalse(is_possibly_russian('до від при'))
+        self.assertTrue(is_possibly_russian('как или его при без'))
+
+    def test_russian_stems(self):
+        self.assertEqual(
+            find_russian_stems('Гибридный инвертор и аккумуляторы'),
+            ['Гибридный', 'инвертор', 'аккумуляторы'],
+        )
+        self.assertEqual(find_russian_stems(''), [])
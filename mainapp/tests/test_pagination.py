@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from mainapp.facets import get_facet_index
+from mainapp.models import Product
+from mainapp.pagination import KeysetPaginator, decode_cursor, encode_cursor
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class KeysetPaginatorTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category()
+        brand = make_brand()
+        for index in range(7):
+            make_product(category, brand, name=f'Інвертор {index}', featured=index in (2, 5))
+        self.factory = RequestFactory()
+        self.expected = list(Product.objects.order_by('-featured', 'name', 'id').values_list('name', flat=True))
+
+    def walk(self, **params):
+        """Усі сторінки вперед за курсорами next_url"""
+        pages = []
+        query = params
+        while True:
+            page = KeysetPaginator(Product.objects.all(), 3).get_page(self.factory.get('/', query))
+            pages.append([product.name for product in page])
+            if not page.has_next:
+                return pages
+            query = dict(params, after=page.next_cursor)
+
+    def test_pages_cover_ordering_without_gaps(self):
+        pages = self.walk()
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        first = KeysetPaginator(Product.objects.all(), 3).get_page(self.factory.get('/'))
+        second = KeysetPaginator(Product.objects.all(), 3).get_page(self.factory.get('/', {'after': first.next_cursor}))
+        back = KeysetPaginator(Product.objects.all(), 3).get_page(self.factory.get('/', {'before': second.previous_cursor}))
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous)
+
+    def test_broken_cursor_falls_back_to_first_page(self):
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        page = KeysetPaginator(Product.objects.all(), 3).get_page(self.factory.get('/', {'after': '!!!'}))
+        self.assertEqual([product.name for product in page], self.expected[:3])
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor([1, 'Назва', 5])), [1, 'Назва', 5])
+
+
+class CategoryCountTests(CatalogTestCase):
+    def test_count_comes_from_facet_index(self):
+        category = make_category(name='Інвертори')
+        deye, must = make_brand('Deye'), make_brand('Must')
+        for _ in range(3):
+            make_product(category, deye)
+        make_product(category, must)
+        make_product(category, must, in_stock=False)
+        get_facet_index()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/catalog/inverters/')
+        self.assertEqual(response.context['products_count'], 4)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+
+        response = self.client.get('/catalog/inverters/', {'brand': 'must'})
+        self.assertEqual(response.context['products_count'], 1)
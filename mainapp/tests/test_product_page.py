@@ -0,0 +1,78 @@
+"""Тести сторінки товару та бюджету запитів (mainapp.loaders, mainapp.budget)"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mainapp.budget import QueryBudget, QueryBudgetExceeded
+from mainapp.loaders import PRODUCT_PAGE_QUERIES
+from mainapp.models import Category, ProductImage
+from mainapp.recommendations import rebuild_similar
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class ProductPageQueriesTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category()
+        brand = make_brand()
+        self.small = make_product(category, brand, name='Інвертор Deye 5 кВт')
+        self.large = make_product(category, brand, name='Інвертор Deye 12 кВт')
+        for _ in range(3):
+            make_product(category, brand)
+        for product, size in ((self.small, 1), (self.large, 8)):
+            for order in range(size):
+                ProductImage.objects.create(product=product, image=f'products/gallery/{product.pk}-{order}.jpg', order=order)
+        rebuild_similar()
+
+    def render(self, product):
+        """(відповідь, кількість SQL-запитів) сторінки товару при холодному кеші"""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('mainapp:product_detail', args=[product.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_depend_on_gallery_size(self):
+        small_response, small_queries = self.render(self.small)
+        large_response, large_queries = self.render(self.large)
+
+        self.assertEqual(len(small_response.context['product_images']), 1)
+        self.assertEqual(len(large_response.context['product_images']), 8)
+        self.assertEqual(small_queries, PRODUCT_PAGE_QUERIES)
+        self.assertEqual(large_queries, PRODUCT_PAGE_QUERIES)
+
+    def test_gallery_is_ordered_and_similar_products_present(self):
+        response, _ = self.render(self.large)
+
+        self.assertEqual([image.order for image in response.context['product_images']], list(range(8)))
+        self.assertEqual(len(response.context['similar_products']), 4)
+        self.assertEqual(response.context['breadcrumbs'][-1][0], self.large.category.name)
+
+    def test_cached_page_makes_no_queries(self):
+        self.render(self.small)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('mainapp:product_detail', args=[self.small.pk]))
+        self.assertEqual(len(queries), 0)
+
+
+class QueryBudgetTests(CatalogTestCase):
+    def spend(self, queries, limit):
+        with QueryBudget(limit, 'тест'):
+            for _ in range(queries):
+                Category.objects.count()
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_mode_raises(self):
+        self.spend(2, 2)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.spend(3, 2)
+
+    @override_settings(DEBUG=True)
+    def test_debug_alone_only_logs(self):
+        with self.assertLogs('mainapp.budget', 'WARNING') as logs:
+            self.spend(3, 2)
+        self.assertIn('3 SQL-запитів при бюджеті 2', logs.output[0])
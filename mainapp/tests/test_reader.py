@@ -0,0 +1,72 @@
+"""Тести потокового читання таблиць імпорту (mainapp.importers.reader)"""
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+
+from mainapp.importers.reader import PRODUCTS_SHEET, number, identifier, read_groups, read_products
+
+
+HEADER = [
+    'Код_товару', 'Назва_позиції', 'Назва_позиції_укр', 'Ціна', 'Виробник', 'Унікальний_ідентифікатор',
+    'Назва_Характеристики', 'Одиниця_виміру_Характеристики', 'Значення_Характеристики',
+    'Назва_Характеристики', 'Одиниця_виміру_Характеристики', 'Значення_Характеристики',
+]
+
+
+class ReaderTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def xlsx(self, rows):
+        workbook = Workbook()
+        workbook.active.title = 'Інший аркуш'
+        sheet = workbook.create_sheet(PRODUCTS_SHEET)
+        for row in rows:
+            sheet.append(row)
+        path = os.path.join(self.directory, 'products.xlsx')
+        workbook.save(path)
+        return path
+
+    def test_xlsx_rows_are_typed(self):
+        path = self.xlsx([
+            HEADER,
+            ['SUN-5K', 'Инвертор', 'Інвертор', 14900.5, 'Deye', 2357036642.0, 'Потужність', 'кВт', 5, 'Фази', None, '1'],
+            [None] * len(HEADER),
+            ['LR5', 'Панель', None, '5 200,00 грн', ' LONGi ', 7, None, None, None],
+        ])
+
+        rows = list(read_products(path))
+
+        self.assertEqual([row.line for row in rows], [2, 4])
+        first, second = rows
+        self.assertEqual((first.source_id, first.price, first.name_uk), ('2357036642', Decimal('14900.5'), 'Інвертор'))
+        self.assertEqual(first.characteristics[0], ('Потужність', 'кВт', '5'))
+        self.assertEqual(first.characteristics[1], ('Фази', None, '1'))
+        self.assertIsNone(first.description_uk)
+        self.assertEqual((second.price, second.brand, second.name_uk), (Decimal('5200.00'), 'LONGi', None))
+        self.assertEqual(second.characteristics[1], (None, None, None))
+
+    def test_csv_delimiter_is_taken_from_header(self):
+        path = os.path.join(self.directory, 'groups.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('Ідентифікатор_групи;Назва_групи;Назва_групи_укр\n')
+            f.write('12;Инверторы, гибридные;Інвертори\n')
+
+        [row] = list(read_groups(path))
+
+        self.assertEqual((row.group_id, row.name_ru, row.name_uk), ('12', 'Инверторы, гибридные', 'Інвертори'))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            read_products(os.path.join(self.directory, 'missing.xlsx'))
+
+    def test_converters(self):
+        self.assertIsNone(number('ціна договірна'))
+        self.assertIsNone(number(True))
+        self.assertEqual(identifier(12.0), '12')
+        self.assertIsNone(identifier('nan'))
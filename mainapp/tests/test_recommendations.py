@@ -0,0 +1,115 @@
+"""Тести схожих товарів (mainapp.recommendations)"""
+from decimal import Decimal
+from unittest import mock
+
+from mainapp import recommendations
+from mainapp.models import Product, SimilarProduct
+from mainapp.recommendations import parse_power, rebuild_similar
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+def stored_lists():
+    lists = {}
+    for product_id, similar_id in SimilarProduct.objects.order_by('product_id', 'rank').values_list('product_id', 'similar_id'):
+        lists.setdefault(product_id, []).append(similar_id)
+    return lists
+
+
+class ParsePowerTests(CatalogTestCase):
+    def test_units(self):
+        self.assertEqual(parse_power('6 кВт'), 6.0)
+        self.assertEqual(parse_power('', 'Панель 420Вт'), 0.42)
+        self.assertEqual(parse_power('5 kWt'), 5.0)
+        self.assertIsNone(parse_power('Кабель 4 мм²'))
+
+
+class SimilarProductsTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.inverters = make_category('Інвертори')
+        self.batteries = make_category('Акумулятори')
+        self.deye = make_brand('Deye')
+        self.must = make_brand('Must')
+        self.products = []
+        for number in range(12):
+            category = self.inverters if number % 3 else self.batteries
+            brand = self.deye if number % 2 else self.must
+            self.products.append(make_product(
+                category, brand, name=f'Товар {number}', power=f'{3 + number % 5} кВт',
+                price=Decimal(20000 + 1700 * number), featured=number % 5 == 0,
+            ))
+        rebuild_similar()
+
+    def assert_matches_full_rebuild(self):
+        incremental = stored_lists()
+        rebuild_similar()
+        self.assertEqual(incremental, stored_lists())
+
+    def test_list_ranks_same_category_and_brand_first(self):
+        product = self.products[1]
+        similar = Product.objects.filter(similar_to__product=product).order_by('similar_to__rank')
+
+        self.assertEqual(len(similar), recommendations.SIMILAR_LIMIT)
+        self.assertEqual((similar[0].category, similar[0].brand), (self.inverters, self.deye))
+        self.assertNotIn(product, similar)
+
+    def test_price_change_matches_full_rebuild(self):
+        product = self.products[4]
+        product.price = Decimal('41000')
+        product.save()
+        self.assert_matches_full_rebuild()
+
+    def test_category_and_brand_change_matches_full_rebuild(self):
+        product = self.products[7]
+        product.category = self.batteries
+        product.brand = self.must
+        product.save()
+        self.assert_matches_full_rebuild()
+
+    def test_out_of_stock_and_back_matches_full_rebuild(self):
+        product = self.products[5]
+        product.in_stock = False
+        product.save()
+        self.assertFalse(SimilarProduct.objects.filter(similar=product).exists())
+        self.assert_matches_full_rebuild()
+
+        product.in_stock = True
+        product.save()
+        self.assert_matches_full_rebuild()
+
+    def test_new_featured_product_matches_full_rebuild(self):
+        make_product(self.inverters, self.deye, name='Новий 6 кВт', power='6 кВт', price=Decimal('27000'), featured=True)
+        self.assert_matches_full_rebuild()
+
+    def test_deleted_product_is_replaced(self):
+        self.products[2].delete()
+        self.assert_matches_full_rebuild()
+
+    def test_only_own_and_referencing_lists_are_rebuilt(self):
+        product = self.products[4]
+        referencing = set(SimilarProduct.objects.filter(similar=product).values_list('product_id', flat=True))
+
+        with mock.patch('mainapp.recommendations.rebuild_similar', wraps=rebuild_similar) as rebuild:
+            product.price = Decimal('30000')
+            product.save()
+
+        rebuild.assert_called_once_with({product.pk} | referencing)
+
+    def test_save_without_scoring_fields_skips_update(self):
+        product = self.products[3]
+        with mock.patch('mainapp.signals.update_similar') as update:
+            product.description = 'Новий опис'
+            product.save(update_fields=['description'])
+            update.assert_not_called()
+
+            product.save(update_fields=['price'])
+            update.assert_called_once_with([product.pk])
+
+    def test_large_batches_fall_back_to_full_recalculation(self):
+        with mock.patch('mainapp.recommendations.INCREMENTAL_LIMIT', 2), \
+                mock.patch('mainapp.recommendations.insert_into_neighbours') as insert:
+            Product.objects.filter(pk__in=[product.pk for product in self.products[:3]]).update(price=Decimal('25000'))
+            recommendations.update_similar([product.pk for product in self.products[:3]])
+        insert.assert_not_called()
+        self.assert_matches_full_rebuild()
@@ -0,0 +1,130 @@
+"""Тести підсумку та сторінок відгуків (mainapp.reviews)"""
+from datetime import timedelta
+
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from mainapp.models import Review, ReviewStats
+from mainapp.pagination import ReviewPaginator
+from mainapp.reviews import get_review_stats, get_reviews_page, recalculate_review_stats
+
+from .utils import CatalogTestCase
+
+
+def make_review(rating, is_published=True, minutes_ago=0, **kwargs):
+    return Review.objects.create(
+        client_name='Олена', review_text='Все чудово працює', rating=rating, is_published=is_published,
+        created_at=timezone.now() - timedelta(minutes=minutes_ago), **kwargs,
+    )
+
+
+class ReviewStatsTests(CatalogTestCase):
+    def assert_matches_recalculation(self):
+        stats = ReviewStats.objects.get()
+        fresh = recalculate_review_stats()
+        self.assertEqual((stats.count, stats.rating_sum, stats.histogram), (fresh.count, fresh.rating_sum, fresh.histogram))
+
+    def test_signals_keep_stats_in_sync(self):
+        five = make_review(5)
+        make_review(4)
+        hidden = make_review(1, is_published=False)
+
+        stats = ReviewStats.objects.get()
+        self.assertEqual((stats.count, stats.rating_sum), (2, 9))
+        self.assertEqual(stats.average, 4.5)
+
+        five.rating = 3
+        five.save()
+        hidden.is_published = True
+        hidden.save()
+        stats = ReviewStats.objects.get()
+        self.assertEqual((stats.count, stats.rating_sum, stats.rating_5, stats.rating_1), (3, 8, 0, 1))
+        self.assert_matches_recalculation()
+
+        five.delete()
+        hidden.is_published = False
+        hidden.save()
+        self.assertEqual(ReviewStats.objects.get().count, 1)
+        self.assert_matches_recalculation()
+
+    def test_bulk_update_needs_recalculation(self):
+        make_review(5)
+        make_review(2)
+
+        Review.objects.update(is_published=False)
+        stats = recalculate_review_stats()
+
+        self.assertEqual((stats.count, stats.average), (0, 0))
+        self.assertEqual(stats.histogram, [(5, 0), (4, 0), (3, 0), (2, 0), (1, 0)])
+
+    def test_cached_stats_are_invalidated_by_new_review(self):
+        make_review(5)
+        self.assertEqual(get_review_stats().count, 1)
+        with CaptureQueriesContext(connection) as queries:
+            get_review_stats()
+        self.assertEqual(len(queries), 0)
+
+        make_review(3)
+        self.assertEqual(get_review_stats().count, 2)
+
+
+class ReviewPagesTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        now = timezone.now()
+        # Два відгуки з однаковим часом — порядок між ними задає id
+        for index in range(7):
+            Review.objects.create(
+                client_name=f'Клієнт {index}', review_text='Відгук', rating=5,
+                created_at=now - timedelta(hours=index // 2),
+            )
+        make_review(4, is_published=False, minutes_ago=-60)
+        self.expected = list(
+            Review.objects.filter(is_published=True).order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def page(self, **params):
+        return ReviewPaginator(Review.objects.filter(is_published=True), 3).get_page(self.factory.get('/', params))
+
+    def test_pages_follow_newest_first_without_gaps(self):
+        pages, params = [], {}
+        while True:
+            page = self.page(**params)
+            pages.append([review.pk for review in page])
+            if not page.has_next:
+                break
+            params = {'after': page.next_cursor}
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_cursor(self):
+        first = self.page()
+        second = self.page(after=first.next_cursor)
+        back = self.page(before=second.previous_cursor)
+
+        self.assertEqual([review.pk for review in back], [review.pk for review in first])
+
+    def test_broken_cursor_falls_back_to_first_page(self):
+        self.assertEqual([review.pk for review in self.page(after='не-курсор')], self.expected[:3])
+
+    def test_first_page_is_cached_until_reviews_change(self):
+        get_reviews_page(self.factory.get('/'))
+        with CaptureQueriesContext(connection) as queries:
+            page = get_reviews_page(self.factory.get('/'))
+        self.assertEqual(len(queries), 0)
+
+        newest = make_review(5, minutes_ago=-5)
+        self.assertEqual(get_reviews_page(self.factory.get('/')).object_list[0], newest)
+        self.assertNotEqual(page.object_list[0], newest)
+
+    def test_reviews_view(self):
+        response = self.client.get(reverse('mainapp:reviews'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Клієнт 0')
+        self.assertNotContains(response, 'Олена')
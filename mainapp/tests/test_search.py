@@ -0,0 +1,113 @@
+"""Тести пошуку товарів (mainapp.search)"""
+from django.urls import reverse
+
+from mainapp.models import Product
+from mainapp.search.index import get_search_index, search_products
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+class SearchRankingTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        inverters = make_category('Інвертори')
+        panels = make_category('Сонячні панелі')
+        deye = make_brand('Deye')
+        longi = make_brand('LONGi')
+        self.hybrid = make_product(
+            inverters, deye, name='Гібридний інвертор Deye 5 кВт', model='SUN-5K-SG03LP1-EU',
+            description='Трифазний інвертор для резервного живлення',
+        )
+        self.network = make_product(
+            inverters, deye, name='Мережевий інвертор Deye 10 кВт', model='SUN-10K-G',
+            description='Мережевий інвертор',
+        )
+        self.panel = make_product(
+            panels, longi, name='Сонячна панель LONGi 450 Вт', model='LR5-72HPH',
+            description='Панель, сумісна з гібридним інвертором',
+        )
+
+    def search(self, query):
+        return get_search_index().search(query)
+
+    def test_name_match_ranks_above_description(self):
+        self.assertEqual(self.search('гібридний'), [self.hybrid.pk, self.panel.pk])
+
+    def test_all_words_before_any_word(self):
+        self.assertEqual(self.search('інвертор 10'), [self.network.pk])
+        # Жоден товар не містить обох слів — знаходяться товари з будь-яким
+        self.assertEqual(set(self.search('LONGi мережевий')), {self.network.pk, self.panel.pk})
+
+    def test_model_without_hyphens_and_with_cyrillic_letters(self):
+        self.assertEqual(self.search('sun5ksg03')[0], self.hybrid.pk)
+        # "К" у запиті кирилична
+        self.assertEqual(self.search('SUN-10К')[0], self.network.pk)
+
+    def test_russian_and_transliterated_queries(self):
+        self.assertIn(self.hybrid.pk, self.search('гибридный инвертор'))
+        self.assertEqual(self.search('panel')[0], self.panel.pk)
+
+    def test_prefix_match(self):
+        self.assertEqual(set(self.search('інверт')), {self.hybrid.pk, self.network.pk, self.panel.pk})
+
+    def test_featured_breaks_ties(self):
+        self.network.featured = True
+        self.network.save()
+
+        self.assertEqual(self.search('deye'), [self.network.pk, self.hybrid.pk])
+
+    def test_page_is_fetched_in_relevance_order(self):
+        total, products = search_products('інвертор', offset=1, limit=1)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(products, [Product.objects.get(pk=self.search('інвертор')[1])])
+
+
+class SearchInvalidationTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('Обладнання')
+        self.brand = make_brand()
+        self.product = make_product(self.category, self.brand, name='Інвертор Deye 5 кВт')
+
+    def test_saved_product_is_found_without_restart(self):
+        get_search_index()
+
+        self.product.name = 'Акумулятор Deye 5 кВт·год'
+        self.product.save()
+
+        self.assertEqual(get_search_index().search('акумулятор'), [self.product.pk])
+        self.assertEqual(get_search_index().search('інвертор'), [])
+
+    def test_out_of_stock_and_deleted_products_disappear(self):
+        other = make_product(self.category, self.brand, name='Інвертор Must 3 кВт')
+        get_search_index()
+
+        other.in_stock = False
+        other.save()
+        self.assertEqual(get_search_index().search('інвертор'), [self.product.pk])
+
+        self.product.delete()
+        self.assertEqual(get_search_index().search('інвертор'), [])
+
+    def test_brand_rename_is_indexed(self):
+        get_search_index()
+
+        self.brand.name = 'Sofar'
+        self.brand.save()
+
+        self.assertEqual(get_search_index().search('sofar'), [self.product.pk])
+
+    def test_index_is_reused_between_changes(self):
+        self.assertIs(get_search_index(), get_search_index())
+
+
+class SearchAPITests(CatalogTestCase):
+    def test_results_and_missing_query(self):
+        product = make_product(make_category(), make_brand(), name='Інвертор Deye 5 кВт')
+        url = reverse('mainapp:search_api')
+
+        data = self.client.get(url, {'q': 'інвертори deye'}).json()
+        self.assertEqual(data['total'], 1)
+        self.assertEqual(data['results'][0]['id'], product.pk)
+        self.assertEqual(self.client.get(url).status_code, 400)
@@ -0,0 +1,94 @@
+"""Тести підказок пошуку (mainapp.search.suggest)"""
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from mainapp.search import suggest
+from mainapp.search.suggest import MAX_KEY_LENGTH, MAX_LIMIT, SuggestIndex, compact, word_keys
+
+from .utils import CatalogTestCase, make_brand, make_category, make_product
+
+
+def catalog(size):
+    """Рядки values_list для SuggestIndex: багато схожих інверторів і панелей"""
+    rows = []
+    for number in range(size):
+        brand = ('Deye', 'deye') if number % 3 else ('LONGi', 'longi')
+        rows.append((
+            number + 1, f'Інвертор {brand[0]} {number} кВт', f'SUN-{number}K-SG0{number % 5}',
+            brand[0], brand[1], number % 97 == 0,
+        ))
+    return rows
+
+
+def brute_force(index, query, limit):
+    """Ранжування всіх ключів з префіксом без обмежень (еталон)"""
+    prefixes = {compact(query)[:MAX_KEY_LENGTH]}
+    if suggest._cyrillic.search(next(iter(prefixes))):
+        prefix = next(iter(prefixes))
+        prefixes |= {
+            prefix.translate(suggest.HOMOGLYPHS), suggest.transliterate(prefix),
+            suggest.transliterate(prefix.replace('г', 'ґ')),
+        }
+    found = {}
+    for key, (position, entry) in zip(index.keys, index.entries):
+        if any(key.startswith(prefix) for prefix in prefixes) and position < found.get(entry, MAX_KEY_LENGTH):
+            found[entry] = position
+    best = sorted(found, key=lambda entry: index.rank(entry, found[entry]))[:limit]
+    return [index.suggestions[entry][1] for entry in best]
+
+
+class SuggestIndexTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = SuggestIndex(catalog(1500))
+
+    def texts(self, query, limit=MAX_LIMIT):
+        return [suggestion['text'] for suggestion in self.index.suggest(query, limit)]
+
+    def test_short_prefixes_rank_the_whole_range(self):
+        for query in ('і', 'ін', 'інв', 'інвертор', 's', 'sun', 'sun1', 'de', 'deye', 'deye1', '1', '12k', 'lon'):
+            with self.subTest(query=query):
+                self.assertEqual(self.texts(query), brute_force(self.index, query, MAX_LIMIT))
+
+    def test_featured_product_beyond_the_scan_window(self):
+        # "sun97k..." лежить далеко за першими MAX_SCAN ключами діапазону "sun"
+        self.assertGreater(self.index.keys.index(compact('sun97ksg02')) - self.index.keys.index(compact('sun0ksg00')), 1000)
+        self.assertEqual(self.texts('sun', 1), ['Інвертор Deye 97 кВт'])
+
+    def test_large_ranges_are_precomputed(self):
+        self.assertIn('sun', self.index.top)
+        self.assertNotIn('sun1164', self.index.top)
+        self.assertLessEqual(max(len(best) for best in self.index.top.values()), MAX_LIMIT)
+
+    def test_brands_first_and_cyrillic_variants(self):
+        self.assertEqual(self.texts('деye', 2), ['Deye', 'Інвертор Deye 97 кВт'])
+        self.assertEqual(self.texts('лонгі', 1), ['LONGi'])
+
+    def test_model_code_without_separators(self):
+        self.assertEqual(self.texts('sun12k', 1), ['Інвертор LONGi 12 кВт'])
+        self.assertEqual(self.texts('SUN-12К', 1), ['Інвертор LONGi 12 кВт'])
+
+    def test_limit_and_empty_query(self):
+        self.assertEqual(len(self.texts('і', 5)), 5)
+        self.assertEqual(len(self.texts('і', 100)), MAX_LIMIT)
+        self.assertEqual(self.texts('--'), [])
+
+    def test_word_keys(self):
+        self.assertEqual(
+            list(word_keys('Deye SUN-12K')), [(0, 'deyesun12k'), (1, 'sun12k'), (2, '12k')],
+        )
+
+
+class SuggestAPITests(CatalogTestCase):
+    def test_suggestions_follow_catalog_changes(self):
+        product = make_product(make_category(), make_brand('Must'), name='Інвертор Must PV18', model='PV18-5248')
+        url = reverse('mainapp:suggest_api')
+
+        data = self.client.get(url, {'q': 'pv18'}).json()
+        self.assertEqual([item['text'] for item in data['suggestions']], ['Інвертор Must PV18'])
+
+        product.name = 'Інвертор Must PV19'
+        product.model = 'PV19-5248'
+        product.save()
+        self.assertEqual(self.client.get(url, {'q': 'pv18'}).json()['suggestions'], [])
@@ -0,0 +1,40 @@
+"""Спільні фабрики та базовий клас для тестів mainapp"""
+from decimal import Decimal
+from itertools import count
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from mainapp.models import Product, Category, Brand
+
+
+_sequence = count(1)
+
+
+def make_category(name='Інвертори', **kwargs):
+    return Category.objects.create(name=name, **kwargs)
+
+
+def make_brand(name='Deye', **kwargs):
+    return Brand.objects.create(name=name, **kwargs)
+
+
+def make_product(category, brand, **kwargs):
+    number = next(_sequence)
+    fields = {
+        'name': f'Товар {number}',
+        'description': 'Опис товару',
+        'price': Decimal('1000'),
+        'model': f'M-{number}',
+    }
+    fields.update(kwargs)
+    return Product.objects.create(category=category, brand=brand, **fields)
+
+
+@override_settings(IMAGE_DERIVATIVES_ON_SAVE=False)
+class CatalogTestCase(TestCase):
+    """Порожній кеш на кожен тест: версії кешу живуть у locmem між тестами"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
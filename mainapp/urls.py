@@ -10,13 +10,19 @@ urlpatterns = [
     path('catalog/<str:category>/', views.CategoryView.as_view(), name='category'),
     path('product/<int:product_id>/', views.ProductDetailView.as_view(), name='product_detail'),
     path('reviews/', views.ReviewsView.as_view(), name='reviews'),
+    path('search/', views.SearchView.as_view(), name='search'),
     path('contact/', views.ContactView.as_view(), name='contact'),
     path('shipping-policy/', views.ShippingPolicyView.as_view(), name='shipping_policy'),
     path('return-policy/', views.ReturnPolicyView.as_view(), name='return_policy'),
     path('privacy-policy/', views.PrivacyPolicyView.as_view(), name='privacy_policy'),
     path('sitemap.xml', views.sitemap_xml, name='sitemap'),
+    path('sitemap-<slug:section>.xml', views.sitemap_section, name='sitemap_section'),
     path('robots.txt', views.robots_txt, name='robots'),
+    path('feed/<str:filename>', views.feed_file, name='feed_file'),
+    path('feeds/<str:name>', views.live_feed, name='live_feed'),
     # API endpoints
     path('api/callback/', views.CallbackAPIView.as_view(), name='callback_api'),
     path('api/orders/', views.OrderAPIView.as_view(), name='order_api'),
+    path('api/search/', views.SearchAPIView.as_view(), name='search_api'),
+    path('api/suggest/', views.SuggestAPIView.as_view(), name='suggest_api'),
 ] 
\ No newline at end of file
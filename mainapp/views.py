@@ -1,21 +1,49 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.views.generic import TemplateView, View
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, FileResponse, Http404, StreamingHttpResponse
 from django.contrib import messages
-from .models import Product, Portfolio, Review, ProductImage, Category, Brand
+from .models import Product, Portfolio, ProductImage
 from .forms import ReviewForm
-from django.db.models import Q, Avg
+from .pagination import KeysetPaginator, DEFAULT_PAGE_SIZE, clamp_page_size
+from .cache import CachedContextMixin, versioned_cache_page
+from .facets import get_facet_index
+from .resolvers import get_catalog_lookup, CATEGORY_URL_NAMES
+from .queries import top_n_per_group
+from .images import resolve_image_urls
+from .feeds.manifest import get_shard
+from .feeds import live
+from . import sitemaps
+from .loaders import load_product_page
+from .reviews import get_review_stats, get_reviews_page
+from .search.index import search_products
+from .search.suggest import get_suggest_index, DEFAULT_LIMIT as SUGGEST_LIMIT, MAX_LIMIT as SUGGEST_MAX_LIMIT
+from .feeds.merchant import merchant_lines
+from .feeds.writers import buffered
 from django.db import models
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.views.decorators.gzip import gzip_page
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.core.mail import send_mail
 from django.conf import settings
 import json
+import os
+from functools import partial
 from datetime import datetime
 
 
-class IndexView(TemplateView):
+class IndexView(CachedContextMixin, TemplateView):
     template_name = 'mainapp/index.html'
+    cache_namespace = 'index'
+    
+    def build_cached_context(self, **kwargs):
+        return {
+            'featured_products': resolve_image_urls(
+                Product.objects.filter(featured=True, in_stock=True).select_related('category', 'brand').prefetch_related('images')[:4]
+            ),  # Рекомендовані товари
+        }
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -118,7 +146,7 @@ class IndexView(TemplateView):
         
         # Додаю товари до контексту з оптимізацією запитів
         context['products'] = Product.objects.filter(in_stock=True).select_related('category', 'brand').prefetch_related('images').order_by('-featured', 'name')  # Всі товари в наявності (рекомендовані першими)
-        context['featured_products'] = Product.objects.filter(featured=True, in_stock=True).select_related('category', 'brand').prefetch_related('images')[:4]  # Рекомендовані товари
+        context.update(self.get_cached_context(**kwargs))
         
         return context
 
@@ -245,12 +273,11 @@ class PortfolioView(TemplateView):
         return context
 
 
-class CatalogView(TemplateView):
+class CatalogView(CachedContextMixin, TemplateView):
     template_name = 'mainapp/catalog.html'
+    cache_namespace = 'catalog'
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        
+    def build_cached_context(self, **kwargs):
         # Отримуємо параметри фільтрації
         category = self.request.GET.get('category')
         brand = self.request.GET.get('brand')
@@ -260,149 +287,238 @@ class CatalogView(TemplateView):
         # Базовий запит з оптимізацією
         products = Product.objects.filter(in_stock=True).select_related('category', 'brand').prefetch_related('images')
         
-        # Фільтрація
+        # Фільтрація по індексованих FK (назви/slug перетворюються на id резолвером)
+        lookup = get_catalog_lookup()
         if category:
-            products = products.filter(category__name__icontains=category)
+            products = products.filter(category_id__in=lookup.category_ids(category))
         if brand:
-            products = products.filter(brand__name__icontains=brand)
+            products = products.filter(brand_id__in=lookup.brand_ids(brand))
         if price_min:
             products = products.filter(price__gte=price_min)
         if price_max:
             products = products.filter(price__lte=price_max)
         
-        # Унікальні категорії та бренди для фільтрів - лише ті що мають товари в наявності
-        categories = Category.objects.filter(
-            product__in_stock=True,
-            is_active=True
-        ).values_list('name', flat=True).distinct().order_by('name')
-        
-        brands = Brand.objects.filter(
-            product__in_stock=True,
-            is_active=True
-        ).values_list('name', flat=True).distinct().order_by('name')
+        # Категорії та бренди для фільтрів з лічильниками - з індексу фасетів
+        facets = get_facet_index()
         
-        # Товари по категоріях для каруселей (правильні назви наших категорій)
-        inverters = products.filter(
-            category__name='Інвертори'
-        ).order_by('-featured', 'name')[:10]
-        
-        solar_panels = products.filter(
-            category__name='Сонячні панелі'
-        ).order_by('-featured', 'name')[:10]
-        
-        batteries = products.filter(
-            category__name='Акумуляторні батареї'
-        ).order_by('-featured', 'name')[:10]
-        
-        backup_kits = products.filter(
-            category__name='Комплекти резервного живлення'
-        ).order_by('-featured', 'name')[:10]
-        
-        context.update({
-            'title': 'Каталог товарів — GreenSolarTech',
-            'description': 'Повний каталог обладнання для сонячних електростанцій: інвертори, панелі, акумулятори, комплекти.',
-            'keywords': 'каталог сонячного обладнання, інвертори, сонячні панелі, акумулятори',
-            'products': products.order_by('-featured', 'name'),  # Всі товари для загального каталогу
-            'categories': categories,
-            'brands': brands,
+        # Товари по категоріях для каруселей: один віконний запит + один prefetch зображень
+        carousel_ids = {
+            key: lookup.category_index.get(CATEGORY_URL_NAMES[key].lower())
+            for key in ('inverters', 'solar-panels', 'batteries', 'backup-power')
+        }
+        carousels = top_n_per_group(products, 'category_id', carousel_ids.values(), 10)
+        
+        # Поточна сторінка загального списку (keyset пагінація)
+        page = KeysetPaginator(
+            products,
+            self.request.GET.get('per_page', DEFAULT_PAGE_SIZE)
+        ).get_page(self.request)
+        
+        # URL зображень для всієї сторінки та каруселей за один прохід
+        resolve_image_urls(page.object_list)
+        for group in carousels.values():
+            resolve_image_urls(group)
+        
+        return {
+            'products': page.object_list,  # Поточна сторінка загального каталогу
+            'page': page,
+            'categories': facets.categories,
+            'brands': facets.brands,
+            'price_buckets': facets.price_buckets,
             'selected_category': category,
             'selected_brand': brand,
             'price_min': price_min,
             'price_max': price_max,
-            'inverters': inverters,
-            'solar_panels': solar_panels,
-            'batteries': batteries,
-            'backup_kits': backup_kits,
+            'inverters': carousels.get(carousel_ids['inverters'], []),
+            'solar_panels': carousels.get(carousel_ids['solar-panels'], []),
+            'batteries': carousels.get(carousel_ids['batteries'], []),
+            'backup_kits': carousels.get(carousel_ids['backup-power'], []),
+        }
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'title': 'Каталог товарів — GreenSolarTech',
+            'description': 'Повний каталог обладнання для сонячних електростанцій: інвертори, панелі, акумулятори, комплекти.',
+            'keywords': 'каталог сонячного обладнання, інвертори, сонячні панелі, акумулятори',
         })
+        context.update(self.get_cached_context(**kwargs))
         return context
 
 
-class CategoryView(TemplateView):
+class CategoryView(CachedContextMixin, TemplateView):
     template_name = 'mainapp/category.html'
+    cache_namespace = 'category'
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    def build_cached_context(self, **kwargs):
         category_key = kwargs.get('category')
         
-        # Маппінг англійських ключів URL на фільтри категорій (підтримка українських та російських назв)
-        category_mapping = {
-            'inverters': ['Інвертор', 'Инвертор'],
-            'solar-panels': ['панел', 'панел'], 
-            'batteries': ['Акумулятор', 'Аккумулятор'],
-            'backup-power': ['Комплекти резервного живлення', 'комплект', 'комплек']
-        }
-        
-        # Отримуємо ключові слова для категорії
-        category_keywords = category_mapping.get(category_key, [category_key])
+        # Категорії, що відповідають ключу URL (id з кешованого резолвера)
+        lookup = get_catalog_lookup()
+        category_ids = lookup.category_ids_for_key(category_key)
         
         # Отримуємо параметри фільтрації
         brand = self.request.GET.get('brand')
         min_price = self.request.GET.get('min_price')
         max_price = self.request.GET.get('max_price')
         
-        # Базовий запит для категорії з підтримкою множинних ключових слів
-        category_filter = Q()
-        for keyword in category_keywords:
-            category_filter |= Q(category__name__icontains=keyword)
-        
-        products = Product.objects.filter(in_stock=True).filter(category_filter).select_related('category', 'brand').prefetch_related('images')
+        products = Product.objects.filter(in_stock=True, category_id__in=category_ids).select_related('category', 'brand').prefetch_related('images')
         
         # Фільтрація
+        brand_ids = lookup.brand_ids(brand) if brand else None
         if brand:
-            products = products.filter(brand__name__icontains=brand)
+            products = products.filter(brand_id__in=brand_ids)
         if min_price:
             products = products.filter(price__gte=min_price)
         if max_price:
             products = products.filter(price__lte=max_price)
         
-        # Унікальні бренди для цієї категорії з оптимізацією
-        brands = Brand.objects.filter(
-            product__in=Product.objects.filter(category_filter, in_stock=True),
-            is_active=True
-        ).values_list('name', flat=True).distinct().order_by('name')
+        # Бренди цієї категорії та кількість товарів - з індексу фасетів
+        # (COUNT по запиту лише для довільного діапазону цін)
+        facets = get_facet_index()
+        brands = facets.brands_for_categories(category_ids)
+        if min_price or max_price:
+            products_count = None
+        else:
+            products_count = facets.count_products(category_ids, brand_ids)
         
-        # Назви категорій для відображення
-        category_names = {
-            'inverters': 'Інвертори',
-            'solar-panels': 'Сонячні панелі', 
-            'batteries': 'Акумуляторні батареї',
-            'backup-power': 'Комплекти резервного живлення'
-        }
+        # Назва категорії для відображення
+        category_name = CATEGORY_URL_NAMES.get(category_key, category_key.title())
         
-        category_name = category_names.get(category_key, category_key.title())
+        page = KeysetPaginator(
+            products,
+            self.request.GET.get('per_page', DEFAULT_PAGE_SIZE)
+        ).get_page(self.request)
+        resolve_image_urls(page.object_list)
         
-        context.update({
+        return {
             'title': f'{category_name} — GreenSolarTech',
             'description': f'Каталог {category_name.lower()} для сонячних електростанцій від провідних виробників.',
             'keywords': f'{category_name.lower()}, сонячне обладнання, GreenSolarTech',
-            'products': products.order_by('-featured', 'name'),
+            'products': page.object_list,
+            'products_count': products_count,
+            'page': page,
             'category_name': category_name,
             'category_key': category_key,
             'brands': brands,
             'selected_brand': brand,
             'min_price': min_price,
             'max_price': max_price
+        }
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_cached_context(**kwargs))
+        return context
+
+
+def search_page(request):
+    """(запит, номер сторінки, розмір сторінки) з GET-параметрів"""
+    query = request.GET.get('q', '').strip()[:200]
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except (TypeError, ValueError):
+        page = 1
+    return query, page, clamp_page_size(request.GET.get('per_page'))
+
+
+class SearchView(TemplateView):
+    template_name = 'mainapp/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query, page, per_page = search_page(self.request)
+        total, products = search_products(query, (page - 1) * per_page, per_page) if query else (0, [])
+        resolve_image_urls(products)
+
+        def page_url(number):
+            params = self.request.GET.copy()
+            params['page'] = number
+            return '?' + params.urlencode()
+
+        context.update({
+            'title': f'Пошук: {query} — GreenSolarTech' if query else 'Пошук товарів — GreenSolarTech',
+            'description': 'Пошук сонячного обладнання за назвою, моделлю, брендом чи характеристиками.',
+            'keywords': 'пошук, інвертори, сонячні панелі, акумулятори',
+            'query': query,
+            'products': products,
+            'products_count': total,
+            'previous_url': page_url(page - 1) if page > 1 else None,
+            'next_url': page_url(page + 1) if page * per_page < total else None,
         })
         return context
 
 
+class SearchAPIView(View):
+    """API пошуку товарів: /api/search/?q=...&page=...&per_page=..."""
+
+    def get(self, request):
+        query, page, per_page = search_page(request)
+        if not query:
+            return JsonResponse({'error': 'Параметр q є обовʼязковим'}, status=400)
+        total, products = search_products(query, (page - 1) * per_page, per_page)
+        resolve_image_urls(products)
+        return JsonResponse({
+            'query': query,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'results': [
+                {
+                    'id': product.id,
+                    'name': product.name,
+                    'model': product.model,
+                    'brand': product.brand.name,
+                    'category': product.category.name,
+                    'price': float(product.price),
+                    'url': reverse('mainapp:product_detail', args=[product.id]),
+                    'image': product.image_url if product.image else None,
+                }
+                for product in products
+            ],
+        }, json_dumps_params={'ensure_ascii': False})
+
+
+class SuggestAPIView(View):
+    """Підказки пошуку: /api/suggest/?q=sun-12&limit=8 (без запитів до БД)"""
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()[:100]
+        try:
+            limit = max(1, min(int(request.GET.get('limit', SUGGEST_LIMIT)), SUGGEST_MAX_LIMIT))
+        except (TypeError, ValueError):
+            limit = SUGGEST_LIMIT
+        suggestions = get_suggest_index().suggest(query, limit) if query else []
+        response = JsonResponse(
+            {'query': query, 'suggestions': suggestions},
+            json_dumps_params={'ensure_ascii': False},
+        )
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
 class ReviewsView(View):
     template_name = 'mainapp/reviews.html'
     
-    def get(self, request):
-        form = ReviewForm()
-        context = {
+    def get_context(self, form):
+        # Підсумок з ReviewStats і перша сторінка з кешу; наступні сторінки —
+        # один запит по індексу (див. mainapp.reviews)
+        stats = get_review_stats()
+        page = get_reviews_page(self.request)
+        return {
             'title': 'Відгуки клієнтів — GreenSolarTech',
             'description': 'Відгуки наших клієнтів про будівництво сонячних електростанцій та якість обслуговування.',
             'keywords': 'відгуки про сонячні електростанції, відгуки клієнтів GreenSolarTech',
-            'reviews': Review.objects.filter(is_published=True).order_by('-created_at'),
-            'average_rating': Review.objects.filter(is_published=True).aggregate(
-                avg_rating=Avg('rating')
-            )['avg_rating'] or 0,
-            'total_reviews': Review.objects.filter(is_published=True).count(),
+            'reviews': page.object_list,
+            'page': page,
+            'average_rating': stats.average,
+            'total_reviews': stats.count,
+            'rating_histogram': stats.histogram,
             'form': form
         }
-        return render(request, self.template_name, context)
+    
+    def get(self, request):
+        return render(request, self.template_name, self.get_context(ReviewForm()))
     
     def post(self, request):
         form = ReviewForm(request.POST)
@@ -414,74 +530,103 @@ class ReviewsView(View):
             return redirect('mainapp:reviews')
         
         # Якщо форма невалідна, показуємо помилки
-        context = {
-            'title': 'Відгуки клієнтів — GreenSolarTech',
-            'description': 'Відгуки наших клієнтів про будівництво сонячних електростанцій та якість обслуговування.',
-            'keywords': 'відгуки про сонячні електростанції, відгуки клієнтів GreenSolarTech',
-            'reviews': Review.objects.filter(is_published=True).order_by('-created_at'),
-            'average_rating': Review.objects.filter(is_published=True).aggregate(
-                avg_rating=Avg('rating')
-            )['avg_rating'] or 0,
-            'total_reviews': Review.objects.filter(is_published=True).count(),
-            'form': form
-        }
-        return render(request, self.template_name, context)
+        return render(request, self.template_name, self.get_context(form))
 
 
+@gzip_page
+@versioned_cache_page('sitemap')
 def sitemap_xml(request):
-    """Генерація sitemap.xml для SEO"""
-    xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-    <url>
-        <loc>https://greensolartech.com.ua/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>1.0</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/portfolio/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.8</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/catalog/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>weekly</changefreq>
-        <priority>0.9</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/reviews/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.7</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/contact/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.6</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/shipping-policy/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.5</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/return-policy/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.5</priority>
-    </url>
-    <url>
-        <loc>https://greensolartech.com.ua/privacy-policy/</loc>
-        <lastmod>2024-01-01</lastmod>
-        <changefreq>monthly</changefreq>
-        <priority>0.5</priority>
-    </url>
-</urlset>'''
-    return HttpResponse(xml_content, content_type='application/xml')
+    """Індекс sitemap: статичні сторінки, категорії та шарди товарів"""
+    return HttpResponse(''.join(sitemaps.sitemap_index()), content_type='application/xml')
+
+
+@gzip_page
+@versioned_cache_page('sitemap_section')
+def sitemap_section(request, section):
+    """Шард sitemap (кешується до наступної зміни каталогу)"""
+    pieces = sitemaps.sitemap_section(section)
+    if pieces is None:
+        raise Http404('Sitemap не знайдено')
+    return HttpResponse(''.join(pieces), content_type='application/xml')
+
+
+FEED_CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.ndjson': 'application/x-ndjson',
+    '.gz': 'application/gzip',
+}
+
+
+def _feed_etag(request, filename):
+    shard = get_shard(settings.FEED_ROOT, filename)
+    return shard['etag'] if shard else None
+
+
+def _feed_last_modified(request, filename):
+    shard = get_shard(settings.FEED_ROOT, filename)
+    return parse_datetime(shard['updated_at']) if shard and shard.get('updated_at') else None
+
+
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def feed_file(request, filename):
+    """
+    Файли фіду з ETag = хеш вмісту з маніфесту експорту, тож споживачі
+    отримують 304 і завантажують лише змінені шарди
+    """
+    path = os.path.join(settings.FEED_ROOT, filename)
+    # Віддаються лише файли, записані export_products_json
+    if not get_shard(settings.FEED_ROOT, filename) or not os.path.exists(path):
+        raise Http404('Файл фіду не знайдено')
+    content_type = FEED_CONTENT_TYPES.get(os.path.splitext(filename)[1], 'application/octet-stream')
+    return FileResponse(open(path, 'rb'), content_type=content_type)
+
+
+# Живі фіди: ім'я -> (генератор, content type, лише товари в наявності)
+LIVE_FEEDS = {
+    'products.json': (live.json_feed, 'application/json', False),
+    'products.ndjson': (live.ndjson_feed, 'application/x-ndjson', False),
+    'google-merchant.csv': (partial(merchant_lines, 'csv'), 'text/csv; charset=utf-8', True),
+    'google-merchant.tsv': (partial(merchant_lines, 'tsv'), 'text/tab-separated-values; charset=utf-8', True),
+    'google-merchant.xml': (partial(merchant_lines, 'xml'), 'application/xml; charset=utf-8', True),
+}
+# Фіди Google Merchant завжди містять галерею
+MERCHANT_FEEDS = ('google-merchant.csv', 'google-merchant.tsv', 'google-merchant.xml')
+
+
+def _live_feed_images(request, name):
+    return name in MERCHANT_FEEDS or request.GET.get('images') == '1'
+
+
+def _live_feed_state(request, name):
+    """ETag і Last-Modified рахуються одним набором запитів на запит"""
+    if not hasattr(request, '_live_feed_state'):
+        if name not in LIVE_FEEDS:
+            request._live_feed_state = (None, None)
+        else:
+            request._live_feed_state = live.feed_state(
+                name, in_stock_only=LIVE_FEEDS[name][2], include_images=_live_feed_images(request, name),
+            )
+    return request._live_feed_state
+
+
+@gzip_page
+@condition(
+    etag_func=lambda request, name: _live_feed_state(request, name)[0],
+    last_modified_func=lambda request, name: _live_feed_state(request, name)[1],
+)
+def live_feed(request, name):
+    """
+    Фіди, що генеруються на запит потоком з БД: свіжі ціни та наявність
+    без перезапуску команд експорту. Незмінений фід віддає 304.
+    """
+    if name not in LIVE_FEEDS:
+        raise Http404('Фід не знайдено')
+    generator, content_type, in_stock_only = LIVE_FEEDS[name]
+    if name in MERCHANT_FEEDS:
+        pieces = generator()
+    else:
+        pieces = generator(include_images=_live_feed_images(request, name))
+    return StreamingHttpResponse(buffered(pieces), content_type=content_type)
 
 
 def robots_txt(request):
@@ -492,45 +637,26 @@ Sitemap: https://greensolartech.com.ua/sitemap.xml'''
     return HttpResponse(txt_content, content_type='text/plain')
 
 
-class ProductDetailView(TemplateView):
+class ProductDetailView(CachedContextMixin, TemplateView):
     template_name = 'mainapp/product_detail.html'
+    cache_namespace = 'product_detail'
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        product_id = kwargs.get('product_id')
+    def build_cached_context(self, **kwargs):
+        # Товар, впорядкована галерея, схожі товари та хлібні крихти
+        # фіксованою кількістю запитів (див. mainapp.loaders)
+        page = load_product_page(kwargs.get('product_id'))
+        product = page['product']
         
-        # Отримуємо товар або 404 з оптимізацією
-        product = get_object_or_404(
-            Product.objects.select_related('category', 'brand').prefetch_related('images'),
-            id=product_id, 
-            in_stock=True
-        )
-        
-        # Отримуємо всі зображення товару (вже завантажені через prefetch_related)
-        product_images = product.images.all().order_by('order', 'id')
-        
-        # Якщо немає додаткових зображень, використовуємо основне
-        if not product_images and product.image:
-            main_image = product  # ✅ ПЕРЕДАЄМО ОБ'ЄКТ ТОВАРУ, НЕ ImageField!
-        else:
-            main_image = product_images.first() if product_images else product  # ✅ ОБ'ЄКТ ProductImage або Product!
-        
-        # Схожі товари (з тієї ж категорії або бренду) з оптимізацією
-        similar_products = Product.objects.filter(
-            Q(category=product.category) | Q(brand=product.brand),
-            in_stock=True
-        ).exclude(id=product.id).select_related('category', 'brand').prefetch_related('images')[:6]
-        
-        context.update({
+        return {
             'title': f'{product.name} — GreenSolarTech',
             'description': f'{product.name} від {product.brand}. {product.description[:150]}...',
             'keywords': f'{product.name}, {product.brand}, {product.category}, сонячне обладнання',
-            'product': product,
-            'product_images': product_images,
-            'main_image': main_image,
-            'similar_products': similar_products,
-        })
-        
+            **page,
+        }
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_cached_context(**kwargs))
         return context
 
 